@@ -6,6 +6,7 @@ from .test import test, setup_tests
 from .sync import push, pull
 from .open import open_command
 from .build import build
+from .ocr import ocr_bench, ocr_server
 
 
 @click.group()
@@ -22,3 +23,5 @@ cli.add_command(push)
 cli.add_command(pull)
 cli.add_command(open_command)
 cli.add_command(build)
+cli.add_command(ocr_server)
+cli.add_command(ocr_bench)
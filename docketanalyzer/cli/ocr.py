@@ -0,0 +1,134 @@
+import sys
+
+import click
+
+
+@click.command("ocr-server")
+@click.option("--host", default="127.0.0.1", help="Host to bind to")
+@click.option("--port", default=8000, type=int, help="Port to bind to")
+@click.option("--batch-size", default=8, type=int, help="Pages per model batch")
+@click.option(
+    "--max-wait",
+    default=0.5,
+    type=float,
+    help="Seconds a page waits for a batch to fill up",
+)
+@click.option("--render-workers", default=0, type=int, help="Rendering processes")
+@click.option("--api-key", default=None, help="Require this bearer token")
+@click.option(
+    "--layout-backend",
+    type=click.Choice(["torch", "onnx", "onnx-int8"]),
+    default="torch",
+    help="Layout model backend",
+)
+@click.option("--threads", default=None, type=int, help="Intra-op CPU threads")
+@click.option("--interop-threads", default=None, type=int, help="Inter-op threads")
+def ocr_server(
+    host,
+    port,
+    batch_size,
+    max_wait,
+    render_workers,
+    api_key,
+    layout_backend,
+    threads,
+    interop_threads,
+):
+    """Run a local OCR server that keeps the models loaded.
+
+    Point RemoteClient or pdf_document(..., remote=True) at it with
+    endpoint_url="http://localhost:8000".
+
+    Example usage:
+    da ocr-server --port 8000 --batch-size 8
+    """
+    import uvicorn
+
+    from docketanalyzer.ocr.layout import configure_layout_model
+    from docketanalyzer.ocr.server import OCRServer, create_app
+
+    configure_layout_model(layout_backend, threads, interop_threads)
+
+    server = OCRServer(
+        batch_size=batch_size,
+        max_wait=max_wait,
+        render_workers=render_workers,
+        api_key=api_key,
+    )
+    uvicorn.run(create_app(server), host=host, port=port)
+
+
+@click.command("ocr-bench")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=8, type=int, help="Pages per model batch")
+@click.option("--render-workers", default=0, type=int, help="Rendering processes")
+@click.option("--repeat", default=1, type=int, help="Times to process each PDF")
+@click.option(
+    "--native-fast-path", is_flag=True, help="Skip the models for clean native text"
+)
+@click.option(
+    "--output",
+    "output_format",
+    type=click.Choice(["report", "json", "prometheus"]),
+    default="report",
+    help="Output format",
+)
+@click.option(
+    "--layout-backend",
+    type=click.Choice(["torch", "onnx", "onnx-int8"]),
+    default="torch",
+    help="Layout model backend",
+)
+@click.option("--threads", default=None, type=int, help="Intra-op CPU threads")
+@click.option("--interop-threads", default=None, type=int, help="Inter-op threads")
+def ocr_bench(
+    paths,
+    batch_size,
+    render_workers,
+    repeat,
+    native_fast_path,
+    output_format,
+    layout_backend,
+    threads,
+    interop_threads,
+):
+    """Benchmark local OCR and print a breakdown of time by stage.
+
+    Runs on the test fixture PDFs if no paths are given.
+
+    Example usage:
+    da ocr-bench --batch-size 8 --repeat 3 --layout-backend onnx --threads 4
+    """
+    from docketanalyzer import BASE_DIR, load_docket_index
+    from docketanalyzer.ocr import OCRMetrics, bulk_process_pdfs
+    from docketanalyzer.ocr.layout import configure_layout_model
+
+    configure_layout_model(layout_backend, threads, interop_threads)
+
+    if not paths:
+        sys.path.insert(0, str(BASE_DIR.parent.resolve()))
+        from tests.conftest import SAMPLE_DOCKET_ID1, SAMPLE_DOCKET_ID2, TEST_DATA_DIR
+
+        index = load_docket_index(TEST_DATA_DIR)
+        paths = [
+            index[docket_id].get_pdf_path(entry_number=1)
+            for docket_id in [SAMPLE_DOCKET_ID1, SAMPLE_DOCKET_ID2]
+        ]
+
+    metrics = OCRMetrics()
+    docs = bulk_process_pdfs(
+        [str(path) for path in paths] * repeat,
+        batch_size=batch_size,
+        render_workers=render_workers,
+        native_fast_path=native_fast_path,
+        metrics=metrics,
+    )
+    for doc in docs:
+        doc.close()
+
+    if output_format == "json":
+        click.echo(metrics.to_json(indent=2))
+    elif output_format == "prometheus":
+        click.echo(metrics.to_prometheus(), nl=False)
+    else:
+        click.echo(metrics.report())
@@ -2,12 +2,16 @@ from .choices import choices
 from .docket_manager import DocketManager
 from .docket_batch import DocketBatch
 from .docket_index import DocketIndex, load_docket_index
+from .ocr_queue import OCRQueue
+from .purchase_queue import PurchaseQueue
 
 
 __all__ = [
     "DocketBatch",
     "DocketIndex",
     "DocketManager",
+    "OCRQueue",
+    "PurchaseQueue",
     "choices",
     "load_docket_index",
 ]
@@ -22,6 +22,41 @@ class DocketBatch:
         for docket_id in self.docket_ids:
             yield self.index[docket_id]
 
+    def find_candidate_cases(self, **kwargs) -> dict[str, list[dict]]:
+        """Resolve candidate PACER cases for every docket in the batch.
+
+        Args:
+            **kwargs: Additional arguments to pass to Pacer.find_candidate_cases_bulk.
+
+        Returns:
+            dict: Candidate cases keyed by docket ID.
+        """
+        return self.index.pacer.find_candidate_cases_bulk(self.docket_ids, **kwargs)
+
+    def purchase_documents(
+        self,
+        entry_numbers: list[int],
+        attachment_numbers: list[int | None] | None = None,
+        **kwargs,
+    ) -> list[dict]:
+        """Purchase the same documents for every docket in the batch.
+
+        Args:
+            entry_numbers: The entry numbers to purchase for each docket.
+            attachment_numbers: The attachment numbers to purchase for each entry.
+                Use None for the main document. Defaults to only the main document.
+            **kwargs: Additional arguments to pass to PurchaseQueue.
+
+        Returns:
+            list[dict]: The results from PurchaseQueue.run.
+        """
+        queue = self.index.purchase_queue(**kwargs)
+        for docket_id in self.docket_ids:
+            for entry_number in entry_numbers:
+                for attachment_number in attachment_numbers or [None]:
+                    queue.add(docket_id, entry_number, attachment_number)
+        return queue.run()
+
     def __getattribute__(self, name: str):
         """Passthrough attributes from the index."""
         index_attributes = ["db", "table", "s3"]
@@ -1,4 +1,5 @@
-from collections.abc import Generator
+import os
+from collections.abc import Generator, Iterable
 from pathlib import Path
 
 import pandas as pd
@@ -9,6 +10,8 @@ from docketanalyzer import env, load_clients
 from .choices import choices
 from .docket_batch import DocketBatch
 from .docket_manager import DocketManager
+from .ocr_queue import OCRQueue
+from .purchase_queue import PurchaseQueue
 
 
 class DocketIndex:
@@ -55,9 +58,9 @@ class DocketIndex:
     @property
     def pacer(self):
         """Get the Pacer connection."""
-        from docketanalyzer.pacer import Pacer
-
         if not self._pacer:
+            from docketanalyzer.pacer import Pacer
+
             self._pacer = Pacer()
         return self._pacer
 
@@ -71,6 +74,80 @@ class DocketIndex:
             self._recap = RecapAPI(sleep=0.2)
         return self._recap
 
+    def purchase_queue(self, **kwargs) -> PurchaseQueue:
+        """Create a queue for purchasing documents in bulk.
+
+        Args:
+            **kwargs: Additional arguments to pass to PurchaseQueue.
+        """
+        return PurchaseQueue(self, **kwargs)
+
+    # OCR
+    def ocr_pending(self, docket_ids: Iterable[str] | None = None) -> list[Path]:
+        """Find PDFs that do not have an OCR file yet.
+
+        Each docket directory is listed once, rather than globbing it for PDFs
+        and checking each one for an OCR file.
+
+        Args:
+            docket_ids: Dockets to check. Defaults to None (all local dockets).
+
+        Returns:
+            list[Path]: Paths to the PDFs without a matching `doc.ocr.*.json`.
+        """
+        if docket_ids is None:
+            if not self.dir.exists():
+                return []
+            with os.scandir(self.dir) as entries:
+                docket_ids = sorted(
+                    x.name for x in entries if x.is_dir() and not x.name.startswith(".")
+                )
+
+        pending = []
+        for docket_id in docket_ids:
+            docket_dir = self.dir / docket_id
+            try:
+                with os.scandir(docket_dir) as entries:
+                    names = {x.name for x in entries}
+            except FileNotFoundError:
+                continue
+            for name in sorted(names):
+                if name.startswith("doc.pdf.") and name.endswith(".pdf"):
+                    doc_name = name[len("doc.pdf.") : -len(".pdf")]
+                    if f"doc.ocr.{doc_name}.json" not in names:
+                        pending.append(docket_dir / name)
+        return pending
+
+    def ocr_queue(self, **kwargs) -> OCRQueue:
+        """Create a persistent queue for applying OCR in bulk.
+
+        Args:
+            **kwargs: Additional arguments to pass to OCRQueue.
+        """
+        return OCRQueue(self, **kwargs)
+
+    def apply_ocr(
+        self,
+        docket_ids: Iterable[str] | None = None,
+        consumers: int = 1,
+        max_retries: int = 2,
+        **kwargs,
+    ) -> dict:
+        """Apply OCR to all PDFs that do not have an OCR file yet.
+
+        Args:
+            docket_ids: Dockets to process. Defaults to None (all local dockets).
+            consumers: Number of concurrent consumers. Defaults to 1.
+            max_retries: Number of times a failed PDF is retried. Defaults to 2.
+            **kwargs: Additional arguments to pass to `DocketManager.apply_ocr`.
+
+        Returns:
+            dict: Processing counts and throughput, see `OCRQueue.run`.
+        """
+        queue = self.ocr_queue(max_retries=max_retries)
+        queue.add(self.ocr_pending(docket_ids))
+        return queue.run(consumers=consumers, **kwargs)
+
     # S3
     @property
     def s3(self):
@@ -1,4 +1,5 @@
 import re
+import threading
 from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -10,8 +11,12 @@ import simplejson as json
 from docketanalyzer import json_default, parse_docket_id, to_int
 
 if TYPE_CHECKING:
+    from docketanalyzer.ocr.document import PageSelection
+
     from .docket_index import DocketIndex
 
+ATTACHMENTS_LOCK = threading.Lock()
+
 
 class DocketManager:
     """Manager for an individual docket."""
@@ -26,6 +31,7 @@ class DocketManager:
         self.dir = self.index.dir / self.docket_id
         self.docket_json_path = self.dir / "docket.json"
         self.status_path = self.dir / "status.json"
+        self.attachments_path = self.dir / "attachments.json"
 
     # Docket data paths
     @property
@@ -76,21 +82,55 @@ class DocketManager:
 
     # OCR Utilities
     def apply_ocr(
-        self, pdf_path: str | Path, overwrite: bool = False, **kwargs
+        self,
+        pdf_path: str | Path,
+        overwrite: bool = False,
+        pages: "PageSelection | None" = None,
+        **kwargs,
     ) -> tuple[dict, Path]:
-        """Apply OCR to a PDF document path and save the result."""
+        """Apply OCR to a PDF document path and save the result.
+
+        If an OCR file already exists, only the selected pages missing from it
+        are processed and added to it.
+
+        Pages are checkpointed next to the OCR file as they are processed, so an
+        interrupted run resumes from the pages it already finished. The OCR file
+        is replaced atomically once all pages are done.
+
+        Args:
+            pdf_path: The path to the PDF document.
+            overwrite: Whether to discard an existing OCR file and checkpoint.
+                Defaults to False.
+            pages: The pages to process. Either the first N pages (or the last N
+                if negative), a slice, an iterable of page indices (negative
+                indices count from the end and indices past the end are
+                ignored), or a function that takes the native text of a page and
+                returns whether to select it. Defaults to None (all pages).
+            **kwargs: Additional arguments to pass to `pdf_document`.
+
+        Returns:
+            tuple[dict, Path]: The OCR data, or False if there was nothing to
+                process, and the path to the OCR file.
+        """
         entry_number, attachment_number = self.parse_document_path(pdf_path)
         ocr_path = self.get_ocr_path(entry_number, attachment_number)
 
-        if not overwrite and ocr_path.exists():
+        from docketanalyzer.ocr import checkpoint_path, pdf_document
+
+        load = None if overwrite or not ocr_path.exists() else ocr_path
+        doc = pdf_document(pdf_path, load=load, pages=pages, **kwargs)
+        if load is not None and not doc.select_pages(missing=True):
+            doc.close()
             print(f"OCR file already exists: {ocr_path}")
             print("Pass `overwrite=True` to overwrite.")
             return False, ocr_path
 
-        from docketanalyzer.ocr import pdf_document
-
-        doc = pdf_document(pdf_path, **kwargs).process()
+        partial_path = checkpoint_path(ocr_path)
+        if overwrite:
+            partial_path.unlink(missing_ok=True)
+        doc.process(missing=load is not None, checkpoint=partial_path)
         doc.save(ocr_path)
+        partial_path.unlink(missing_ok=True)
         return doc.data, ocr_path
 
     # PACER Utilities
@@ -174,7 +214,11 @@ class DocketManager:
             )
         else:
             pdf, status = self.pacer.purchase_attachment(
-                pacer_case_id, pacer_doc_id, attachment_number, court=self.court
+                pacer_case_id,
+                pacer_doc_id,
+                attachment_number,
+                court=self.court,
+                attachments=self.get_attachments(pacer_doc_id),
             )
         success = status == "success"
         if not success:
@@ -186,6 +230,66 @@ class DocketManager:
         pdf_path.write_bytes(pdf)
         return success
 
+    @property
+    def attachments_json(self) -> dict:
+        """Get the cached attachment page data for this docket by pacer_doc_id."""
+        if self.attachments_path.exists():
+            return json.loads(self.attachments_path.read_text())
+        return {}
+
+    def get_attachments(self, pacer_doc_id: str, update: bool = False) -> dict:
+        """Get the attachment page data for an entry's pacer_doc_id.
+
+        Attachment pages are cached in `attachments.json` alongside the docket, so
+        each entry's attachment page is only queried from PACER once.
+
+        Args:
+            pacer_doc_id (str): The PACER document ID of the docket entry.
+            update (bool): Whether to query PACER even if a cached result exists.
+        """
+        if not update:
+            attachments = self.attachments_json.get(pacer_doc_id)
+            if attachments is not None:
+                return attachments
+
+        attachments = self.pacer.get_attachments(
+            pacer_doc_id, self.court, update=update
+        )
+        with ATTACHMENTS_LOCK:
+            attachments_json = self.attachments_json
+            attachments_json[pacer_doc_id] = attachments
+            self.dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.attachments_path.with_suffix(".json.tmp")
+            temp_path.write_text(
+                json.dumps(attachments_json, indent=2, default=json_default)
+            )
+            temp_path.replace(self.attachments_path)
+        return json.loads(json.dumps(attachments, default=json_default))
+
+    def download_attachment_data(
+        self, entry_numbers: list[int] | None = None, update: bool = False
+    ) -> dict:
+        """Download attachment page data for many entries.
+
+        Args:
+            entry_numbers (list[int] | None): The entries to enumerate. Defaults to
+                all entries with a pacer_doc_id.
+            update (bool): Whether to query PACER even if a cached result exists.
+
+        Returns:
+            dict: Attachment page data keyed by entry number.
+        """
+        results = {}
+        for entry in self.docket_json["docket_entries"]:
+            entry_number = to_int(entry["document_number"])
+            if entry_numbers is not None and entry_number not in entry_numbers:
+                continue
+            pacer_doc_id = entry.get("pacer_doc_id")
+            if entry_number is None or pacer_doc_id is None:
+                continue
+            results[entry_number] = self.get_attachments(pacer_doc_id, update=update)
+        return results
+
     # Recap Utilities
     @property
     def recap_path(self):
@@ -255,7 +359,7 @@ class DocketManager:
             row_number=row_number, entry_number=entry_number
         )
         pacer_doc_id = entry_json["pacer_doc_id"]
-        return self.pacer.get_attachments(pacer_doc_id, self.court)
+        return self.get_attachments(pacer_doc_id)
 
     @property
     def row(self):
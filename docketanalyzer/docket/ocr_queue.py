@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from docketanalyzer import load_clients
+
+if TYPE_CHECKING:
+    from .docket_index import DocketIndex
+
+
+class OCRQueue:
+    """Persistent queue of PDFs to OCR, worked through by concurrent consumers.
+
+    PDFs are stored by their path relative to the index directory in a Redis
+    list (or the SQLite dev client when Redis is not configured), so a queue
+    can be filled once and drained by several runs or processes. Each consumer
+    pops a PDF and runs `DocketManager.apply_ocr` on it. Failed PDFs are put
+    back at the end of the queue until they have been tried `max_retries` more
+    times, after which they are moved to a dead-letter list.
+
+    ```python
+    queue = index.ocr_queue()
+    queue.add(index.ocr_pending())
+    stats = queue.run(consumers=8, remote=True)
+    ```
+
+    A PDF that was popped by a consumer that died is not put back, but since
+    `apply_ocr` checkpoints pages and skips finished documents, adding
+    `ocr_pending()` again later requeues it and resumes its progress. PDFs that
+    are already queued, for example left over from an interrupted run, are not
+    added again, since two consumers must not work on the same PDF at the same
+    time.
+
+    Attributes:
+        index: The DocketIndex the documents belong to.
+        name: The name of the queue, used as a prefix for its Redis keys.
+        max_retries: Number of times a failed PDF is retried.
+        redis: The Redis client.
+    """
+
+    def __init__(
+        self,
+        index: "DocketIndex",
+        name: str = "ocr",
+        max_retries: int = 2,
+        redis=None,
+    ):
+        """Initialize OCRQueue."""
+        self.index = index
+        self.name = name
+        self.max_retries = max_retries
+        self.redis = redis or load_clients("redis")
+        self._lock = threading.Lock()
+
+    @property
+    def pending_key(self) -> str:
+        """Get the Redis key of the pending list."""
+        return f"{self.name}:pending"
+
+    @property
+    def dead_key(self) -> str:
+        """Get the Redis key of the dead-letter list."""
+        return f"{self.name}:dead"
+
+    def add(self, pdf_paths: list[str | Path]) -> int:
+        """Add PDFs to the queue, skipping PDFs that are already queued.
+
+        Args:
+            pdf_paths: Paths to PDFs in the index directory.
+
+        Returns:
+            int: The number of PDFs added.
+        """
+        queued = {
+            json.loads(x)["path"] for x in self.redis.lrange(self.pending_key, 0, -1)
+        }
+        items = []
+        for path in pdf_paths:
+            path = str(Path(path).relative_to(self.index.dir))
+            if path not in queued:
+                queued.add(path)
+                items.append(json.dumps({"path": path, "attempts": 0}))
+        if items:
+            self.redis.rpush(self.pending_key, *items)
+        return len(items)
+
+    def pop(self) -> dict | None:
+        """Remove and return the next queued PDF, or None if the queue is empty."""
+        item = self.redis.lpop(self.pending_key)
+        return None if item is None else json.loads(item)
+
+    def __len__(self) -> int:
+        """Get the number of queued PDFs."""
+        return self.redis.llen(self.pending_key)
+
+    @property
+    def dead_letters(self) -> list[dict]:
+        """Get the PDFs that failed after all retries, with their last error."""
+        return [json.loads(x) for x in self.redis.lrange(self.dead_key, 0, -1)]
+
+    def clear(self) -> None:
+        """Delete the pending and dead-letter lists."""
+        self.redis.delete(self.pending_key, self.dead_key)
+
+    def _consume(self, stats: dict, **kwargs) -> None:
+        """Process queued PDFs until the queue is empty."""
+        while (item := self.pop()) is not None:
+            path = self.index.dir / item["path"]
+            manager = self.index[path.parent.name]
+            try:
+                data, _ = manager.apply_ocr(path, **kwargs)
+            except Exception as e:
+                item["attempts"] += 1
+                item["error"] = repr(e)
+                if item["attempts"] > self.max_retries:
+                    self.redis.rpush(self.dead_key, json.dumps(item))
+                    key = "failed"
+                else:
+                    self.redis.rpush(self.pending_key, json.dumps(item))
+                    key = "retried"
+                with self._lock:
+                    stats[key] += 1
+                continue
+            with self._lock:
+                if data is False:
+                    stats["skipped"] += 1
+                else:
+                    stats["completed"] += 1
+                    stats["pages"] += len(data["pages"])
+
+    def run(self, consumers: int = 1, **kwargs) -> dict:
+        """Process queued PDFs until the queue is empty.
+
+        Consumers are threads. Local OCR renders with PyMuPDF, which is not
+        thread-safe, and shares the models loaded in this process, so it runs a
+        single consumer; run more processes on the same queue to scale it.
+        Remote OCR (`remote=True`) scales with the number of consumers.
+
+        Args:
+            consumers: Number of concurrent consumers. Defaults to 1. Must be 1
+                unless `remote=True`.
+            **kwargs: Additional arguments to pass to `DocketManager.apply_ocr`,
+                such as `remote=True` or `native_fast_path=True`.
+
+        Returns:
+            dict: Counts of `completed`, `skipped` (already done), `retried` and
+                `failed` (dead-lettered) PDFs, the number of `pages` processed,
+                the elapsed `seconds`, and `docs_per_second` and
+                `pages_per_second`.
+
+        Raises:
+            ValueError: If `consumers` is more than 1 for local OCR.
+        """
+        if consumers > 1 and not kwargs.get("remote"):
+            raise ValueError("Local OCR supports one consumer, pass remote=True")
+        stats = {"completed": 0, "skipped": 0, "retried": 0, "failed": 0, "pages": 0}
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=consumers) as executor:
+            futures = [
+                executor.submit(self._consume, stats, **kwargs)
+                for _ in range(consumers)
+            ]
+            for future in futures:
+                future.result()
+        seconds = time.time() - start
+        stats["seconds"] = seconds
+        stats["docs_per_second"] = stats["completed"] / seconds if seconds else 0.0
+        stats["pages_per_second"] = stats["pages"] / seconds if seconds else 0.0
+        return stats
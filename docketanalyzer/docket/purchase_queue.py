@@ -0,0 +1,241 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+import regex as re
+
+if TYPE_CHECKING:
+    from .docket_index import DocketIndex
+
+
+PACER_PAGE_COST = 0.10
+PACER_MAX_DOCUMENT_COST = 3.00
+
+
+def estimate_pdf_cost(pdf: bytes) -> float:
+    """Estimate the PACER fee for a downloaded PDF.
+
+    PACER charges per page with a cap per document. Page counts are estimated from
+    the page objects in the raw PDF, so this is an approximation for PDFs that
+    store their page tree in compressed object streams.
+    """
+    num_pages = max(len(re.findall(rb"/Type\s*/Page\b", pdf)), 1)
+    return min(num_pages * PACER_PAGE_COST, PACER_MAX_DOCUMENT_COST)
+
+
+class PurchaseQueue:
+    """Queue for purchasing many PACER documents at once.
+
+    Requests are grouped by docket and entry so that each entry's attachment page
+    is only queried once. Downloads run concurrently with a per-court limit, and
+    an optional budget stops new purchases once the spend cap would be exceeded.
+    Documents are written directly to the docket's `get_pdf_path`.
+
+    ```python
+    queue = index.purchase_queue(budget=20)
+    queue.add("insd__1_24-cv-00524", 1)
+    queue.add("insd__1_24-cv-00524", 1, attachment_number=1)
+    results = queue.run()
+    ```
+
+    Attributes:
+        index: The DocketIndex the documents belong to.
+        budget: Maximum amount to spend in dollars, or None for no cap.
+        max_per_court: Maximum number of concurrent requests per court.
+        max_workers: Maximum number of concurrent requests overall.
+        overwrite: Whether to purchase documents that already exist locally.
+        spent: Estimated amount spent so far in dollars.
+    """
+
+    def __init__(
+        self,
+        index: "DocketIndex",
+        budget: float | None = None,
+        max_per_court: int = 2,
+        max_workers: int = 8,
+        overwrite: bool = False,
+    ):
+        """Initialize PurchaseQueue."""
+        self.index = index
+        self.budget = budget
+        self.max_per_court = max_per_court
+        self.max_workers = max_workers
+        self.overwrite = overwrite
+        self.spent = 0.0
+        self.requests = defaultdict(set)
+        self._reserved = 0.0
+        self._lock = threading.Lock()
+        self._court_locks = {}
+
+    def add(
+        self,
+        docket_id: str,
+        entry_number: int,
+        attachment_number: int | None = None,
+    ) -> "PurchaseQueue":
+        """Add a document to the queue.
+
+        Args:
+            docket_id: The docket ID of the document.
+            entry_number: The docket entry number of the document.
+            attachment_number: The attachment number, or None for the main document.
+
+        Returns:
+            PurchaseQueue: The queue (self), for chaining.
+        """
+        attachment_number = int(attachment_number) if attachment_number else None
+        self.requests[(docket_id, int(entry_number))].add(attachment_number)
+        return self
+
+    def __len__(self) -> int:
+        """Get the number of documents in the queue."""
+        return sum(len(x) for x in self.requests.values())
+
+    def _reserve(self) -> bool:
+        """Reserve the maximum document cost against the budget."""
+        with self._lock:
+            if self.budget is not None and (
+                self.spent + self._reserved + PACER_MAX_DOCUMENT_COST > self.budget
+            ):
+                return False
+            self._reserved += PACER_MAX_DOCUMENT_COST
+            return True
+
+    def _settle(self, cost: float) -> None:
+        """Release a reservation and record the actual cost."""
+        with self._lock:
+            self._reserved -= PACER_MAX_DOCUMENT_COST
+            self.spent += cost
+
+    def _court_lock(self, court: str) -> threading.Semaphore:
+        """Get the semaphore limiting concurrent requests to a court."""
+        with self._lock:
+            if court not in self._court_locks:
+                self._court_locks[court] = threading.Semaphore(self.max_per_court)
+            return self._court_locks[court]
+
+    def _purchase(self, manager, pacer_case_id, pacer_doc_id, result) -> dict:
+        """Purchase a single PDF and write it to the docket directory."""
+        if not self._reserve():
+            result["status"] = "budget exceeded"
+            return result
+        cost = 0.0
+        try:
+            with self._court_lock(manager.court):
+                pdf, status = manager.pacer.purchase_document(
+                    pacer_case_id, pacer_doc_id, manager.court
+                )
+            if status == "success" and pdf:
+                cost = estimate_pdf_cost(pdf)
+                result["cost"] = cost
+                result["path"].write_bytes(pdf)
+            result["status"] = status
+        finally:
+            self._settle(cost)
+        return result
+
+    def _process_entry(
+        self,
+        docket_id: str,
+        entry_number: int,
+        attachment_numbers: set,
+        suppress_errors: bool = True,
+    ) -> list[dict]:
+        """Purchase all requested documents for a single docket entry.
+
+        Results are recorded as each purchase finishes, so if an error stops the
+        entry, only the documents that were not purchased yet get its status.
+        """
+        results = {
+            attachment_number: {
+                "docket_id": docket_id,
+                "entry_number": entry_number,
+                "attachment_number": attachment_number,
+                "path": None,
+                "status": None,
+                "cost": 0.0,
+            }
+            for attachment_number in sorted(attachment_numbers, key=lambda x: x or 0)
+        }
+        try:
+            self._purchase_entry(self.index[docket_id], entry_number, results)
+        except Exception as e:
+            if not suppress_errors:
+                raise
+            for result in results.values():
+                if result["status"] is None:
+                    result["status"] = f"error: {e}"
+        return list(results.values())
+
+    def _purchase_entry(self, manager, entry_number: int, results: dict) -> None:
+        """Purchase the documents of a docket entry that do not exist yet."""
+        for attachment_number, result in results.items():
+            result["path"] = manager.get_pdf_path(entry_number, attachment_number)
+            if not self.overwrite and result["path"].exists():
+                result["status"] = "exists"
+        todo = [k for k, v in results.items() if v["status"] is None]
+        if not todo:
+            return
+
+        try:
+            docket_json = manager.docket_json
+            entry_json = manager.get_entry_json(entry_number=entry_number)
+        except (KeyError, TypeError):
+            entry_json = None
+        if entry_json is None or entry_json.get("pacer_doc_id") is None:
+            for attachment_number in todo:
+                results[attachment_number]["status"] = "entry not found"
+            return
+
+        manager.dir.mkdir(parents=True, exist_ok=True)
+        pacer_case_id = docket_json["pacer_case_id"]
+        pacer_doc_id = entry_json["pacer_doc_id"]
+
+        if None in todo:
+            self._purchase(manager, pacer_case_id, pacer_doc_id, results[None])
+
+        attachment_numbers = [x for x in todo if x is not None]
+        if attachment_numbers:
+            with self._court_lock(manager.court):
+                attachments = manager.get_attachments(pacer_doc_id)
+            attachments = {
+                int(x["attachment_number"]): x["pacer_doc_id"]
+                for x in (attachments or {}).get("attachments") or []
+            }
+            for attachment_number in attachment_numbers:
+                result = results[attachment_number]
+                if attachment_number not in attachments:
+                    result["status"] = (
+                        "attachment not found" if attachments else "no attachments"
+                    )
+                    continue
+                self._purchase(
+                    manager, pacer_case_id, attachments[attachment_number], result
+                )
+
+    def run(self, suppress_errors: bool = True) -> list[dict]:
+        """Purchase all queued documents.
+
+        Args:
+            suppress_errors: Whether to record errors in the results instead of
+                raising them.
+
+        Returns:
+            list[dict]: One result per queued document with the `docket_id`,
+                `entry_number`, `attachment_number`, `path`, `status` and
+                estimated `cost`.
+        """
+        requests = dict(self.requests)
+        self.requests.clear()
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._process_entry, *key, attachment_numbers, suppress_errors
+                )
+                for key, attachment_numbers in requests.items()
+            ]
+            for future in as_completed(futures):
+                results += future.result()
+        return results
@@ -32,10 +32,13 @@ class MultiLabelClassificationPipeline(ClassificationPipeline):
             preds[idx].append(id2label[label_id])
         return preds
 
-    def __call__(self, examples, batch_size=1, return_scores=False):
+    def __call__(self, examples, batch_size=None, max_tokens=None, return_scores=False):
         """Main entrypoint, expects a list of strings."""
         return self.predict(
-            examples, batch_size=batch_size, return_scores=return_scores
+            examples,
+            batch_size=batch_size,
+            max_tokens=max_tokens,
+            return_scores=return_scores,
         )
 
 
@@ -11,14 +11,44 @@ from tqdm import tqdm
 from transformers import AutoTokenizer
 
 
+def token_budget_batches(
+    lengths, max_tokens, max_batch_size=None, pad_to_multiple_of=8, packing=False
+):
+    """Group examples sorted by decreasing length into batches by a token budget.
+
+    A batch costs its number of examples times its padded length, the length of
+    its first (longest) example, or the sum of its lengths when packing. Examples
+    longer than the budget get a batch of their own.
+    """
+
+    def padded(length):
+        return -(-length // pad_to_multiple_of) * pad_to_multiple_of
+
+    batches, batch_tokens = [], 0
+    for i, length in enumerate(lengths):
+        batch = batches[-1] if batches else []
+        if packing:
+            tokens = batch_tokens + length
+        else:
+            tokens = (len(batch) + 1) * padded(lengths[batch[0]] if batch else length)
+        if not batch or tokens > max_tokens or len(batch) == max_batch_size:
+            batches.append([i])
+            batch_tokens = length
+        else:
+            batch.append(i)
+            batch_tokens = tokens
+    return batches
+
+
 class DataCollator:
     """Data collator."""
 
-    def __init__(self, tokenizer, padding=True, pad_to_multiple_of=8):
+    def __init__(self, tokenizer, padding=True, pad_to_multiple_of=8, packing=False):
         """Initialize the data collator."""
         self.tokenizer = tokenizer
         self.padding = padding
         self.pad_to_multiple_of = pad_to_multiple_of
+        self.packing = packing
 
     def __call__(self, features):
         """Call the data collator."""
@@ -28,9 +58,24 @@ class DataCollator:
                 offset_mapping = row.pop("offset_mapping")
                 starts.append(offset_mapping[:, 0])
                 ends.append(offset_mapping[:, 1])
+        packed = None
+        if self.packing:
+            # Sequences are concatenated into a single row, with position ids that
+            # restart at each sequence, for models that attend within sequences.
+            lengths = [len(row["input_ids"]) for row in features]
+            input_ids = torch.cat([row["input_ids"] for row in features])
+            packed = {
+                "packed_input_ids": input_ids[None],
+                "position_ids": torch.cat([torch.arange(n) for n in lengths])[None],
+                "lengths": torch.tensor(lengths),
+            }
         features = self.tokenizer.pad(
-            features, padding=self.padding, pad_to_multiple_of=self.pad_to_multiple_of
+            features,
+            padding=self.padding,
+            pad_to_multiple_of=None if self.packing else self.pad_to_multiple_of,
         )
+        if packed is not None:
+            features.update(packed)
         if starts:
             features["starts"] = torch.full(
                 features["input_ids"].shape, fill_value=-1, dtype=torch.long
@@ -56,6 +101,8 @@ class Pipeline:
         padding=False, truncation=True, max_length=1024
     )
     dataset_cols: ClassVar[list[str]] = ["input_ids", "attention_mask", "idx"]
+    default_max_tokens = 16384
+    supports_packing = False
 
     def __init__(
         self,
@@ -190,17 +237,56 @@ class Pipeline:
         dataset.set_format(type="torch", columns=self.dataset_cols)
         return dataset
 
-    def create_dataloader(self, dataset, batch_size=1):
-        """Create a dataloader from the dataset."""
-        dataloader = torch.utils.data.DataLoader(
+    def create_dataloader(self, dataset, batch_size=1, max_tokens=None, packing=False):
+        """Create a dataloader from the dataset.
+
+        With `max_tokens`, batches are built from the length-sorted dataset by a
+        token budget instead of a fixed size, and `batch_size` caps the number of
+        examples per batch (None for no cap).
+        """
+        collator = DataCollator(self.tokenizer, packing=packing)
+        if max_tokens is None and not packing:
+            batch_size = batch_size or 1
+            return torch.utils.data.DataLoader(
+                dataset,
+                batch_size=batch_size,
+                shuffle=False,
+                pin_memory=True,
+                num_workers=self.num_workers,
+                collate_fn=collator,
+            )
+
+        batches = token_budget_batches(
+            dataset.with_format(None)["length"],
+            max_tokens or self.default_max_tokens,
+            max_batch_size=batch_size,
+            pad_to_multiple_of=collator.pad_to_multiple_of,
+            packing=packing,
+        )
+        return torch.utils.data.DataLoader(
             dataset,
-            batch_size=batch_size,
-            shuffle=False,
+            batch_sampler=batches,
             pin_memory=True,
             num_workers=self.num_workers,
-            collate_fn=DataCollator(self.tokenizer),
+            collate_fn=collator,
+        )
+
+    def check_packing(self, model):
+        """Check that the pipeline and model support sequence packing."""
+        if not self.supports_packing:
+            raise ValueError(f'Pipeline "{self.name}" does not support packing.')
+        attn_implementation = getattr(model.config, "_attn_implementation", None)
+        if attn_implementation != "flash_attention_2":
+            raise ValueError(
+                "Packing requires a model loaded with "
+                'attn_implementation="flash_attention_2".'
+            )
+
+    def unpack_logits(self, logits, lengths):
+        """Split packed logits by sequence and pad them into a batch."""
+        return torch.nn.utils.rnn.pad_sequence(
+            logits[0].split(lengths.tolist()), batch_first=True
         )
-        return dataloader
 
     def post_process_preds(self, examples, preds, **kwargs):
         """Post-process predictions hook."""
@@ -210,10 +296,21 @@ class Pipeline:
         """Process the outputs of a batch."""
         raise NotImplementedError
 
-    def predict(self, examples, batch_size=1, **kwargs):
-        """Predict the labels for the examples."""
-        num_pad_examples = len(examples) % batch_size
-        num_pad_examples = (batch_size - num_pad_examples) % batch_size
+    def predict(
+        self, examples, batch_size=None, max_tokens=None, packing=False, **kwargs
+    ):
+        """Predict the labels for the examples.
+
+        Examples are sorted by length and batched by a budget of `max_tokens`
+        padded tokens per batch (`default_max_tokens` by default), so short
+        examples are batched many at a time and long ones in small batches. If
+        only `batch_size` is given, batches have a fixed size instead. With
+        `packing`, each batch is concatenated into a single unpadded sequence,
+        which needs a pipeline with token-level outputs and a model using flash
+        attention.
+        """
+        if max_tokens is None and batch_size is None:
+            max_tokens = self.default_max_tokens
 
         dataset = self.create_dataset(examples)
 
@@ -222,10 +319,19 @@ class Pipeline:
         dataloader = self.create_dataloader(
             dataset,
             batch_size=batch_size,
+            max_tokens=max_tokens,
+            packing=packing,
         )
 
         model = self.model
         model.eval().to(self.device)
+        input_cols = {"input_ids": "input_ids", "attention_mask": "attention_mask"}
+        if packing:
+            self.check_packing(model)
+            input_cols = {
+                "input_ids": "packed_input_ids",
+                "position_ids": "position_ids",
+            }
 
         with torch.no_grad():
             autocast_context = (
@@ -237,10 +343,14 @@ class Pipeline:
                 for batch in tqdm(dataloader, desc="Predicting"):
                     idxs = batch.pop("idx").tolist()
                     inputs = {
-                        k: batch[k].to(self.device, non_blocking=False)
-                        for k in ["input_ids", "attention_mask"]
+                        k: batch[col].to(self.device, non_blocking=False)
+                        for k, col in input_cols.items()
                     }
                     outputs = model(**inputs)
+                    if packing:
+                        outputs.logits = self.unpack_logits(
+                            outputs.logits, batch["lengths"]
+                        )
                     batch_preds = self.process_batch(batch, outputs, **kwargs)
                     for i, idx in enumerate(idxs):
                         preds[idx] = batch_preds[i]
@@ -20,6 +20,7 @@ class TokenClassificationPipeline(Pipeline):
         "offset_mapping",
         "idx",
     ]
+    supports_packing = True
 
     def process_batch(self, batch, outputs, **kwargs):
         """Process the batch."""
@@ -1,20 +1,52 @@
 from docketanalyzer import extension_required
 
 with extension_required("ocr"):
-    from .document import PDFDocument, pdf_document, bulk_process_pdfs
+    from .binary import BinaryOCRData, load_binary, save_binary
+    from .cache import PageCache
+    from .checkpoint import PageCheckpoint, checkpoint_path
+    from .document import (
+        PDFDocument,
+        bulk_process_pdfs,
+        pdf_document,
+        stream_process_pdfs,
+    )
     from .layout import predict_layout
-    from .ocr import extract_ocr_text, extract_native_text
-    from .utils import load_pdf, merge_boxes, box_overlap_pct
+    from .metrics import OCRMetrics
+    from .ocr import (
+        extract_native_text,
+        extract_native_text_arrays,
+        extract_ocr_text,
+    )
+    from .utils import (
+        BoxIndex,
+        box_overlap_matrix,
+        box_overlap_pct,
+        load_pdf,
+        merge_box_segments,
+        merge_boxes,
+    )
 
 
 __all__ = [
+    "BinaryOCRData",
+    "BoxIndex",
+    "OCRMetrics",
     "PDFDocument",
+    "PageCache",
+    "PageCheckpoint",
+    "box_overlap_matrix",
     "box_overlap_pct",
     "bulk_process_pdfs",
+    "checkpoint_path",
     "extract_native_text",
+    "extract_native_text_arrays",
     "extract_ocr_text",
+    "load_binary",
     "load_pdf",
+    "merge_box_segments",
     "merge_boxes",
     "pdf_document",
     "predict_layout",
+    "save_binary",
+    "stream_process_pdfs",
 ]
@@ -0,0 +1,238 @@
+import json
+import struct
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"DAOCR\x00"
+BINARY_SUFFIX = ".bin"
+VERSION = 1
+ALIGNMENT = 64
+PREFIX = struct.Struct("<6sHI")
+
+
+def align(size: int) -> int:
+    """Rounds a size up to the array alignment."""
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def is_binary_ocr(path: str | Path) -> bool:
+    """Checks whether a file is in the binary OCR format."""
+    with Path(path).open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_binary(data: dict, path: str | Path) -> None:
+    """Saves document data in the binary OCR format.
+
+    The format is a fixed prefix (magic bytes, version, header length), a JSON
+    header and a set of aligned arrays:
+
+    - `page_blocks` (int64, pages + 1): Offsets of each page's blocks.
+    - `block_bboxes` (float32, blocks x 4) and `block_types` (uint8, blocks).
+    - `block_lines` (int64, blocks + 1): Offsets of each block's lines.
+    - `line_bboxes` (float32, lines x 4).
+    - `line_text` (int64, lines + 1): Offsets of each line in `text`.
+    - `text` (uint8): All line contents as one UTF-8 buffer.
+
+    Args:
+        data: Document data, as returned by `PDFDocument.data`.
+        path: The path to save to.
+    """
+    pages = data.get("pages", [])
+    block_types = []
+    page_blocks, block_lines, line_text = [0], [0], [0]
+    block_bboxes, block_type_ids, line_bboxes, text = [], [], [], []
+    for page in pages:
+        blocks = page.get("blocks", [])
+        page_blocks.append(page_blocks[-1] + len(blocks))
+        for block in blocks:
+            block_type = block.get("type", "text")
+            if block_type not in block_types:
+                block_types.append(block_type)
+            block_type_ids.append(block_types.index(block_type))
+            block_bboxes.append(block["bbox"])
+            lines = block.get("lines", [])
+            block_lines.append(block_lines[-1] + len(lines))
+            for line in lines:
+                content = line["content"].encode("utf-8")
+                text.append(content)
+                line_text.append(line_text[-1] + len(content))
+                line_bboxes.append(line["bbox"])
+
+    arrays = {
+        "page_blocks": np.array(page_blocks, dtype=np.int64),
+        "block_bboxes": np.array(block_bboxes, dtype=np.float32).reshape(-1, 4),
+        "block_types": np.array(block_type_ids, dtype=np.uint8),
+        "block_lines": np.array(block_lines, dtype=np.int64),
+        "line_bboxes": np.array(line_bboxes, dtype=np.float32).reshape(-1, 4),
+        "line_text": np.array(line_text, dtype=np.int64),
+        "text": np.frombuffer(b"".join(text), dtype=np.uint8),
+    }
+    header = {
+        "filename": data.get("filename"),
+        "page_ids": [page.get("i", i) for i, page in enumerate(pages)],
+        "block_types": block_types,
+        "arrays": {},
+    }
+
+    # Array offsets are relative to the first aligned position after the header
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = [offset, array.dtype.str, list(array.shape)]
+        offset += align(array.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8")
+    start = align(PREFIX.size + len(header_bytes))
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(start + header["arrays"][name][0])
+            f.write(array.tobytes())
+        f.truncate(start + offset)
+    tmp_path.replace(path)
+
+
+class BinaryOCRData:
+    """Read-only view of a document saved in the binary OCR format.
+
+    The arrays are memory-mapped, so opening a file is cheap and pages are only
+    decoded when they are accessed.
+
+    ```python
+    ocr = load_binary("doc.ocr.1.bin")
+    text = ocr.page_text(0)
+    page = ocr.page_data(0)
+    ```
+
+    Attributes:
+        path: The path to the file.
+        filename: The filename of the original PDF.
+        page_ids: The page index of each saved page.
+        type_names: The block type names, indexed by the `block_types` array.
+        page_blocks: Offsets of each page's blocks.
+        block_bboxes: Bounding boxes of all blocks.
+        block_types: Type of each block, as an index into `type_names`.
+        block_lines: Offsets of each block's lines.
+        line_bboxes: Bounding boxes of all lines.
+        line_text: Offsets of each line's content in `text`.
+        text: All line contents as one UTF-8 buffer.
+    """
+
+    def __init__(self, path: str | Path, mmap: bool = True):
+        """Opens a binary OCR file.
+
+        Args:
+            path: The path to the file.
+            mmap: Whether to memory-map the arrays instead of reading them.
+                Defaults to True.
+
+        Raises:
+            ValueError: If the file is not in the binary OCR format.
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            magic, version, header_size = PREFIX.unpack(f.read(PREFIX.size))
+            if magic != MAGIC or version > VERSION:
+                raise ValueError(f"Not a binary OCR file: {self.path}")
+            header = json.loads(f.read(header_size))
+        self.filename = header["filename"]
+        self.page_ids = header["page_ids"]
+        self.type_names = header["block_types"]
+
+        buffer = (
+            np.memmap(self.path, dtype=np.uint8, mode="r")
+            if mmap
+            else np.fromfile(self.path, dtype=np.uint8)
+        )
+        data_start = align(PREFIX.size + header_size)
+        for name, (offset, dtype, shape) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            start = data_start + offset
+            size = int(np.prod(shape)) * dtype.itemsize
+            array = buffer[start : start + size].view(dtype).reshape(shape)
+            setattr(self, name, array)
+
+    def __len__(self) -> int:
+        """Gets the number of pages."""
+        return len(self.page_ids)
+
+    def line_contents(self, start: int, end: int) -> list[str]:
+        """Decodes the contents of lines `start` to `end`."""
+        offsets = self.line_text[start : end + 1].tolist()
+        text = self.text[offsets[0] : offsets[-1]].tobytes()
+        base = offsets[0]
+        return [text[a - base : b - base].decode("utf-8") for a, b in pairwise(offsets)]
+
+    def page_text(self, i: int) -> str:
+        """Gets the text of a page without building its blocks.
+
+        Lines are joined with newlines and blocks with blank lines, matching
+        `Page.text`.
+        """
+        b0, b1 = self.page_blocks[i : i + 2].tolist()
+        block_lines = self.block_lines[b0 : b1 + 1].tolist()
+        contents = self.line_contents(block_lines[0], block_lines[-1])
+        base = block_lines[0]
+        return "\n\n".join(
+            "\n".join(contents[a - base : b - base]) for a, b in pairwise(block_lines)
+        )
+
+    def page_blocks_data(self, i: int) -> list[dict]:
+        """Gets the block data of a page."""
+        b0, b1 = self.page_blocks[i : i + 2].tolist()
+        block_lines = self.block_lines[b0 : b1 + 1].tolist()
+        contents = self.line_contents(block_lines[0], block_lines[-1])
+        line_bboxes = self.line_bboxes[block_lines[0] : block_lines[-1]].tolist()
+        block_bboxes = self.block_bboxes[b0:b1].tolist()
+        block_types = self.block_types[b0:b1].tolist()
+        base = block_lines[0]
+
+        blocks = []
+        for j in range(b1 - b0):
+            l0, l1 = block_lines[j] - base, block_lines[j + 1] - base
+            blocks.append(
+                {
+                    "i": j,
+                    "bbox": block_bboxes[j],
+                    "type": self.type_names[block_types[j]],
+                    "lines": [
+                        {
+                            "i": k,
+                            "bbox": line_bboxes[l0 + k],
+                            "content": contents[l0 + k],
+                        }
+                        for k in range(l1 - l0)
+                    ],
+                }
+            )
+        return blocks
+
+    def page_data(self, i: int) -> dict:
+        """Gets the data of a page, in the same format as `Page.data`."""
+        return {"i": self.page_ids[i], "blocks": self.page_blocks_data(i)}
+
+    @property
+    def data(self) -> dict:
+        """Gets the data of the document, in the same format as `PDFDocument.data`."""
+        return {
+            "filename": self.filename,
+            "pages": [self.page_data(i) for i in range(len(self))],
+        }
+
+
+def load_binary(path: str | Path, mmap: bool = True) -> BinaryOCRData:
+    """Opens a file in the binary OCR format.
+
+    Args:
+        path: The path to the file.
+        mmap: Whether to memory-map the arrays. Defaults to True.
+
+    Returns:
+        BinaryOCRData: A read-only view of the document data.
+    """
+    return BinaryOCRData(path, mmap=mmap)
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import peewee
+
+from docketanalyzer import CACHE_DIR
+
+from . import layout
+
+if TYPE_CHECKING:
+    import fitz
+
+    from .document import Page
+
+REF_PATTERN = re.compile(r"(\d+) \d+ R\b")
+PAGE_PATTERN = re.compile(r"/Type\s*/Pages?(?![A-Za-z])")
+
+
+def get_model_version() -> str:
+    """Gets a version string for the layout and OCR models.
+
+    Cached results are only reused while this stays the same.
+    """
+    try:
+        surya_version = version("surya-ocr")
+    except PackageNotFoundError:
+        surya_version = "unknown"
+    model_name = layout.LAYOUR_MODEL_PATH.name
+    if layout.LAYOUT_BACKEND != "torch":
+        model_name += f":{layout.LAYOUT_BACKEND}"
+    return f"{model_name}:surya-{surya_version}"
+
+
+def object_digest(
+    doc: "fitz.Document", xref: int, memo: dict[int, bytes], stack: set[int]
+) -> bytes:
+    """Hashes a PDF object together with every object it references.
+
+    References are replaced by the digest of the object they point to, so the
+    digest does not depend on xref numbers and identical objects hash the same
+    across documents. Streams are hashed from their raw data. Page objects,
+    such as an annotation's /P or a link destination, are not followed, so the
+    digest does not take in the rest of the document.
+
+    Args:
+        doc: The pymupdf Document the object belongs to.
+        xref: The xref number of the object.
+        memo: Digests of objects hashed so far, by xref.
+        stack: Xrefs of the objects being hashed, to break reference cycles.
+
+    Returns:
+        bytes: The digest of the object.
+    """
+    if xref in memo:
+        return memo[xref]
+    if xref in stack or not 0 < xref < doc.xref_length():
+        return b"ref"
+    source = doc.xref_object(xref, compressed=True)
+    if PAGE_PATTERN.search(source):
+        return b"page"
+    stack.add(xref)
+    h = hashlib.sha256()
+    h.update(resolve_refs(doc, source, memo, stack))
+    if doc.xref_is_stream(xref):
+        h.update(doc.xref_stream_raw(xref) or b"")
+    stack.discard(xref)
+    memo[xref] = h.digest()
+    return memo[xref]
+
+
+def resolve_refs(
+    doc: "fitz.Document", source: str, memo: dict[int, bytes], stack: set[int]
+) -> bytes:
+    """Replaces the references in a PDF object's source with their digests."""
+    return REF_PATTERN.sub(
+        lambda m: object_digest(doc, int(m[1]), memo, stack).hex(), source
+    ).encode()
+
+
+def page_hash(page: "Page") -> str:
+    """Hashes the content of a page.
+
+    The hash covers the page's content stream and its geometry together with
+    its resources: fonts with their font programs, images, and Form XObjects
+    with everything they draw, followed recursively. Annotations are included
+    the same way, so filled form fields (their /V and appearance streams) and
+    FreeText or stamp annotations count as content. Identical pages therefore
+    hash the same across documents without rendering them, while pages that
+    only wrap a form (`q /Fm0 Do Q`) hash differently if the forms differ.
+    Pages without a content stream are hashed from their rendered pixels
+    instead.
+
+    Args:
+        page: The page to hash.
+
+    Returns:
+        str: The hex digest of the page content.
+    """
+    fitz_page = page.fitz
+    h = hashlib.sha256()
+    h.update(repr((tuple(fitz_page.rect), fitz_page.rotation)).encode())
+    contents = fitz_page.read_contents()
+    if not contents:
+        h.update(page.get_img(page.doc.layout_dpi).tobytes())
+        return h.hexdigest()
+
+    h.update(contents)
+    doc, memo = fitz_page.parent, {}
+    # Resources may be inherited from the page tree
+    xref = fitz_page.xref
+    while xref:
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind != "null":
+            h.update(resolve_refs(doc, value, memo, set()))
+            break
+        kind, value = doc.xref_get_key(xref, "Parent")
+        xref = int(value.split()[0]) if kind == "xref" else 0
+    kind, value = doc.xref_get_key(fitz_page.xref, "Annots")
+    if kind != "null":
+        h.update(b"annots")
+        h.update(resolve_refs(doc, value, memo, set()))
+    return h.hexdigest()
+
+
+class PageCacheEntry(peewee.Model):
+    """A Peewee model for storing processed page blocks."""
+
+    key = peewee.CharField(primary_key=True)
+    blocks = peewee.TextField()
+    created = peewee.FloatField()
+
+
+class PageCache:
+    """Cache of processed pages keyed by page content.
+
+    Court filings repeat pages constantly (exhibits, cover sheets, certificates of
+    service), so pages are keyed by a hash of their content, the DPI and the model
+    version, and their final blocks are stored in a local SQLite database.
+
+    ```python
+    cache = PageCache()
+    doc = pdf_document(path, cache=cache).process()
+    print(cache.stats())
+    ```
+
+    Attributes:
+        db_path: Path to the SQLite database.
+        model_version: Version string of the models the blocks came from.
+        hits: Number of lookups that found a cached page.
+        misses: Number of lookups that did not.
+    """
+
+    def __init__(
+        self, db_path: str | Path | None = None, model_version: str | None = None
+    ):
+        """Initializes the cache.
+
+        Args:
+            db_path: Path to the SQLite database. Defaults to
+                `CACHE_DIR / "ocr" / "pages.db"`.
+            model_version: Version string of the models. Defaults to
+                `get_model_version()`.
+        """
+        self.db_path = Path(db_path or CACHE_DIR / "ocr" / "pages.db")
+        self.model_version = model_version or get_model_version()
+        self.hits = 0
+        self.misses = 0
+        self._table = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> type[PageCacheEntry]:
+        """Returns the table of cached pages."""
+        if self._table is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = peewee.SqliteDatabase(self.db_path, pragmas={"journal_mode": "wal"})
+
+            # Bound per instance so caches with different paths stay separate
+            class Entry(PageCacheEntry):
+                class Meta:
+                    database = db
+                    table_name = PageCacheEntry._meta.table_name
+
+            db.create_tables([Entry], safe=True)
+            self._table = Entry
+        return self._table
+
+    def key(self, page: "Page") -> str:
+        """Gets the cache key for a page.
+
+        The content hash is memoized on the page, while the DPI and model version
+        are added on every call.
+        """
+        if page.content_hash is None:
+            page.content_hash = page_hash(page)
+        dpi = f"{page.doc.layout_dpi}:{page.doc.ocr_dpi}"
+        return hashlib.sha256(
+            f"{page.content_hash}:{dpi}:{self.model_version}".encode()
+        ).hexdigest()
+
+    def get(self, page: "Page") -> list[dict] | None:
+        """Gets the cached blocks for a page.
+
+        Args:
+            page: The page to look up.
+
+        Returns:
+            list[dict] | None: The page's blocks, or None if it is not cached.
+        """
+        entry = self.table.get_or_none(self.table.key == self.key(page))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(entry.blocks)
+
+    def set(self, page: "Page") -> None:
+        """Stores the blocks of a processed page.
+
+        Args:
+            page: The processed page.
+        """
+        blocks = json.dumps(page.data["blocks"])
+        self.table.insert(
+            key=self.key(page), blocks=blocks, created=time.time()
+        ).on_conflict_replace().execute()
+
+    @property
+    def hit_rate(self) -> float:
+        """Gets the share of lookups that found a cached page."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """Gets the hit and miss counts and the hit rate."""
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def clear(self) -> None:
+        """Deletes all cached pages."""
+        self.table.delete().execute()
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+CHECKPOINT_SUFFIX = ".partial"
+
+
+def checkpoint_path(path: str | Path) -> Path:
+    """Gets the path of the checkpoint kept while an OCR file is produced."""
+    path = Path(path)
+    return path.with_name(path.name + CHECKPOINT_SUFFIX)
+
+
+class PageCheckpoint:
+    """Append-only file of processed pages, used to resume interrupted runs.
+
+    Each processed page is written as one line of JSON and flushed as soon as
+    it is processed, so a run that dies only loses the pages in flight. A line
+    cut short by a crash is dropped when the checkpoint is read.
+
+    ```python
+    doc = pdf_document(path).process(checkpoint="doc.ocr.json.partial")
+    doc.save("doc.ocr.json")
+    ```
+
+    Attributes:
+        path: The path to the checkpoint file.
+    """
+
+    def __init__(self, path: str | Path):
+        """Initializes the checkpoint.
+
+        Args:
+            path: The path to the checkpoint file.
+        """
+        self.path = Path(path)
+        self._file = None
+
+    def read(self) -> list[dict]:
+        """Reads the pages saved so far.
+
+        An incomplete last line is truncated from the file so that new pages
+        are appended after the last complete one.
+
+        Returns:
+            list[dict]: The data of each saved page, in the format of `Page.data`.
+        """
+        if not self.path.exists():
+            return []
+        content = self.path.read_bytes()
+        end = content.rfind(b"\n") + 1
+        if end < len(content):
+            with self.path.open("r+b") as f:
+                f.truncate(end)
+        return [json.loads(line) for line in content[:end].splitlines() if line]
+
+    def append(self, page_data: dict) -> None:
+        """Appends a processed page and flushes it to disk.
+
+        Args:
+            page_data: The page data, as returned by `Page.data`.
+        """
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a")
+        self._file.write(json.dumps(page_data) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Closes the checkpoint file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Closes and deletes the checkpoint file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "PageCheckpoint":
+        """Context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager cleanup."""
+        self.close()
@@ -1,7 +1,15 @@
+import io
 import json
-import tempfile
+import mmap
+import queue
+import threading
+import time
+import unicodedata
 import uuid
-from collections.abc import Generator, Iterator
+from collections.abc import Callable, Generator, Iterable, Iterator, Sized
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext, suppress
+from functools import partial
 from pathlib import Path
 
 import fitz
@@ -10,12 +18,151 @@ import regex as re
 from PIL import Image
 from tqdm import tqdm
 
-from docketanalyzer import load_clients
-
+from .binary import BINARY_SUFFIX, is_binary_ocr, load_binary, save_binary
+from .cache import PageCache
+from .checkpoint import PageCheckpoint
 from .layout import predict_layout
+from .metrics import OCRMetrics
 from .ocr import extract_native_text, extract_ocr_text
-from .remote import RemoteClient
-from .utils import box_overlap_pct, merge_boxes
+from .remote import TERMINAL_STATUSES, RemoteClient
+from .render import PageRenderer, effective_dpi, render_page
+from .utils import (
+    BoxIndex,
+    box_overlap_matrix,
+    boxes_extend,
+    load_s3,
+    merge_box_segments,
+    merge_boxes,
+    s3_available,
+)
+
+# Pages with more block/line pairs than this use a BoxIndex instead of a
+# dense overlap matrix.
+DENSE_OVERLAP_LIMIT = 50_000
+
+# PDFs at least this large are memory-mapped when their bytes are needed.
+MMAP_MIN_SIZE = 32 * 1024 * 1024
+
+# Pages to process: the first N pages (the last N if negative), a slice, page
+# indices, or a predicate on the native text of each page.
+PageSelection = int | slice | Iterable[int] | Callable[[str], bool]
+
+
+def text_coverage(layout: list[dict], lines: list[dict]) -> float:
+    """Calculates the share of the layout area covered by text lines.
+
+    Each block's coverage is the sum of its overlap with every line (capped at 1),
+    and blocks are weighted by their area.
+
+    Args:
+        layout: The layout blocks for the page.
+        lines: The text lines for the page.
+
+    Returns:
+        float: The covered fraction of the total layout area.
+    """
+    block_boxes = np.array([block["bbox"] for block in layout], dtype=np.float64)
+    block_boxes = block_boxes.reshape(-1, 4)
+    line_boxes = np.array([line["bbox"] for line in lines], dtype=np.float64)
+    line_boxes = line_boxes.reshape(-1, 4)
+
+    if len(block_boxes) * len(line_boxes) <= DENSE_OVERLAP_LIMIT:
+        coverage = box_overlap_matrix(
+            block_boxes, line_boxes, use_first_as_denominator=True
+        ).sum(axis=1)
+    else:
+        index = BoxIndex(line_boxes)
+        coverage = np.array(
+            [
+                box_overlap_matrix(
+                    box, line_boxes[index.query(box)], use_first_as_denominator=True
+                ).sum()
+                for box in block_boxes
+            ]
+        )
+    coverage = np.minimum(coverage, 1.0)
+
+    block_areas = (block_boxes[:, 2] - block_boxes[:, 0]) * (
+        block_boxes[:, 3] - block_boxes[:, 1]
+    )
+    return float((block_areas * coverage).sum()) / float(block_areas.sum())
+
+
+def page_has_clean_text(
+    page: "Page",
+    min_chars: int = 200,
+    min_alnum: float = 0.5,
+    max_bad_chars: float = 0.01,
+    min_coverage: float = 0.02,
+    max_image_coverage: float = 0.1,
+) -> bool:
+    """Cheaply checks whether a page's native text can be used without the models.
+
+    A page passes if it has no large images (scans with an OCR text layer), no
+    Type3 fonts, enough characters, few replacement or control characters and
+    text lines covering a minimum share of the page.
+
+    Args:
+        page: The Page object to check.
+        min_chars: The minimum number of non-whitespace characters.
+        min_alnum: The minimum share of alphanumeric characters.
+        max_bad_chars: The maximum share of replacement, control or
+            private-use characters.
+        min_coverage: The minimum share of the page area covered by text lines.
+        max_image_coverage: The maximum share of the page covered by any image.
+
+    Returns:
+        bool: True if the page's native text is clean.
+    """
+    fitz_page = page.fitz
+    page_area = abs(fitz_page.rect)
+    if not page_area:
+        return False
+    for image in fitz_page.get_image_info():
+        if (
+            abs(fitz.Rect(image["bbox"]) & fitz_page.rect) / page_area
+            > max_image_coverage
+        ):
+            return False
+    if any(font[2] == "Type3" for font in fitz_page.get_fonts()):
+        return False
+
+    page.extracted_text = page.native_text
+    text = "".join("".join(line["content"].split()) for line in page.extracted_text)
+    if len(text) < min_chars:
+        return False
+    if sum(c.isalnum() for c in text) / len(text) < min_alnum:
+        return False
+    bad_chars = sum(
+        c == "\ufffd" or unicodedata.category(c) in ("Cc", "Co", "Cs") for c in text
+    )
+    if bad_chars / len(text) > max_bad_chars:
+        return False
+
+    line_boxes = np.array([line["bbox"] for line in page.extracted_text])
+    line_area = np.prod(line_boxes[:, 2:] - line_boxes[:, :2], axis=1).sum()
+    return line_area / page_area >= min_coverage
+
+
+def native_text_blocks(lines: list[dict]) -> list[dict]:
+    """Groups native text lines into text blocks by their PDF text block.
+
+    Args:
+        lines: Lines from `extract_native_text`.
+
+    Returns:
+        list[dict]: Blocks with 'bbox', 'type' and 'lines' keys.
+    """
+    blocks, offsets = [], []
+    for i, line in enumerate(lines):
+        if not blocks or line.get("block") != lines[i - 1].get("block"):
+            blocks.append({"type": "text", "lines": []})
+            offsets.append(i)
+        blocks[-1]["lines"].append(line)
+    bboxes = merge_box_segments([line["bbox"] for line in lines], offsets)
+    for block, bbox in zip(blocks, bboxes.tolist(), strict=True):
+        block["bbox"] = tuple(bbox)
+    return blocks
 
 
 def page_needs_ocr(
@@ -36,23 +183,8 @@ def page_needs_ocr(
     Returns:
         bool: True if the page needs OCR processing, False otherwise.
     """
-    page.extracted_text = extract_native_text(page.fitz)
-    total_area = 0
-    covered_area = 0
-    for block in layout:
-        x1_min, y1_min, x1_max, y1_max = block["bbox"]
-        block_area = (x1_max - x1_min) * (y1_max - y1_min)
-        block_coverage = 0
-        for line in page.extracted_text:
-            block_coverage += box_overlap_pct(
-                block["bbox"],
-                line["bbox"],
-                use_first_as_denominator=True,
-            )
-        block_coverage = min(block_coverage, 1.0)
-        total_area += block_area
-        covered_area += block_area * block_coverage
-    return covered_area / total_area < min_overlap
+    page.extracted_text = page.native_text
+    return text_coverage(layout, page.extracted_text) < min_overlap
 
 
 def consolidate_blocks(page: "Page", layout: list[list[dict]]):
@@ -61,76 +193,266 @@ def consolidate_blocks(page: "Page", layout: list[list[dict]]):
     This function merges layout blocks with extracted line data to create a list
     of consolidated blocks containing both layout and text information.
     Any lines not contained within a layout block are added as separate text blocks.
+
+    Blocks claim lines in order, and a block's bbox grows with every line it
+    claims, so later lines are compared against the grown bbox. Candidate lines
+    are looked up with a BoxIndex and only re-queried when a claimed line grows
+    the bbox. Final bboxes are merged for all blocks at once.
     """
     lines = page.extracted_text
+    line_boxes = np.array([line["bbox"] for line in lines], dtype=np.float64)
+    line_boxes = line_boxes.reshape(-1, 4)
+    index = BoxIndex(line_boxes)
+    remaining = np.ones(len(lines), dtype=bool)
+    use_index = len(layout) * len(lines) > DENSE_OVERLAP_LIMIT
+
     blocks = []
+    claimed = []
     for block in layout:
         block["lines"] = []
-        drop_lines = []
-        new_bbox = block["bbox"]
-        for li, line in enumerate(lines):
-            if box_overlap_pct(block["bbox"], line["bbox"]) > 0.5:
-                block["lines"].append(line)
-                drop_lines.append(li)
-                new_bbox = merge_boxes(new_bbox, lines[li]["bbox"])
-            block["bbox"] = new_bbox
-        lines = [line for li, line in enumerate(lines) if li not in drop_lines]
-        if len(block["lines"]) > 0:
+        block_lines = []
+        bbox = block["bbox"]
+        start = 0
+        while start < len(lines):
+            candidates = index.query(bbox) if use_index else np.arange(len(lines))
+            candidates = candidates[candidates >= start]
+            candidates = candidates[remaining[candidates]]
+            overlaps = box_overlap_matrix([bbox], line_boxes[candidates])[0]
+            hits = candidates[overlaps > 0.5]
+            if not len(hits):
+                break
+            # Claim hits up to the first one that grows the bbox
+            grows = boxes_extend(line_boxes[hits], bbox)
+            if grows.any():
+                hits = hits[: grows.argmax() + 1]
+                bbox = merge_boxes(bbox, lines[hits[-1]]["bbox"])
+            remaining[hits] = False
+            block_lines += hits.tolist()
+            start = block_lines[-1] + 1
+            if not grows.any():
+                break
+        if block_lines:
+            block["lines"] = [lines[li] for li in block_lines]
             blocks.append(block)
-    for line in lines:
+            claimed.append(block_lines)
+
+    # Each block's bbox covers its layout bbox and all of its lines
+    if blocks:
+        boxes = np.concatenate(
+            [
+                np.vstack([block["bbox"], line_boxes[block_lines]])
+                for block, block_lines in zip(blocks, claimed, strict=True)
+            ]
+        )
+        offsets = np.cumsum([0] + [len(x) + 1 for x in claimed[:-1]])
+        merged = merge_box_segments(boxes, offsets).tolist()
+        for block, bbox in zip(blocks, merged, strict=True):
+            block["bbox"] = tuple(bbox)
+
+    for li in np.flatnonzero(remaining).tolist():
         blocks.append(
             {
-                "bbox": line["bbox"],
+                "bbox": lines[li]["bbox"],
                 "type": "text",
-                "lines": [line],
+                "lines": [lines[li]],
             }
         )
     return blocks
 
 
+def batch_pages(
+    pages: Iterable["Page | None"], batch_size: int
+) -> Generator[list["Page"], None, None]:
+    """Groups a stream of pages into batches.
+
+    A None in the stream ends the current batch early and is passed on as an
+    empty batch, which process_pages treats as a request to flush.
+    """
+    batch = []
+    for page in pages:
+        if page is None:
+            if batch:
+                yield batch
+                batch = []
+            yield []
+            continue
+        batch.append(page)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def process_pages(
-    pages: list["Page"],
+    pages: Iterable["Page | None"],
     batch_size: int = 1,
     verbose=True,
+    render_workers: int = 0,
+    prefetch: int = 2,
+    max_wait: float | None = None,
+    cache: PageCache | None = None,
+    native_fast_path: bool = False,
+    metrics: OCRMetrics | None = None,
+    renderer: PageRenderer | None = None,
 ) -> Generator["Page", None, None]:
     """Processes a list of pages and yields each processed page.
 
-    Page order is not preserved for streaming efficiency.
+    Page order is not preserved for streaming efficiency. Pages may come from
+    any number of documents and are read lazily, so `pages` can be a generator.
+    A None in `pages` flushes all pending pages before more are read.
+
+    Args:
+        pages: The pages to process.
+        batch_size: Number of pages to process in each batch. Defaults to 1.
+        verbose: Whether to show a progress bar. Defaults to True.
+        render_workers: Number of processes used to render upcoming pages while
+            the model runs. Defaults to 0 (render inline).
+        prefetch: Maximum number of batches rendered ahead. Defaults to 2.
+        max_wait: Maximum number of seconds a page may wait for the OCR batch to
+            fill up before a partial batch is run. Defaults to None (no limit).
+        cache: Optional PageCache. Cached pages skip the models and processed
+            pages are added to the cache.
+        native_fast_path: Whether pages that pass `page_has_clean_text` get
+            blocks from their native text without running the models.
+            Defaults to False.
+        metrics: Optional OCRMetrics to record stage timings and counters in.
+        renderer: Optional long-lived PageRenderer to render with, so its
+            processes are reused across calls. It is left open, and
+            `render_workers` and `prefetch` are ignored when it is given.
     """
-    needs_ocr = []
+    metrics = metrics or OCRMetrics()
+    needs_ocr, queued_at = [], []
+    total = -(-len(pages) // batch_size) if isinstance(pages, Sized) else None
+    ready = []
+
+    def lookup(pages: Iterable["Page | None"]) -> Generator["Page | None"]:
+        for page in pages:
+            if page is not None and cache is not None:
+                with metrics.time("cache"):
+                    blocks = cache.get(page)
+                if blocks is not None:
+                    page.set_blocks(blocks)
+                    page.clear_imgs()
+                    metrics.incr("cached_pages")
+                    ready.append(page)
+                    continue
+            if page is not None and native_fast_path:
+                with metrics.time("fast_path"):
+                    clean = page_has_clean_text(page)
+                    if clean:
+                        page.set_blocks(native_text_blocks(page.extracted_text))
+                if clean:
+                    metrics.incr("fast_path_pages")
+                    ready.append(page)
+                    continue
+            yield page
 
-    for i in tqdm(list(range(0, len(pages), batch_size)), disable=not verbose):
-        batch = pages[i : i + batch_size]
+    def render(batches: Iterable[list["Page"]]) -> Generator[tuple, None, None]:
+        batches = iter(renderer.imap(batches))
+        while True:
+            with metrics.time("render"):
+                item = next(batches, None)
+            if item is None:
+                return
+            yield item
+
+    def finish(pages: Iterable["Page"]) -> Generator["Page", None, None]:
+        for page in pages:
+            if cache is not None:
+                with metrics.time("cache"):
+                    cache.set(page)
+            metrics.incr("pages")
+            yield page
 
-        layouts = predict_layout(
-            [np.array(page.get_img(dpi=page.doc.dpi)) for page in batch],
-            batch_size=batch_size,
-            dpi=batch[0].doc.dpi,
-        )
+    def flush_ready() -> list["Page"]:
+        pages = ready.copy()
+        ready.clear()
+        metrics.incr("pages", len(pages))
+        return pages
+
+    def run_ocr(count: int) -> Generator["Page", None, None]:
+        nonlocal needs_ocr, queued_at
+        ocr_batch, needs_ocr = needs_ocr[:count], needs_ocr[count:]
+        waited, queued_at = queued_at[:count], queued_at[count:]
+        now = time.monotonic()
+        metrics.incr("queue_wait_seconds", sum(now - x for x in waited))
+        metrics.incr("ocr_pages", len(ocr_batch))
+        metrics.incr("ocr_batch_pages", len(ocr_batch))
+        metrics.incr("ocr_batch_capacity", batch_size)
+        return finish(process_ocr_batch(ocr_batch, metrics=metrics))
+
+    if renderer is None:
+        context = PageRenderer(workers=render_workers, prefetch=prefetch)
+    else:
+        context = nullcontext(renderer)
+    with context as renderer:
+        for batch, imgs in tqdm(
+            render(batch_pages(lookup(pages), batch_size)),
+            total=total,
+            disable=not verbose,
+        ):
+            yield from flush_ready()
+            if batch:
+                for page, img in zip(batch, imgs, strict=True):
+                    page.set_img(img, page.doc.layout_dpi)
+                with metrics.time("layout"):
+                    layouts = predict_layout(
+                        imgs,
+                        batch_size=batch_size,
+                        dpi=[page.render_dpi(page.doc.layout_dpi) for page in batch],
+                    )
+                metrics.incr("layout_batch_pages", len(batch))
+                metrics.incr("layout_batch_capacity", batch_size)
+
+                for page, layout in zip(batch, layouts, strict=True):
+                    page.layout = layout
+                    with metrics.time("needs_ocr"):
+                        page_ocr = page_needs_ocr(page, page.layout)
+                    if page_ocr:
+                        needs_ocr.append(page)
+                        queued_at.append(time.monotonic())
+                    else:
+                        with metrics.time("consolidate"):
+                            page.set_blocks(consolidate_blocks(page, page.layout))
+                        page.clear_imgs()
+                        yield from finish([page])
 
-        for page, layout in zip(batch, layouts, strict=True):
-            page.layout = layout
-            if page_needs_ocr(page, page.layout):
-                needs_ocr.append(page)
-            else:
-                page.set_blocks(consolidate_blocks(page, page.layout))
-                yield page
+            while len(needs_ocr) >= batch_size:
+                yield from run_ocr(batch_size)
 
-        while len(needs_ocr) >= batch_size:
-            ocr_batch = needs_ocr[:batch_size]
-            needs_ocr = needs_ocr[batch_size:]
-            ocr_data = extract_ocr_text([page.img for page in ocr_batch])
-            for i, page in enumerate(ocr_batch):
-                page.extracted_text = ocr_data[i]
-                page.set_blocks(consolidate_blocks(page, page.layout))
-                yield page
+            expired = max_wait is not None and (
+                needs_ocr and time.monotonic() - queued_at[0] >= max_wait
+            )
+            if needs_ocr and (not batch or expired):
+                yield from run_ocr(len(needs_ocr))
 
+    yield from flush_ready()
     if needs_ocr:
-        ocr_data = extract_ocr_text([page.img for page in needs_ocr])
-        for i, page in enumerate(needs_ocr):
-            page.extracted_text = ocr_data[i]
+        yield from run_ocr(len(needs_ocr))
+
+
+def process_ocr_batch(
+    pages: list["Page"], metrics: OCRMetrics | None = None
+) -> Generator["Page", None, None]:
+    """Runs OCR on a batch of pages and yields each processed page.
+
+    Pages are rendered at their document's OCR DPI, reusing the renders cached
+    during layout detection where possible. Renders are released once each page
+    is yielded.
+    """
+    metrics = metrics or OCRMetrics()
+    with metrics.time("ocr"):
+        ocr_data = extract_ocr_text(
+            [Image.fromarray(page.get_img(page.doc.ocr_dpi)) for page in pages],
+            dpi=[page.render_dpi(page.doc.ocr_dpi) for page in pages],
+        )
+    for page, extracted_text in zip(pages, ocr_data, strict=True):
+        page.extracted_text = extracted_text
+        with metrics.time("consolidate"):
             page.set_blocks(consolidate_blocks(page, page.layout))
-            yield page
+        page.clear_imgs()
+        yield page
 
 
 class DocumentComponent:
@@ -138,6 +460,9 @@ class DocumentComponent:
 
     This is an abstract base class that defines the common interface and behavior
     for all document components (lines, blocks, pages, etc.) in the document hierarchy.
+    Components use `__slots__`, since large documents hold many thousands of them,
+    and subclasses override the generic parent-walking properties with direct
+    lookups.
 
     Attributes:
         parent_attr: The attribute name that references the parent component.
@@ -145,6 +470,8 @@ class DocumentComponent:
         text_join: The string used to join text from child components.
     """
 
+    __slots__ = ()
+
     parent_attr = None
     child_attr = None
     text_join = ""
@@ -229,7 +556,7 @@ class DocumentComponent:
             save: Optional path to save the clipped image to.
 
         Returns:
-            Image: The clipped image.
+            np.ndarray: The clipped image.
         """
         bbox = bbox or self.bbox
         return self.parent.clip(bbox, save)
@@ -274,6 +601,8 @@ class Line(DocumentComponent):
         content: The text content of the line.
     """
 
+    __slots__ = ("_content", "bbox", "block", "i")
+
     parent_attr = "block"
 
     def __init__(
@@ -294,7 +623,38 @@ class Line(DocumentComponent):
         self.block = block
         self.i = i
         self.bbox = bbox
-        self.content = content
+        self._content = content
+
+    @property
+    def content(self) -> str:
+        """Gets the text content of the line."""
+        return self._content
+
+    @content.setter
+    def content(self, content: str) -> None:
+        """Sets the text content of the line, invalidating the cached block text."""
+        self._content = content
+        self.block.invalidate_text()
+
+    @property
+    def text(self) -> str:
+        """Gets the text content of the line."""
+        return self._content
+
+    @property
+    def page_num(self) -> int:
+        """Gets the page number this line belongs to."""
+        return self.block.page.i
+
+    @property
+    def doc(self) -> "PDFDocument":
+        """Gets the document this line belongs to."""
+        return self.block.page._doc
+
+    @property
+    def id(self) -> str:
+        """Gets a unique identifier for this line."""
+        return f"{self.block.page.i}-{self.block.i}-{self.i}"
 
     @property
     def data(self) -> dict:
@@ -306,7 +666,7 @@ class Line(DocumentComponent):
         return {
             "i": self.i,
             "bbox": self.bbox,
-            "content": self.content,
+            "content": self._content,
         }
 
 
@@ -323,6 +683,8 @@ class Block(DocumentComponent):
         lines: The list of Line components in this block.
     """
 
+    __slots__ = ("_lines", "_text", "bbox", "block_type", "i", "page")
+
     parent_attr = "page"
     child_attr = "lines"
     text_join = "\n"
@@ -348,13 +710,55 @@ class Block(DocumentComponent):
         self.i = i
         self.bbox = bbox
         self.block_type = block_type
-        self.lines = []
+        self._lines = []
+        self._text = None
         if lines is not None:
-            self.lines = [
+            self._lines = [
                 Line(self, i, line["bbox"], line["content"])
                 for i, line in enumerate(lines)
             ]
 
+    @property
+    def lines(self) -> list[Line]:
+        """Gets the lines in this block."""
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: list[Line]) -> None:
+        """Sets the lines in this block, invalidating the cached text."""
+        self._lines = lines
+        self.invalidate_text()
+
+    def invalidate_text(self) -> None:
+        """Clears the cached text of this block and its page."""
+        self._text = None
+        self.page._text = None
+
+    @property
+    def text(self) -> str:
+        """Gets the text of the block's lines, joined by newlines.
+
+        The text is cached until the lines change.
+        """
+        if self._text is None:
+            self._text = "\n".join([line._content for line in self._lines])
+        return self._text
+
+    @property
+    def page_num(self) -> int:
+        """Gets the page number this block belongs to."""
+        return self.page.i
+
+    @property
+    def doc(self) -> "PDFDocument":
+        """Gets the document this block belongs to."""
+        return self.page._doc
+
+    @property
+    def id(self) -> str:
+        """Gets a unique identifier for this block."""
+        return f"{self.page.i}-{self.i}"
+
     @property
     def data(self) -> dict:
         """Gets a dictionary representation of this block.
@@ -366,7 +770,7 @@ class Block(DocumentComponent):
             "i": self.i,
             "bbox": self.bbox,
             "type": self.block_type,
-            "lines": [line.data for line in self.lines],
+            "lines": [line.data for line in self._lines],
         }
 
 
@@ -379,11 +783,28 @@ class Page(DocumentComponent):
         _doc: The parent document containing this page.
         i: The index of this page within the document.
         blocks: The list of Block components on this page.
-        img: The image representation of the page (set during processing).
+        img: The image representation of the page at the document DPI.
         extracted_text: The extracted text data (set during processing).
+        native_text: The lines of native PDF text, extracted once per page.
         needs_ocr: Whether this page needs OCR processing.
+        processed: Whether blocks have been set on this page, by processing or
+            by loading saved data.
     """
 
+    __slots__ = (
+        "_block_loader",
+        "_blocks",
+        "_doc",
+        "_imgs",
+        "_native_text",
+        "_text",
+        "content_hash",
+        "extracted_text",
+        "i",
+        "layout",
+        "processed",
+    )
+
     parent_attr = "doc"
     child_attr = "blocks"
     text_join = "\n\n"
@@ -398,26 +819,73 @@ class Page(DocumentComponent):
         """
         self._doc = doc
         self.i = i
-        self.blocks = []
+        self._blocks = []
+        self._block_loader = None
+        self._text = None
+        self.processed = False
+        self._native_text = None
         self.extracted_text = None
         self.layout = None
+        self.content_hash = None
+        self._imgs = {}
         if blocks is not None:
             self.set_blocks(blocks)
 
-    def get_img(self, dpi: int | None = None) -> Image.Image:
-        """Gets the image representation of this page."""
-        if dpi is not None:
-            mat = fitz.Matrix(self.doc.dpi / 72, self.doc.dpi / 72)
-            pm = self.fitz.get_pixmap(matrix=mat, alpha=False)
-            if pm.width > 4500 or pm.height > 4500:
-                pm = self.fitz.get_pixmap(alpha=False)
-        else:
-            pm = self.fitz.get_pixmap(alpha=False)
-        return Image.frombytes("RGB", (pm.width, pm.height), pm.samples)
+    def get_img(self, dpi: int | None = None) -> np.ndarray:
+        """Gets the image representation of this page as an RGB array.
+
+        Renders are cached per DPI until `clear_imgs` is called, so layout
+        detection, OCR and clipping share a single render. If a cached render at
+        a multiple of the requested DPI exists, a strided view of it is returned
+        instead of rendering the page again. Large pages are rendered at a lower
+        resolution, given by `render_dpi`.
+
+        Args:
+            dpi: The resolution to render at. Defaults to the document DPI.
+
+        Returns:
+            np.ndarray: A read-only (height, width, 3) uint8 array.
+        """
+        dpi = dpi or self.doc.dpi
+        if dpi not in self._imgs:
+            for cached_dpi, img in self._imgs.items():
+                # Strided views only have the right scale for unreduced renders
+                if cached_dpi % dpi == 0 and self.render_dpi(cached_dpi) == cached_dpi:
+                    step = cached_dpi // dpi
+                    self._imgs[dpi] = img[::step, ::step]
+                    break
+            else:
+                self._imgs[dpi] = render_page(self.fitz, dpi)
+        return self._imgs[dpi]
+
+    def render_dpi(self, dpi: int | None = None) -> float:
+        """Gets the resolution this page is actually rendered at for a DPI.
+
+        Args:
+            dpi: The requested resolution. Defaults to the document DPI.
+
+        Returns:
+            float: The resolution of the render, lower than `dpi` for pages
+                too large to render at full resolution.
+        """
+        return effective_dpi(self.fitz, dpi or self.doc.dpi)
+
+    def set_img(self, img: np.ndarray, dpi: int | None = None) -> None:
+        """Caches an existing render of this page.
+
+        Args:
+            img: The rendered page as an RGB array.
+            dpi: The resolution of the render. Defaults to the document DPI.
+        """
+        self._imgs[dpi or self.doc.dpi] = img
+
+    def clear_imgs(self) -> None:
+        """Releases any cached renders of this page."""
+        self._imgs = {}
 
     @property
-    def img(self) -> Image.Image:
-        """Gets the image representation of this page."""
+    def img(self) -> np.ndarray:
+        """Gets the image representation of this page at the document DPI."""
         return self.get_img()
 
     @property
@@ -429,12 +897,79 @@ class Page(DocumentComponent):
         """
         return self._doc.doc[self.i]
 
+    @property
+    def native_text(self) -> list[dict]:
+        """Gets the lines of native PDF text on this page.
+
+        The lines are extracted on first access and reused afterwards, for
+        example when the page is checked for the fast path and then for OCR, or
+        processed again.
+
+        Returns:
+            list[dict]: Lines from `extract_native_text`.
+        """
+        if self._native_text is None:
+            self._native_text = extract_native_text(self.fitz)
+        return self._native_text
+
     def draw(self, bbox: tuple[float, float, float, float], **kwargs) -> None:
         """Draws a rectangle on the page."""
         bbox = [x for x in bbox]
         rect = fitz.Rect(*bbox)
         self.fitz.draw_rect(rect, **kwargs)
 
+    @property
+    def blocks(self) -> list[Block]:
+        """Gets the blocks on this page, materializing them if they were deferred."""
+        if self._block_loader is not None:
+            loader, self._block_loader = self._block_loader, None
+            self.set_blocks(loader())
+        return self._blocks
+
+    @blocks.setter
+    def blocks(self, blocks: list[Block]) -> None:
+        """Sets the blocks on this page, invalidating the cached text."""
+        self._blocks = blocks
+        self._block_loader = None
+        self._text = None
+        self.processed = True
+
+    def set_lazy_blocks(self, loader: Callable[[], list[dict]]) -> None:
+        """Defers setting the blocks for this page until they are accessed.
+
+        Args:
+            loader: A function returning the block data to set.
+        """
+        self._blocks = []
+        self._block_loader = loader
+        self._text = None
+        self.processed = True
+
+    @property
+    def text(self) -> str:
+        """Gets the text of the page's blocks, joined by blank lines.
+
+        The text is cached until the blocks change.
+        """
+        if self._text is None:
+            self._text = "\n\n".join([block.text for block in self.blocks])
+        return self._text
+
+    @property
+    def page_num(self) -> int:
+        """Gets the page number (0-indexed)."""
+        return self.i
+
+    @property
+    def doc(self) -> "PDFDocument":
+        """Gets the document this page belongs to."""
+        return self._doc
+
+    @property
+    def id(self) -> int:
+        """Gets a unique identifier for this page."""
+        return self.i
+
     def set_blocks(self, blocks: list[dict]) -> None:
         """Sets the blocks for this page.
 
@@ -457,21 +992,24 @@ class Page(DocumentComponent):
         self,
         bbox: tuple[float, float, float, float] | None = None,
         save: str | None = None,
-    ) -> Image.Image:
+    ) -> np.ndarray:
         """Clips an image from this page.
 
         Args:
-            bbox: The bounding box to clip. If None, uses the entire page.
+            bbox: The bounding box to clip in PDF points. If None, uses the
+                entire page.
             save: Optional path to save the clipped image to.
 
         Returns:
-            Image.Image: The clipped image.
+            np.ndarray: The clipped image.
         """
-        if self.img is None:
-            return None
+        img = self.get_img()
+        scale = img.shape[1] / self.fitz.rect.width
 
-        x1, y1, x2, y2 = bbox or (0, 0, self.img.shape[1], self.img.shape[0])
-        clip = self.img[int(y1) : int(y2), int(x1) : int(x2)]
+        x1, y1, x2, y2 = (
+            [x * scale for x in bbox] if bbox else (0, 0, *img.shape[1::-1])
+        )
+        clip = img[int(y1) : int(y2), int(x1) : int(x2)]
 
         if save:
             Image.fromarray(clip).save(save)
@@ -501,9 +1039,15 @@ class PDFDocument:
     Attributes:
         doc: The underlying PyMuPDF document.
         filename: The name of the PDF file.
-        dpi: The resolution to use when rendering pages for OCR.
+        dpi: The default resolution for rendering pages.
+        layout_dpi: The resolution pages are rendered at for layout detection.
+        ocr_dpi: The resolution pages are rendered at for OCR.
         pages: The list of Page components in the document.
         remote: Whether to use remote processing via RemoteClient.
+        cache: The PageCache used when processing locally, if any.
+        native_fast_path: Whether pages with clean native text skip the models.
+        metrics: The OCRMetrics that local processing is recorded in, if any.
+        page_selection: The pages processed by default, or None for all pages.
     """
 
     def __init__(
@@ -515,6 +1059,12 @@ class PDFDocument:
         remote: bool = False,
         api_key: str | None = None,
         endpoint_url: str | None = None,
+        cache: PageCache | bool | None = None,
+        native_fast_path: bool = False,
+        metrics: OCRMetrics | bool | None = None,
+        layout_dpi: int | None = None,
+        ocr_dpi: int | None = None,
+        pages: PageSelection | None = None,
     ):
         """Initializes a new PDFDocument.
 
@@ -522,103 +1072,400 @@ class PDFDocument:
             file_or_path: The PDF file content as bytes, or a path to the PDF file.
             filename: Optional name for the PDF file.
             dpi: The resolution to use when rendering pages for OCR. Defaults to 200.
+                Also the default for `layout_dpi` and `ocr_dpi`.
             use_s3: Whether to upload the PDF to S3 for remote processing.
                 Defaults to True.
             remote: Whether to use remote processing via RemoteClient.
                 Defaults to False.
             api_key: Optional API key for remote processing.
             endpoint_url: Optional full endpoint URL for remote processing.
+            cache: A PageCache to reuse processed pages from, or True to use the
+                default PageCache. Defaults to None (no cache).
+            native_fast_path: Whether pages with clean native text get blocks from
+                it directly, skipping the layout and OCR models. Defaults to False.
+            metrics: An OCRMetrics to record processing in, or True to attach a
+                new one. Defaults to None (no metrics).
+            layout_dpi: The resolution for layout detection, which works well
+                at lower resolutions than OCR. Defaults to `dpi`.
+            ocr_dpi: The resolution for OCR. Defaults to `dpi`.
+            pages: The pages to process by default (see `select_pages`).
+                Defaults to None (all pages).
         """
+        # PyMuPDF reads path inputs from the file as needed, so the bytes of a
+        # PDF on disk are only loaded if remote processing needs them.
         if isinstance(file_or_path, bytes):
             self.doc = fitz.open("pdf", file_or_path)
-            self.pdf_bytes = file_or_path
+            self._pdf_bytes = file_or_path
             self.pdf_path = None
             self.filename = filename or "document.pdf"
         else:
             self.doc = fitz.open(file_or_path)
-            self.pdf_bytes = self.doc.tobytes()
+            self._pdf_bytes = None
             self.pdf_path = Path(file_or_path).resolve()
             self.filename = filename or self.pdf_path.name
         self.dpi = dpi
+        self.layout_dpi = layout_dpi or dpi
+        self.ocr_dpi = ocr_dpi or dpi
         self.remote = remote
+        self.cache = PageCache() if cache is True else cache or None
+        self.native_fast_path = native_fast_path
+        self.metrics = OCRMetrics() if metrics is True else metrics or None
         self.pages = [Page(self, i) for i in range(len(self.doc))]
-        self.remote_client = RemoteClient(api_key=api_key, endpoint_url=endpoint_url)
+        self.page_selection = pages
+        self.api_key = api_key
+        self.endpoint_url = endpoint_url
+        self._remote_client = None
         self.use_s3 = use_s3
-        self.s3 = load_clients("s3")
-        self.s3_available = self.s3.status()
-        self.s3_key = (
-            None if not self.s3_available else f"tmp/{uuid.uuid4()}_{self.filename}"
-        )
+        self._s3_key = f"tmp/{uuid.uuid4()}_{self.filename}"
+
+    @property
+    def pdf_bytes(self) -> bytes | mmap.mmap:
+        """Gets the content of the PDF file.
 
-    def stream(self, batch_size: int = 1) -> Generator[Page, None, None]:
+        Path inputs are read on first access. Files of at least MMAP_MIN_SIZE
+        bytes are memory-mapped instead of read into memory.
+        """
+        if self._pdf_bytes is None:
+            with self.pdf_path.open("rb") as f:
+                if self.pdf_path.stat().st_size >= MMAP_MIN_SIZE:
+                    self._pdf_bytes = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self._pdf_bytes = f.read()
+        return self._pdf_bytes
+
+    @property
+    def remote_client(self) -> RemoteClient:
+        """Gets the client for remote processing, creating it if needed."""
+        if self._remote_client is None:
+            self._remote_client = RemoteClient(
+                api_key=self.api_key, endpoint_url=self.endpoint_url
+            )
+        return self._remote_client
+
+    @property
+    def s3(self):
+        """Gets the S3 client, which is shared across documents."""
+        return load_s3()
+
+    @property
+    def s3_available(self) -> bool:
+        """Checks whether S3 is available, once per process."""
+        return s3_available()
+
+    @property
+    def s3_key(self) -> str | None:
+        """Gets the temporary S3 key for remote processing, if S3 is available."""
+        return self._s3_key if self.s3_available else None
+
+    def select_pages(
+        self, pages: PageSelection | None = None, missing: bool = False
+    ) -> list[Page]:
+        """Gets a selection of pages, in document order.
+
+        Args:
+            pages: The pages to select. Either the first N pages (or the last N
+                if negative), a slice, an iterable of page indices (negative
+                indices count from the end and indices past the end are
+                ignored), or a function that takes the native text of a page and
+                returns whether to select it. Defaults to `page_selection`, or
+                all pages if that is None.
+            missing: Whether to leave out pages that are already processed.
+                Defaults to False.
+
+        Returns:
+            list[Page]: The selected pages.
+        """
+        pages = self.page_selection if pages is None else pages
+        if callable(pages):
+            selected = [page for page in self.pages if pages(page.fitz.get_text())]
+        else:
+            num_pages = len(self)
+            all_pages = range(num_pages)
+            if pages is None:
+                pages = all_pages
+            elif isinstance(pages, int):
+                pages = all_pages[:pages] if pages >= 0 else all_pages[pages:]
+            elif isinstance(pages, slice):
+                pages = all_pages[pages]
+            indices = {i % num_pages for i in pages if -num_pages <= i < num_pages}
+            selected = [self.pages[i] for i in sorted(indices)]
+        return [page for page in selected if not (missing and page.processed)]
+
+    def stream(
+        self,
+        batch_size: int = 1,
+        render_workers: int = 0,
+        pages_per_job: int | None = None,
+        max_remote_jobs: int = 8,
+        pages: PageSelection | None = None,
+        missing: bool = False,
+        checkpoint: str | Path | None = None,
+    ) -> Generator[Page, None, None]:
         """Processes the document page by page and yields each processed page.
 
         If remote=True, uses the RemoteClient for processing.
 
+        With a `checkpoint` path, each page is appended to a checkpoint file as
+        it is yielded (see `PageCheckpoint`). If the file already exists, the
+        pages in it are loaded first and only the remaining pages are processed,
+        so an interrupted run picks up where it stopped.
+
         Args:
             batch_size: Number of pages to process in each batch. Defaults to 1.
+            render_workers: Number of processes used to render pages ahead of the
+                layout model when processing locally. Defaults to 0.
+            pages_per_job: When processing remotely, splits the document into
+                jobs of this many pages that run concurrently. Defaults to None
+                (one job).
+            max_remote_jobs: Maximum number of remote jobs running at once.
+                Defaults to 8.
+            pages: The pages to process (see `select_pages`). Defaults to
+                `page_selection`, or all pages if that is None.
+            missing: Whether to only process pages that are not processed yet,
+                for example to complete a document loaded from partial results.
+                Defaults to False.
+            checkpoint: Optional path to a checkpoint file to resume from and
+                append processed pages to.
 
         Yields:
             Page: Each processed page.
         """
+        if checkpoint is None:
+            yield from self.stream_pages(
+                self.select_pages(pages, missing=missing),
+                batch_size=batch_size,
+                render_workers=render_workers,
+                pages_per_job=pages_per_job,
+                max_remote_jobs=max_remote_jobs,
+            )
+            return
+
+        with PageCheckpoint(checkpoint) as saved:
+            saved_pages = saved.read()
+            if saved_pages:
+                self.load({"pages": saved_pages})
+            for page in self.stream_pages(
+                self.select_pages(pages, missing=missing or bool(saved_pages)),
+                batch_size=batch_size,
+                render_workers=render_workers,
+                pages_per_job=pages_per_job,
+                max_remote_jobs=max_remote_jobs,
+            ):
+                saved.append(page.data)
+                yield page
+
+    def stream_pages(
+        self,
+        pages: list[Page],
+        batch_size: int = 1,
+        render_workers: int = 0,
+        pages_per_job: int | None = None,
+        max_remote_jobs: int = 8,
+    ) -> Generator[Page, None, None]:
+        """Processes the given pages locally or remotely, yielding each one."""
         if self.remote:
+            yield from self.stream_remote(
+                batch_size=batch_size,
+                pages_per_job=pages_per_job,
+                max_jobs=max_remote_jobs,
+                pages=[page.i for page in pages],
+            )
+        else:
+            yield from process_pages(
+                pages,
+                batch_size=batch_size,
+                render_workers=render_workers,
+                cache=self.cache,
+                native_fast_path=self.native_fast_path,
+                metrics=self.metrics,
+            )
+
+    def page_ranges(
+        self, pages_per_job: int | None = None, pages: Iterable[int] | None = None
+    ) -> list[tuple[int, int]]:
+        """Splits pages into ranges of at most `pages_per_job` consecutive pages.
+
+        Args:
+            pages_per_job: Maximum number of pages per range. Defaults to None
+                (no limit).
+            pages: Indices of the pages to cover. Defaults to None (all pages).
+
+        Returns:
+            list[tuple[int, int]]: The (start, end) page indices of each range.
+        """
+        step = pages_per_job or len(self) or 1
+        ranges = []
+        for i in sorted(set(range(len(self)) if pages is None else pages)):
+            if ranges and ranges[-1][1] == i and i - ranges[-1][0] < step:
+                ranges[-1][1] += 1
+            else:
+                ranges.append([i, i + 1])
+        return [(start, end) for start, end in ranges]
+
+    def range_bytes(self, start: int, end: int) -> bytes | mmap.mmap:
+        """Gets a PDF with the pages from `start` to `end` of this document."""
+        if (start, end) == (0, len(self)):
+            return self.pdf_bytes
+        chunk = fitz.open()
+        try:
+            chunk.insert_pdf(self.doc, from_page=start, to_page=end - 1)
+            return chunk.tobytes()
+        finally:
+            chunk.close()
+
+    def stream_remote(
+        self,
+        batch_size: int = 1,
+        pages_per_job: int | None = None,
+        max_jobs: int = 8,
+        pages: Iterable[int] | None = None,
+    ) -> Generator[Page, None, None]:
+        """Processes the document with the RemoteClient.
+
+        The document is split into page ranges that are submitted as concurrent
+        jobs, so a long filing is spread across several remote workers. Each
+        range is uploaded to S3 from memory when S3 is available, or sent inline
+        otherwise. Pages are yielded as they arrive and placed by their offset
+        in the document. If a job fails or the stream is stopped early, the jobs
+        still running are cancelled on the endpoint.
+
+        Args:
+            batch_size: Number of pages to process in each batch. Defaults to 1.
+            pages_per_job: Maximum number of pages per job. Defaults to None
+                (one job).
+            max_jobs: Maximum number of jobs running at once. Defaults to 8.
+            pages: Indices of the pages to process. Defaults to None (all
+                pages).
+
+        Yields:
+            Page: Each processed page.
+        """
+        ranges = self.page_ranges(pages_per_job, pages)
+        use_s3 = self.use_s3 and self.s3_available
+        results = queue.Queue()
+        # PyMuPDF is not thread-safe, so ranges are extracted one at a time
+        fitz_lock = threading.Lock()
+        # Jobs still running by range start, cancelled if the stream stops early
+        running_jobs, stopping = {}, threading.Event()
+
+        def submit(start: int, end: int) -> Generator[dict, None, None]:
             s3_key, file = None, None
             try:
-                if self.use_s3 and self.s3_available:
-                    if self.pdf_path is not None:
-                        self.s3.upload(self.pdf_path, self.s3_key)
-                    else:
-                        with tempfile.NamedTemporaryFile() as f:
-                            f.write(self.pdf_bytes)
-                            self.s3.upload(f.name, self.s3_key)
-                    s3_key = self.s3_key
+                if use_s3 and ranges == [(0, len(self))] and self.pdf_path:
+                    s3_key = self.s3.upload(self.pdf_path, self.s3_key)
                 else:
-                    file = self.pdf_bytes
+                    with fitz_lock:
+                        content = self.range_bytes(start, end)
+                    if use_s3:
+                        s3_key = self.s3_key
+                        if len(ranges) > 1:
+                            s3_key = f"{s3_key}.{start}-{end}"
+                        self.s3.upload_fileobj(io.BytesIO(content), s3_key)
+                    else:
+                        file = content
 
-                for result in self.remote_client(
+                job_id = self.remote_client.submit(
                     file=file,
                     s3_key=s3_key,
                     filename=self.filename,
                     batch_size=batch_size,
-                ):
-                    if "stream" in result:
-                        for stream_item in result["stream"]:
-                            if (
-                                "output" in stream_item
-                                and "page" in stream_item["output"]
-                            ):
-                                page_data = stream_item["output"]["page"]
-                                page_idx = page_data.get("i", 0)
-
-                                if page_idx < len(self.pages):
-                                    self.pages[page_idx].set_blocks(
-                                        page_data.get("blocks", [])
-                                    )
-                                    yield self.pages[page_idx]
-
-                    status = result.get("status")
-                    if status == "COMPLETED":
-                        break
-                    elif status in ["FAILED", "CANCELLED"]:
-                        raise Exception(result)
+                )
+                running_jobs[start] = job_id
+                if stopping.is_set():
+                    self.remote_client.cancel_job(job_id)
+                    return
+                yield from self.remote_client.stream_results(job_id)
             finally:
                 if s3_key is not None:
-                    self.s3.delete(self.s3_key)
-        else:
-            yield from process_pages(self.pages, batch_size=batch_size)
+                    self.s3.delete(s3_key)
 
-    def process(self, batch_size: int = 1) -> "PDFDocument":
-        """Processes the entire document at once.
+        def run_job(start: int, end: int) -> None:
+            try:
+                with closing(submit(start, end)) as job_results:
+                    for result in job_results:
+                        for stream_item in result.get("stream", []):
+                            page_data = stream_item.get("output", {}).get("page")
+                            if page_data is not None:
+                                results.put((start, page_data))
+
+                        status = result.get("status")
+                        if status in TERMINAL_STATUSES:
+                            running_jobs.pop(start, None)
+                        if status == "COMPLETED":
+                            break
+                        elif status in ["FAILED", "CANCELLED"]:
+                            raise Exception(result)
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(None)
+
+        executor = ThreadPoolExecutor(max(min(max_jobs, len(ranges)), 1))
+        try:
+            for start, end in ranges:
+                executor.submit(run_job, start, end)
+            remaining = len(ranges)
+            while remaining:
+                item = results.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                start, page_data = item
+                page_idx = start + page_data.get("i", 0)
+                if page_idx < len(self.pages):
+                    self.pages[page_idx].set_blocks(page_data.get("blocks", []))
+                    yield self.pages[page_idx]
+        finally:
+            stopping.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            for job_id in list(running_jobs.values()):
+                with suppress(Exception):
+                    self.remote_client.cancel_job(job_id)
+
+    def process(
+        self,
+        batch_size: int = 1,
+        render_workers: int = 0,
+        pages_per_job: int | None = None,
+        max_remote_jobs: int = 8,
+        pages: PageSelection | None = None,
+        missing: bool = False,
+        checkpoint: str | Path | None = None,
+    ) -> "PDFDocument":
+        """Processes the entire document, or a selection of pages, at once.
 
         This just runs stream in a loop and returns the document when done.
 
         Args:
             batch_size: Number of pages to process in each batch. Defaults to 1.
+            render_workers: Number of processes used to render pages ahead of the
+                layout model when processing locally. Defaults to 0.
+            pages_per_job: When processing remotely, splits the document into
+                jobs of this many pages that run concurrently. Defaults to None
+                (one job).
+            max_remote_jobs: Maximum number of remote jobs running at once.
+                Defaults to 8.
+            pages: The pages to process (see `select_pages`). Defaults to
+                `page_selection`, or all pages if that is None.
+            missing: Whether to only process pages that are not processed yet.
+                Defaults to False.
+            checkpoint: Optional path to a checkpoint file to resume from and
+                append processed pages to (see `stream`).
 
         Returns:
             PDFDocument: The processed document (self).
         """
-        for _ in self.stream(batch_size=batch_size):
+        for _ in self.stream(
+            batch_size=batch_size,
+            render_workers=render_workers,
+            pages_per_job=pages_per_job,
+            max_remote_jobs=max_remote_jobs,
+            pages=pages,
+            missing=missing,
+            checkpoint=checkpoint,
+        ):
             pass
         return self
 
@@ -645,31 +1492,61 @@ class PDFDocument:
     def data(self) -> dict:
         """Gets a dictionary representation of this document.
 
+        Only processed pages are included, so the data of a partially processed
+        document can be loaded later to complete it.
+
         Returns:
             dict: A dictionary containing the document's data.
         """
         return {
             "filename": self.filename,
-            "pages": [page.data for page in self.pages],
+            "pages": [page.data for page in self.pages if page.processed],
         }
 
-    def save(self, path: str | Path) -> None:
-        """Saves the document data to a JSON file.
+    def save(self, path: str | Path, binary: bool | None = None) -> None:
+        """Saves the document data to a JSON or binary file.
+
+        The file is written to a temporary path and then moved into place, so it
+        is never left half-written.
 
         Args:
-            path: The path to save the JSON file to.
+            path: The path to save the file to.
+            binary: Whether to use the compact binary format (see `save_binary`)
+                instead of JSON. Defaults to binary for paths ending in ".bin".
         """
-        Path(path).write_text(json.dumps(self.data, indent=2))
+        if binary is None:
+            binary = Path(path).suffix == BINARY_SUFFIX
+        if binary:
+            save_binary(self.data, path)
+        else:
+            path = Path(path)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_text(json.dumps(self.data, indent=2))
+            tmp_path.replace(path)
 
     def load(self, path_or_data: str | Path | dict) -> "PDFDocument":
-        """Loads document data from a JSON file or dictionary.
+        """Loads document data from a JSON or binary file, or a dictionary.
+
+        Pages are matched by their index, so pages missing from the data stay
+        unprocessed. Pages loaded from a binary file are materialized when they
+        are accessed.
 
         Args:
-            path_or_data: Either a path to a JSON file or a dictionary of document data.
+            path_or_data: Either a path to a JSON or binary file, or a dictionary
+                of document data.
 
         Returns:
             PDFDocument: The loaded document (self).
         """
+        if isinstance(path_or_data, str | Path) and is_binary_ocr(path_or_data):
+            data = load_binary(path_or_data)
+            self.filename = data.filename or self.filename
+            for i, page_idx in enumerate(data.page_ids):
+                if page_idx < len(self.pages):
+                    loader = partial(data.page_blocks_data, i)
+                    self.pages[page_idx].set_lazy_blocks(loader)
+            return self
+
         if isinstance(path_or_data, str | Path):
             path = Path(path_or_data)
             data = json.loads(path.read_text())
@@ -678,14 +1555,18 @@ class PDFDocument:
 
         self.filename = data.get("filename", self.filename)
         for i, page_data in enumerate(data.get("pages", [])):
-            if i < len(self.pages):
-                self.pages[i].set_blocks(page_data.get("blocks", []))
+            page_idx = page_data.get("i", i)
+            if page_idx < len(self.pages):
+                self.pages[page_idx].set_blocks(page_data.get("blocks", []))
 
         return self
 
     def close(self) -> None:
         """Closes the underlying PyMuPDF document."""
         self.doc.close()
+        if isinstance(self._pdf_bytes, mmap.mmap):
+            self._pdf_bytes.close()
+            self._pdf_bytes = None
 
     def __getitem__(self, idx: int) -> Page:
         """Gets a page by index.
@@ -724,6 +1605,12 @@ def pdf_document(
     api_key: str | None = None,
     endpoint_url: str | None = None,
     load: str | Path | dict | None = None,
+    cache: PageCache | bool | None = None,
+    native_fast_path: bool = False,
+    metrics: OCRMetrics | bool | None = None,
+    layout_dpi: int | None = None,
+    ocr_dpi: int | None = None,
+    pages: PageSelection | None = None,
 ) -> PDFDocument:
     """Processes a PDF file for text extraction.
 
@@ -741,6 +1628,17 @@ def pdf_document(
         endpoint_url: Optional full endpoint URL for remote processing.
         load: Optional path to a JSON file or dictionary with existing document
             data to load.
+        cache: A PageCache to reuse processed pages from, or True to use the
+            default PageCache. Defaults to None (no cache).
+        native_fast_path: Whether pages with clean native text skip the layout
+            and OCR models. Defaults to False.
+        metrics: An OCRMetrics to record processing in, or True to attach a new
+            one. Defaults to None (no metrics).
+        layout_dpi: The resolution for layout detection. Defaults to `dpi`.
+        ocr_dpi: The resolution for OCR. Defaults to `dpi`.
+        pages: The pages to process by default, such as 3 for the first three
+            pages, -1 for the last page, `range(2, 5)`, or a predicate on the
+            native text of each page. Defaults to None (all pages).
 
     Returns:
         PDFDocument: The created (and possibly processed) document.
@@ -753,6 +1651,12 @@ def pdf_document(
         remote=remote,
         api_key=api_key,
         endpoint_url=endpoint_url,
+        cache=cache,
+        native_fast_path=native_fast_path,
+        metrics=metrics,
+        layout_dpi=layout_dpi,
+        ocr_dpi=ocr_dpi,
+        pages=pages,
     )
 
     if load is not None:
@@ -761,26 +1665,183 @@ def pdf_document(
     return doc
 
 
+def stream_process_pdfs(
+    docs: Iterable[PDFDocument | dict | Path | str],
+    batch_size: int = 1,
+    max_open_docs: int = 8,
+    max_wait: float | None = None,
+    render_workers: int = 0,
+    verbose: bool = False,
+    cache: PageCache | None = None,
+    native_fast_path: bool = False,
+    metrics: OCRMetrics | None = None,
+    renderer: PageRenderer | None = None,
+) -> Generator[PDFDocument, None, None]:
+    """Processes a stream of PDF documents, yielding each one when it is done.
+
+    Documents are opened lazily from `docs` and model batches are filled with
+    the selected pages (see `PDFDocument.select_pages`) of any open document.
+    Once `max_open_docs` documents are in flight, pending pages are flushed
+    until a document finishes before the next one is opened. Documents opened
+    here from paths or init args are closed once the caller moves on from them,
+    so pass PDFDocument instances to keep them open.
+
+    With `max_wait`, `docs` is read in a background thread so pending pages are
+    still flushed on time while the next document is slow to arrive.
+
+    Args:
+        docs: An iterable of PDFDocument instances to process (or paths or init
+            args).
+        batch_size: Number of pages to process in each batch. Defaults to 1.
+        max_open_docs: Maximum number of documents in flight. Defaults to 8.
+        max_wait: Maximum number of seconds a page may wait for an OCR batch to
+            fill up. Defaults to None (no limit).
+        render_workers: Number of processes used to render pages ahead of the
+            layout model. Defaults to 0.
+        verbose: Whether to show a progress bar. Defaults to False.
+        cache: Optional PageCache to reuse processed pages from.
+        native_fast_path: Whether pages with clean native text skip the models.
+            Defaults to False.
+        metrics: Optional OCRMetrics to record processing of all documents in.
+        renderer: Optional long-lived PageRenderer to reuse across calls (see
+            `process_pages`).
+
+    Yields:
+        PDFDocument: Each processed document, in order of completion.
+    """
+    remaining = {}
+    empty_docs = []
+    opened = set()
+    pending_since = None
+
+    def stream_pages() -> Generator[Page | None, None, None]:
+        nonlocal pending_since
+        items, done = iter(docs), object()
+        executor = None if max_wait is None else ThreadPoolExecutor(1)
+        try:
+            while True:
+                # A None flushes all pending pages, finishing open documents
+                while len(remaining) >= max_open_docs:
+                    pending_since = None
+                    yield None
+                if executor is None:
+                    doc = next(items, done)
+                else:
+                    # Flush pending pages if the next document takes too long
+                    future = executor.submit(next, items, done)
+                    while True:
+                        timeout = None
+                        if pending_since is not None:
+                            elapsed = time.monotonic() - pending_since
+                            timeout = max(max_wait - elapsed, 0)
+                        try:
+                            doc = future.result(timeout=timeout)
+                            break
+                        except TimeoutError:
+                            pending_since = None
+                            yield None
+                if doc is done:
+                    return
+                if isinstance(doc, str | Path):
+                    doc = pdf_document(doc)
+                    opened.add(doc)
+                elif isinstance(doc, dict):
+                    doc = pdf_document(**doc)
+                    opened.add(doc)
+                pages = doc.select_pages()
+                if not pages:
+                    empty_docs.append(doc)
+                    continue
+                remaining[doc] = len(pages)
+                if pending_since is None:
+                    pending_since = time.monotonic()
+                yield from pages
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def release(doc: PDFDocument) -> Generator[PDFDocument, None, None]:
+        close = doc in opened
+        opened.discard(doc)
+        yield doc
+        if close:
+            doc.close()
+
+    try:
+        for page in process_pages(
+            stream_pages(),
+            batch_size=batch_size,
+            verbose=verbose,
+            render_workers=render_workers,
+            max_wait=max_wait,
+            cache=cache,
+            native_fast_path=native_fast_path,
+            metrics=metrics,
+            renderer=renderer,
+        ):
+            while empty_docs:
+                yield from release(empty_docs.pop(0))
+            remaining[page.doc] -= 1
+            if not remaining[page.doc]:
+                del remaining[page.doc]
+                yield from release(page.doc)
+        while empty_docs:
+            yield from release(empty_docs.pop(0))
+    finally:
+        for doc in opened:
+            doc.close()
+
+
 def bulk_process_pdfs(
-    docs: list[PDFDocument | dict | Path | str], batch_size: int
+    docs: Iterable[PDFDocument | dict | Path | str],
+    batch_size: int,
+    render_workers: int = 0,
+    max_open_docs: int = 8,
+    cache: PageCache | None = None,
+    native_fast_path: bool = False,
+    metrics: OCRMetrics | None = None,
+    renderer: PageRenderer | None = None,
 ) -> list[PDFDocument]:
     """Processes a list of PDF documents in bulk.
 
     Args:
         docs: A list of PDFDocument instances to process (or paths or init args).
         batch_size: Number of pages to process in each batch. Defaults to 1.
+        render_workers: Number of processes used to render pages ahead of the
+            layout model. Defaults to 0.
+        max_open_docs: Maximum number of documents in flight. Defaults to 8.
+        cache: Optional PageCache to reuse processed pages from.
+        native_fast_path: Whether pages with clean native text skip the models.
+            Defaults to False.
+        metrics: Optional OCRMetrics to record processing of all documents in.
+        renderer: Optional long-lived PageRenderer to reuse across calls (see
+            `process_pages`).
 
     Returns:
-        list[PDFDocument]: A list of processed PDFDocument instances.
+        list[PDFDocument]: A list of processed PDFDocument instances, in the
+            order they were given.
     """
     all_docs = []
-    for doc in docs:
-        if isinstance(doc, str | Path):
-            doc = pdf_document(doc)
-        elif isinstance(doc, dict):
-            doc = pdf_document(**doc)
-        all_docs.append(doc)
-    pages = [page for doc in all_docs for page in doc]
-    for _ in process_pages(pages, batch_size=batch_size):
+
+    def load_docs() -> Generator[PDFDocument, None, None]:
+        for doc in docs:
+            if isinstance(doc, str | Path):
+                doc = pdf_document(doc)
+            elif isinstance(doc, dict):
+                doc = pdf_document(**doc)
+            all_docs.append(doc)
+            yield doc
+
+    for _ in stream_process_pdfs(
+        load_docs(),
+        batch_size=batch_size,
+        max_open_docs=max_open_docs,
+        render_workers=render_workers,
+        verbose=True,
+        cache=cache,
+        native_fast_path=native_fast_path,
+        metrics=metrics,
+        renderer=renderer,
+    ):
         pass
     return all_docs
@@ -1,10 +1,21 @@
+from contextlib import suppress
 from pathlib import Path
 
+import numpy as np
+
 from docketanalyzer import download_file
 
-from .utils import box_overlap_pct, merge_boxes
+from .utils import (
+    box_overlap_matrix,
+    boxes_extend,
+    merge_box_segments,
+    merge_boxes,
+)
 
-LAYOUT_MODEL = None
+LAYOUT_MODELS = {}
+LAYOUT_BACKENDS = ["torch", "onnx", "onnx-int8"]
+LAYOUT_BACKEND = "torch"
+LAYOUT_THREADS = (None, None)
 LAYOUR_MODEL_PATH = (
     Path.home()
     / ".cache"
@@ -46,52 +57,143 @@ def merge_overlapping_blocks(blocks: list[dict]) -> list[dict]:
     if not blocks:
         return []
 
-    # Merged blocks with different types will get the type with the highest priority
     type_priority = {
         block_type: i for i, block_type in enumerate(LAYOUT_CHOICES.values())
     }
 
-    unprocessed = [block.copy() for block in blocks]
+    blocks = [block.copy() for block in blocks]
+    boxes = np.array([block["bbox"] for block in blocks], dtype=np.float64)
+    unprocessed = np.ones(len(blocks), dtype=bool)
     result = []
-
-    while unprocessed:
-        current = unprocessed.pop(0)
+    groups = []
+
+    # Blocks are merged in order into the first unprocessed block, and each merge
+    # can grow the bbox that later blocks are compared against. Overlaps are
+    # computed for all remaining blocks at once and only recomputed after a merge
+    # that grows the bbox.
+    for ci, current in enumerate(blocks):
+        if not unprocessed[ci]:
+            continue
+        unprocessed[ci] = False
         current_bbox = current["bbox"]
+        group = [ci]
 
         merged = True
-
         while merged:
             merged = False
+            start = ci + 1
+            while True:
+                candidates = np.flatnonzero(unprocessed[start:]) + start
+                overlaps = box_overlap_matrix([current_bbox], boxes[candidates])[0]
+                hits = candidates[overlaps > 0.5]
+                if not len(hits):
+                    break
+                grows = boxes_extend(boxes[hits], current_bbox)
+                if grows.any():
+                    hits = hits[: grows.argmax() + 1]
+                    current_bbox = merge_boxes(current_bbox, blocks[hits[-1]]["bbox"])
+                unprocessed[hits] = False
+                group += hits.tolist()
+                merged = True
+                start = group[-1] + 1
+                if not grows.any():
+                    break
+
+        # Merged blocks with different types get the type with the highest priority
+        current["type"] = min(
+            (blocks[i]["type"] for i in group), key=type_priority.__getitem__
+        )
+        result.append(current)
+        groups.append(group)
 
-            i = 0
-            while i < len(unprocessed):
-                other = unprocessed[i]
-                other_bbox = other["bbox"]
+    offsets = np.cumsum([0] + [len(group) for group in groups[:-1]])
+    merged_boxes = merge_box_segments(boxes[np.concatenate(groups)], offsets).tolist()
+    for current, group, bbox in zip(result, groups, merged_boxes, strict=True):
+        if len(group) > 1:
+            current["bbox"] = tuple(bbox)
 
-                if box_overlap_pct(current_bbox, other_bbox) > 0.5:
-                    current_priority = type_priority[current["type"]]
-                    other_priority = type_priority[other["type"]]
+    result.sort(key=lambda x: (x["bbox"][1], x["bbox"][0]))
+    return result
 
-                    if other_priority < current_priority:
-                        current["type"] = other["type"]
 
-                    current_bbox = merge_boxes(current_bbox, other_bbox)
-                    current["bbox"] = current_bbox
+def configure_layout_model(
+    backend: str = "torch",
+    num_threads: int | None = None,
+    num_interop_threads: int | None = None,
+) -> None:
+    """Sets the backend and CPU thread counts used for layout detection.
 
-                    unprocessed.pop(i)
-                    merged = True
-                else:
-                    i += 1
+    The ONNX backends run the layout model with ONNX Runtime, which is usually
+    faster than PyTorch on CPU-only machines. "onnx-int8" additionally quantizes
+    the weights to int8, trading a little accuracy for speed. Exported models are
+    stored next to the PyTorch checkpoint and reused.
 
-        result.append(current)
+    Args:
+        backend: One of "torch", "onnx" or "onnx-int8". Defaults to "torch".
+        num_threads: Number of threads used within an operation. Defaults to
+            None (the runtime default).
+        num_interop_threads: Number of threads used across operations. Defaults
+            to None (the runtime default).
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    global LAYOUT_BACKEND, LAYOUT_THREADS
 
-    result.sort(key=lambda x: (x["bbox"][1], x["bbox"][0]))
-    return result
+    if backend not in LAYOUT_BACKENDS:
+        raise ValueError(f"Unknown layout backend: {backend}")
+    if (num_threads, num_interop_threads) != LAYOUT_THREADS:
+        # ONNX Runtime sessions are configured when they are created
+        for key in [x for x in LAYOUT_MODELS if x != "torch"]:
+            del LAYOUT_MODELS[key]
+    LAYOUT_BACKEND = backend
+    LAYOUT_THREADS = (num_threads, num_interop_threads)
 
 
-def load_model() -> tuple["YOLOv10", str]:  # noqa: F821
+def export_onnx_model(quantize: bool = False) -> Path:
+    """Exports the layout model to ONNX, optionally with int8 weights.
+
+    Args:
+        quantize: Whether to quantize the weights to int8. Defaults to False.
+
+    Returns:
+        Path: The path to the exported model.
+    """
+    onnx_path = LAYOUR_MODEL_PATH.with_suffix(".onnx")
+    if not onnx_path.exists():
+        from doclayout_yolo import YOLOv10
+
+        model = YOLOv10(LAYOUR_MODEL_PATH, verbose=False)
+        exported = model.export(format="onnx", dynamic=True, verbose=False)
+        Path(exported).replace(onnx_path)
+    if not quantize:
+        return onnx_path
+
+    int8_path = onnx_path.with_name(f"{onnx_path.stem}_int8.onnx")
+    if not int8_path.exists():
+        import onnx
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        tmp_path = int8_path.with_name(f".{int8_path.name}.tmp")
+        quantize_dynamic(onnx_path, tmp_path, weight_type=QuantType.QUInt8)
+        # Keep the class names and stride that YOLOv10 reads from the metadata
+        quantized = onnx.load(tmp_path)
+        del quantized.metadata_props[:]
+        quantized.metadata_props.extend(onnx.load(onnx_path).metadata_props)
+        onnx.save(quantized, tmp_path)
+        tmp_path.replace(int8_path)
+    return int8_path
+
+
+def load_model(backend: str | None = None) -> tuple["YOLOv10", str]:  # noqa: F821
     """Loads and initializes the document layout detection model.
 
+    Models are cached per backend.
+
+    Args:
+        backend: One of LAYOUT_BACKENDS. Defaults to the backend set with
+            `configure_layout_model`.
+
     Returns:
         tuple[YOLOv10, str]: A tuple containing:
             - The initialized YOLOv10 model
@@ -100,11 +202,18 @@ def load_model() -> tuple["YOLOv10", str]:  # noqa: F821
     import torch
     from doclayout_yolo import YOLOv10
 
-    global LAYOUT_MODEL
-
+    backend = backend or LAYOUT_BACKEND
+    num_threads, num_interop_threads = LAYOUT_THREADS
     device = "cpu" if not torch.cuda.is_available() else "cuda"
 
-    if LAYOUT_MODEL is None:
+    if num_threads and torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+    if num_interop_threads and torch.get_num_interop_threads() != num_interop_threads:
+        # This can only be set before PyTorch starts any parallel work
+        with suppress(RuntimeError):
+            torch.set_num_interop_threads(num_interop_threads)
+
+    if backend not in LAYOUT_MODELS:
         if not LAYOUR_MODEL_PATH.exists():
             LAYOUR_MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
             download_file(
@@ -112,13 +221,42 @@ def load_model() -> tuple["YOLOv10", str]:  # noqa: F821
                 LAYOUR_MODEL_PATH,
                 description="Downloading layout model...",
             )
-        LAYOUT_MODEL = YOLOv10(LAYOUR_MODEL_PATH, verbose=False)
-        LAYOUT_MODEL.to(device)
+        if backend == "torch":
+            model = YOLOv10(LAYOUR_MODEL_PATH, verbose=False)
+            model.to(device)
+        else:
+            model = load_onnx_model(export_onnx_model(quantize=backend == "onnx-int8"))
+        LAYOUT_MODELS[backend] = model
+
+    return LAYOUT_MODELS[backend], device
 
-    return LAYOUT_MODEL, device
 
+def load_onnx_model(path: Path) -> "YOLOv10":  # noqa: F821
+    """Loads an exported layout model with the configured ONNX Runtime threads."""
+    import onnxruntime
+    from doclayout_yolo import YOLOv10
 
-def predict_layout(images: list, batch_size: int, dpi: int) -> list[list[dict]]:
+    model = YOLOv10(path, task="detect", verbose=False)
+    num_threads, num_interop_threads = LAYOUT_THREADS
+    if num_threads or num_interop_threads:
+        # YOLOv10 creates its session without options, so the predictor is set
+        # up with a dummy image and its session replaced with a configured one.
+        model.predict(np.zeros((32, 32, 3), dtype=np.uint8), verbose=False)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = num_threads or 0
+        options.inter_op_num_threads = num_interop_threads or 0
+        model.predictor.model.session = onnxruntime.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+    return model
+
+
+def predict_layout(
+    images: list,
+    batch_size: int,
+    dpi: float | list[float],
+    backend: str | None = None,
+) -> list[list[dict]]:
     """Predicts document layout elements in a batch of images.
 
     This function processes a batch of images through the layout detection model
@@ -127,33 +265,30 @@ def predict_layout(images: list, batch_size: int, dpi: int) -> list[list[dict]]:
     Args:
         images: List of images to process.
         batch_size: Number of images to process in each batch.
-        dpi: Dots per inch (DPI) of the input images.
+        dpi: Dots per inch (DPI) of the input images, either one value for all
+            images or one per image. Bounding boxes are scaled to PDF points.
+        backend: The layout backend to use. Defaults to the configured backend.
 
     Returns:
         list[list[dict]]: For each input image, a list of detected layout blocks,
         where each block is a dictionary with 'type' and 'bbox' keys.
     """
-    model, _ = load_model()
+    model, _ = load_model(backend)
+    dpis = dpi if isinstance(dpi, list) else [dpi] * len(images)
 
     results = []
     for i in range(0, len(images), batch_size):
         batch = images[i : i + batch_size]
         preds = model(batch, verbose=False)
 
-        for pred in preds:
-            blocks = []
-            for xyxy, cla in zip(
-                pred.boxes.xyxy,
-                pred.boxes.cls,
-                strict=False,
-            ):
-                bbox = [int(p.item()) for p in xyxy]
-                blocks.append(
-                    {
-                        "type": LAYOUT_CHOICES[int(cla.item())],
-                        "bbox": [x * (72 / dpi) for x in bbox],
-                    }
-                )
+        for pred, img_dpi in zip(preds, dpis[i : i + batch_size], strict=True):
+            # Move the whole prediction to the host once instead of per coordinate
+            bboxes = pred.boxes.xyxy.cpu().numpy().astype(np.int64) * (72 / img_dpi)
+            classes = pred.boxes.cls.cpu().numpy().astype(np.int64)
+            blocks = [
+                {"type": LAYOUT_CHOICES[cla], "bbox": bbox}
+                for bbox, cla in zip(bboxes.tolist(), classes.tolist(), strict=False)
+            ]
             blocks = merge_overlapping_blocks(blocks)
             results.append(blocks)
 
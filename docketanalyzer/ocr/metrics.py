@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager
+
+STAGES = [
+    "render",
+    "cache",
+    "fast_path",
+    "layout",
+    "needs_ocr",
+    "ocr",
+    "consolidate",
+]
+
+
+class OCRMetrics:
+    """Stage timers and counters for the OCR pipeline.
+
+    Stage times are exclusive: while a stage is timed inside another on the same
+    thread (a cache lookup while waiting for the next rendered batch, for
+    example), the outer stage is paused, so the stage times add up to the time
+    spent in the pipeline.
+
+    For timing a single block interactively, `utils.timeit` prints its wall time
+    instead.
+
+    ```python
+    metrics = OCRMetrics()
+    doc = pdf_document(path, metrics=metrics).process(batch_size=8)
+    print(metrics.report())
+    ```
+
+    Attributes:
+        stages: Seconds spent and number of calls by stage.
+        counters: Counts by name, such as pages, OCR pages and batch sizes.
+        started: When the metrics were created or last reset.
+    """
+
+    def __init__(self):
+        """Initializes empty metrics."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears all timers and counters."""
+        with self._lock:
+            self.stages = defaultdict(lambda: {"seconds": 0.0, "count": 0})
+            self.counters = defaultdict(float)
+            self.started = time.time()
+
+    @contextmanager
+    def time(self, stage: str) -> Generator[None, None, None]:
+        """Times a block of code as part of a stage.
+
+        Args:
+            stage: The name of the stage.
+        """
+        stack = self._local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        if stack:
+            self.add_time(stack[-1][0], now - stack[-1][1], count=0)
+        stack.append([stage, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            _, start = stack.pop()
+            self.add_time(stage, now - start)
+            if stack:
+                stack[-1][1] = now
+
+    def add_time(self, stage: str, seconds: float, count: int = 1) -> None:
+        """Adds time to a stage."""
+        with self._lock:
+            self.stages[stage]["seconds"] += seconds
+            self.stages[stage]["count"] += count
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increments a counter."""
+        with self._lock:
+            self.counters[name] += value
+
+    @property
+    def summary(self) -> dict:
+        """Gets derived pipeline statistics.
+
+        Returns:
+            dict: The number of pages, pages per second of pipeline time, the
+                share of pages that needed OCR, the average fill ratio of layout
+                and OCR batches, and the average time pages waited for an OCR
+                batch.
+        """
+        counters = self.counters
+        seconds = sum(stage["seconds"] for stage in self.stages.values())
+        pages = counters["pages"]
+
+        def ratio(a: float, b: float) -> float:
+            return a / b if b else 0.0
+
+        return {
+            "pages": int(pages),
+            "seconds": seconds,
+            "pages_per_second": ratio(pages, seconds),
+            "ocr_rate": ratio(counters["ocr_pages"], pages),
+            "layout_batch_fill": ratio(
+                counters["layout_batch_pages"], counters["layout_batch_capacity"]
+            ),
+            "ocr_batch_fill": ratio(
+                counters["ocr_batch_pages"], counters["ocr_batch_capacity"]
+            ),
+            "mean_queue_wait": ratio(
+                counters["queue_wait_seconds"], counters["ocr_pages"]
+            ),
+        }
+
+    def to_dict(self) -> dict:
+        """Gets the metrics as a dictionary."""
+        with self._lock:
+            return {
+                "stages": {k: dict(v) for k, v in self.stages.items()},
+                "counters": dict(self.counters),
+                "summary": self.summary,
+            }
+
+    def to_json(self, **kwargs) -> str:
+        """Gets the metrics as JSON."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "docketanalyzer_ocr") -> str:
+        """Gets the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix for the metric names. Defaults to "docketanalyzer_ocr".
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        data = self.to_dict()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds_total counter",
+            *[
+                f'{prefix}_stage_seconds_total{{stage="{k}"}} {v["seconds"]}'
+                for k, v in data["stages"].items()
+            ],
+            f"# TYPE {prefix}_stage_calls_total counter",
+            *[
+                f'{prefix}_stage_calls_total{{stage="{k}"}} {v["count"]}'
+                for k, v in data["stages"].items()
+            ],
+        ]
+        for name, value in data["counters"].items():
+            lines += [f"# TYPE {prefix}_{name}_total counter"]
+            lines += [f"{prefix}_{name}_total {value}"]
+        for name, value in data["summary"].items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> str:
+        """Gets a human-readable breakdown of time by stage."""
+        data = self.to_dict()
+        summary = data["summary"]
+        total = summary["seconds"] or 1.0
+        stages = [x for x in STAGES if x in data["stages"]]
+        stages += [x for x in data["stages"] if x not in STAGES]
+        lines = [f"{'stage':<12} {'seconds':>9} {'share':>7} {'calls':>7}"]
+        for stage in stages:
+            seconds, count = data["stages"][stage].values()
+            lines.append(
+                f"{stage:<12} {seconds:>9.3f} {seconds / total:>7.1%} {count:>7}"
+            )
+        lines += [
+            "",
+            f"pages: {summary['pages']} ({summary['pages_per_second']:.2f}/s)",
+            f"ocr rate: {summary['ocr_rate']:.1%}",
+            f"batch fill: layout {summary['layout_batch_fill']:.1%}, "
+            f"ocr {summary['ocr_batch_fill']:.1%}",
+            f"mean queue wait: {summary['mean_queue_wait']:.3f}s",
+        ]
+        return "\n".join(lines)
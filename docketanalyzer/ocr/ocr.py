@@ -1,6 +1,8 @@
+from collections.abc import Generator
 from typing import TYPE_CHECKING, Any
 
 import fitz
+import numpy as np
 
 if TYPE_CHECKING:
     from surya.detection import DetectionPredictor
@@ -10,6 +12,10 @@ if TYPE_CHECKING:
 RECOGNITION_MODEL = None
 DETECTION_MODEL = None
 
+# The default flags for "dict" extraction keep images, which decodes every image
+# on the page (most of the time spent on scans) only for the blocks to be dropped.
+NATIVE_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 
 def load_model() -> tuple["RecognitionPredictor", "DetectionPredictor"]:
     """Loads and initializes the OCR models.
@@ -34,7 +40,7 @@ def load_model() -> tuple["RecognitionPredictor", "DetectionPredictor"]:
     return RECOGNITION_MODEL, DETECTION_MODEL
 
 
-def extract_ocr_text(imgs: list[Any]) -> list[dict]:
+def extract_ocr_text(imgs: list[Any], dpi: int | list[int] = 72) -> list[dict]:
     """Extracts text from an image using the OCR service.
 
     This function sends an image to the OCR service for processing and returns
@@ -42,6 +48,9 @@ def extract_ocr_text(imgs: list[Any]) -> list[dict]:
 
     Args:
         imgs: A list of input images.
+        dpi: Dots per inch (DPI) of the input images, either one value for all
+            images or one per image. Bounding boxes are scaled to PDF points.
+            Defaults to 72.
 
     Returns:
         list[dict]: A list of dictionaries, each containing:
@@ -51,15 +60,38 @@ def extract_ocr_text(imgs: list[Any]) -> list[dict]:
     recognition_model, detection_model = load_model()
 
     preds = recognition_model(imgs, det_predictor=detection_model)
+    dpis = dpi if isinstance(dpi, list) else [dpi] * len(imgs)
 
     results = []
-    for pred in preds:
+    for pred, img_dpi in zip(preds, dpis, strict=True):
+        scale = 72 / img_dpi
         results.append([])
         for line in pred.text_lines:
-            results[-1].append({"bbox": line.bbox, "content": line.text})
+            bbox = line.bbox if img_dpi == 72 else [x * scale for x in line.bbox]
+            results[-1].append({"bbox": bbox, "content": line.text})
     return results
 
 
+def native_text_lines(
+    page: fitz.Page,
+) -> Generator[tuple[tuple[float, float, float, float], str, int], None, None]:
+    """Yields the non-empty lines of native text on a PDF page.
+
+    Text is extracted with NATIVE_TEXT_FLAGS, which skips images.
+
+    Args:
+        page: The pymupdf Page object to extract text from.
+
+    Yields:
+        tuple: The bbox, content and PDF text block number of each line.
+    """
+    for block in page.get_text("dict", flags=NATIVE_TEXT_FLAGS)["blocks"]:
+        for line in block.get("lines", []):
+            content = "".join([span["text"] for span in line["spans"]])
+            if content.strip():
+                yield line["bbox"], content, block["number"]
+
+
 def extract_native_text(page: fitz.Page) -> list[dict]:
     """Extracts text content and bounding boxes from a PDF page using native PDF text.
 
@@ -73,18 +105,30 @@ def extract_native_text(page: fitz.Page) -> list[dict]:
         list[dict]: A list of dictionaries, each containing:
             - 'bbox': The bounding box coordinates [x1, y1, x2, y2]
             - 'content': The text content of the line
+            - 'block': The number of the PDF text block the line belongs to
+    """
+    return [
+        {"bbox": bbox, "content": content, "block": block}
+        for bbox, content, block in native_text_lines(page)
+    ]
+
+
+def extract_native_text_arrays(
+    page: fitz.Page,
+) -> tuple[np.ndarray, list[str], np.ndarray]:
+    """Extracts native text lines from a PDF page as arrays.
+
+    This is the same as `extract_native_text`, without building a dictionary per
+    line.
+
+    Args:
+        page: The pymupdf Page object to extract text from.
+
+    Returns:
+        tuple[np.ndarray, list[str], np.ndarray]: The (n, 4) float64 bounding
+            boxes, the contents and the PDF text block numbers of the lines.
     """
-    blocks = page.get_text("dict")["blocks"]
-    data = []
-    for block in blocks:
-        if "lines" in block:
-            for line in block["lines"]:
-                content = "".join([span["text"] for span in line["spans"]])
-                if content.strip():
-                    data.append(
-                        {
-                            "bbox": line["bbox"],
-                            "content": content,
-                        }
-                    )
-    return data
+    lines = list(native_text_lines(page))
+    bboxes = np.array([line[0] for line in lines], dtype=np.float64).reshape(-1, 4)
+    blocks = np.array([line[2] for line in lines], dtype=np.int64)
+    return bboxes, [line[1] for line in lines], blocks
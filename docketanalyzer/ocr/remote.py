@@ -1,20 +1,23 @@
+import asyncio
 import base64
 import json
 import time
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator, Iterable
 from typing import Any
 
+import httpx
 import requests
 
 from docketanalyzer import env
 
+TERMINAL_STATUSES = ["COMPLETED", "FAILED", "CANCELLED"]
 
-class RemoteClient:
-    """Client for making API calls to remote endpoints.
+# Responses that mean the endpoint is busy or briefly unavailable
+RETRY_STATUSES = {429, 502, 503, 504}
 
-    This class handles communication with remote serverless endpoints, including
-    authentication, request formatting, and streaming response handling.
-    """
+
+class BaseRemoteClient:
+    """Endpoint configuration shared by the remote clients."""
 
     def __init__(self, api_key: str | None = None, endpoint_url: str | None = None):
         """Initialize the remote client.
@@ -38,6 +41,44 @@ class RemoteClient:
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
 
+    @staticmethod
+    def build_input(
+        s3_key: str | None = None,
+        file: bytes | str | None = None,
+        filename: str | None = None,
+        batch_size: int = 1,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Builds the input payload of a job.
+
+        Raises:
+            ValueError: If neither s3_key nor file is provided.
+        """
+        if not s3_key and not file:
+            raise ValueError("Either s3_key or file must be provided")
+
+        input_data = {"batch_size": batch_size}
+
+        if s3_key:
+            input_data["s3_key"] = s3_key
+        if file:
+            if not isinstance(file, str):
+                file = base64.b64encode(file).decode("utf-8")
+            input_data["file"] = file
+        if filename:
+            input_data["filename"] = filename
+
+        input_data.update(kwargs)
+        return input_data
+
+
+class RemoteClient(BaseRemoteClient):
+    """Client for making API calls to remote endpoints.
+
+    This class handles communication with remote serverless endpoints, including
+    authentication, request formatting, and streaming response handling.
+    """
+
     def __call__(
         self,
         s3_key: str | None = None,
@@ -70,36 +111,45 @@ class RemoteClient:
             ValueError: If neither s3_key nor file is provided.
             TimeoutError: If the request times out.
         """
-        if not s3_key and not file:
-            raise ValueError("Either s3_key or file must be provided")
-
-        input_data = {"batch_size": batch_size}
-
-        if s3_key:
-            input_data["s3_key"] = s3_key
-        if file:
-            if isinstance(file, bytes):
-                file = base64.b64encode(file).decode("utf-8")
-            input_data["file"] = file
-        if filename:
-            input_data["filename"] = filename
-
-        input_data.update(kwargs)
-
-        payload = {"input": input_data}
-
-        job_id = self._submit_job(payload, timeout)
+        job_id = self.submit(s3_key, file, filename, batch_size, timeout, **kwargs)
 
         if stream:
-            return self._stream_results(job_id, timeout, poll_interval)
+            return self.stream_results(job_id, timeout, poll_interval)
         else:
             results = []
-            for chunk in self._stream_results(job_id, timeout, poll_interval):
+            for chunk in self.stream_results(job_id, timeout, poll_interval):
                 results.append(chunk)
                 if chunk.get("status") == "COMPLETED":
                     break
             return results
 
+    def submit(
+        self,
+        s3_key: str | None = None,
+        file: bytes | None = None,
+        filename: str | None = None,
+        batch_size: int = 1,
+        timeout: int = 300,
+        **kwargs: Any,
+    ) -> str:
+        """Submit a job without waiting for its results.
+
+        Use `stream_results` to read the results and `cancel_job` to stop it.
+
+        Args:
+            s3_key: S3 key to the PDF file. Either s3_key or file must be provided.
+            file: Binary PDF data or base64-encoded string.
+            filename: Optional filename for the PDF.
+            batch_size: Batch size for processing. Defaults to 1.
+            timeout: Request timeout in seconds. Defaults to 300.
+            **kwargs: Additional parameters to include in the input payload.
+
+        Returns:
+            str: The job ID.
+        """
+        input_data = self.build_input(s3_key, file, filename, batch_size, **kwargs)
+        return self._submit_job({"input": input_data}, timeout)
+
     def _submit_job(self, payload: dict[str, Any], timeout: int) -> str:
         """Submit a job to the remote endpoint.
 
@@ -126,8 +176,8 @@ class RemoteClient:
             raise ValueError(f"Invalid response format, missing 'id': {result}")
         return result["id"]
 
-    def _stream_results(
-        self, job_id: str, timeout: int, poll_interval: float
+    def stream_results(
+        self, job_id: str, timeout: int = 300, poll_interval: float = 1.0
     ) -> Generator[dict[str, Any], None, None]:
         """Stream results from a job.
 
@@ -160,11 +210,7 @@ class RemoteClient:
                             data = json.loads(line.decode("utf-8"))
                             yield data
 
-                            if data.get("status") in [
-                                "COMPLETED",
-                                "FAILED",
-                                "CANCELLED",
-                            ]:
+                            if data.get("status") in TERMINAL_STATUSES:
                                 return
                     elif response.status_code == 404:
                         time.sleep(poll_interval)
@@ -258,3 +304,269 @@ class RemoteClient:
         response.raise_for_status()
 
         return response.json()
+
+
+class AsyncRemoteClient(BaseRemoteClient):
+    """Asyncio client for running many remote jobs at once.
+
+    All requests share one httpx connection pool, so hundreds of jobs can be in
+    flight from a single thread. Job streams are polled with an adaptive backoff:
+    the interval resets whenever a job produces output and doubles (up to
+    `max_poll_interval`) while it does not. Busy responses are retried the same
+    way.
+
+    ```python
+    async with AsyncRemoteClient() as client:
+        jobs = [{"s3_key": key} for key in s3_keys]
+        async for job_idx, page in client.as_completed(jobs):
+            print(job_idx, page["i"])
+    ```
+
+    Attributes:
+        max_connections: Maximum number of open connections to the endpoint.
+        max_jobs: Maximum number of jobs `as_completed` runs at once.
+        timeout: Maximum number of seconds to wait for a job.
+        min_poll_interval: Shortest wait between polls, in seconds.
+        max_poll_interval: Longest wait between polls, in seconds.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        endpoint_url: str | None = None,
+        max_connections: int = 32,
+        max_jobs: int = 64,
+        timeout: float = 300,
+        min_poll_interval: float = 0.1,
+        max_poll_interval: float = 5.0,
+    ):
+        """Initialize the async remote client.
+
+        Args:
+            api_key: API key for authentication. If None, uses RUNPOD_API_KEY
+                from environment.
+            endpoint_url: Full endpoint URL. If None, constructs URL from
+                RUNPOD_OCR_ENDPOINT_ID or defaults to localhost.
+            max_connections: Maximum number of open connections. Defaults to 32.
+            max_jobs: Maximum number of jobs run at once by `as_completed`.
+                Defaults to 64.
+            timeout: Maximum number of seconds to wait for a job. Defaults to 300.
+            min_poll_interval: Shortest wait between polls. Defaults to 0.1.
+            max_poll_interval: Longest wait between polls. Defaults to 5.0.
+        """
+        super().__init__(api_key=api_key, endpoint_url=endpoint_url)
+        self.max_connections = max_connections
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Gets the shared HTTP client, creating it if needed."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=self.max_connections),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Closes the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncRemoteClient":
+        """Async context manager support."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager cleanup."""
+        await self.close()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        retry_statuses: set[int] = RETRY_STATUSES,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Sends a request, retrying with backoff while the endpoint is busy.
+
+        Args:
+            method: The HTTP method.
+            path: The path, relative to the endpoint URL.
+            retry_statuses: Status codes that are retried.
+            **kwargs: Additional arguments for `httpx.AsyncClient.request`.
+
+        Returns:
+            httpx.Response: The response.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails.
+            TimeoutError: If the endpoint stays busy for longer than `timeout`.
+        """
+        deadline = time.monotonic() + self.timeout
+        interval = self.min_poll_interval
+        while True:
+            try:
+                response = await self.client.request(
+                    method, f"{self.base_url}{path}", **kwargs
+                )
+                if response.status_code not in retry_statuses:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if time.monotonic() + interval > deadline:
+                    raise
+            if time.monotonic() + interval > deadline:
+                raise TimeoutError(f"Request to {path} timed out")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def submit(
+        self,
+        s3_key: str | None = None,
+        file: bytes | str | None = None,
+        filename: str | None = None,
+        batch_size: int = 1,
+        **kwargs: Any,
+    ) -> str:
+        """Submits a job.
+
+        Args:
+            s3_key: S3 key to the PDF file. Either s3_key or file must be provided.
+            file: Binary PDF data or base64-encoded string. Either s3_key or
+                file must be provided.
+            filename: Optional filename for the PDF.
+            batch_size: Batch size for processing. Defaults to 1.
+            **kwargs: Additional parameters to include in the input payload.
+
+        Returns:
+            str: The job ID.
+
+        Raises:
+            ValueError: If neither s3_key nor file is provided, or the response
+                has no job ID.
+        """
+        input_data = self.build_input(s3_key, file, filename, batch_size, **kwargs)
+        response = await self.request("POST", "/run", json={"input": input_data})
+        result = response.json()
+        if "id" not in result:
+            raise ValueError(f"Invalid response format, missing 'id': {result}")
+        return result["id"]
+
+    async def stream(self, job_id: str) -> AsyncGenerator[dict[str, Any], None]:
+        """Streams the results of a job until it finishes.
+
+        Args:
+            job_id: The job ID.
+
+        Yields:
+            dict[str, Any]: Each chunk of the streaming response.
+
+        Raises:
+            TimeoutError: If the job does not finish within `timeout` seconds.
+        """
+        deadline = time.monotonic() + self.timeout
+        interval = self.min_poll_interval
+        while time.monotonic() < deadline:
+            # The job may not be visible right after submission
+            response = await self.request(
+                "POST", f"/stream/{job_id}", retry_statuses=RETRY_STATUSES | {404}
+            )
+            has_output = False
+            for line in response.text.splitlines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                yield data
+                if data.get("status") in TERMINAL_STATUSES:
+                    return
+                has_output = has_output or bool(data.get("stream"))
+
+            if has_output:
+                interval = self.min_poll_interval
+            else:
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+
+        raise TimeoutError(f"Streaming results timed out after {self.timeout} seconds")
+
+    async def as_completed(
+        self, inputs: Iterable[dict[str, Any]]
+    ) -> AsyncGenerator[tuple[int, dict[str, Any]], None]:
+        """Runs many jobs and yields their pages as soon as they are processed.
+
+        At most `max_jobs` jobs run at once. Pending jobs are cancelled locally if
+        the iterator is closed early.
+
+        Args:
+            inputs: The arguments to `submit` for each job.
+
+        Yields:
+            tuple[int, dict]: The index of the job in `inputs` and the data of
+                one of its processed pages.
+
+        Raises:
+            Exception: If a job fails or is cancelled.
+        """
+        results = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.max_jobs)
+
+        async def run(job_idx: int, job_input: dict[str, Any]) -> None:
+            try:
+                async with semaphore:
+                    job_id = await self.submit(**job_input)
+                    async for chunk in self.stream(job_id):
+                        for stream_item in chunk.get("stream", []):
+                            page_data = stream_item.get("output", {}).get("page")
+                            if page_data is not None:
+                                await results.put((job_idx, page_data))
+                        if chunk.get("status") in ["FAILED", "CANCELLED"]:
+                            raise Exception(chunk)
+            except Exception as e:
+                await results.put(e)
+            finally:
+                await results.put(None)
+
+        tasks = [
+            asyncio.create_task(run(job_idx, job_input))
+            for job_idx, job_input in enumerate(inputs)
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await results.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_status(self, job_id: str) -> dict[str, Any]:
+        """Get the status of a job."""
+        response = await self.request("POST", f"/status/{job_id}")
+        return response.json()
+
+    async def cancel_job(self, job_id: str) -> dict[str, Any]:
+        """Cancel a job."""
+        response = await self.request("POST", f"/cancel/{job_id}")
+        return response.json()
+
+    async def purge_queue(self) -> dict[str, Any]:
+        """Purge all queued jobs."""
+        response = await self.request("POST", "/purge-queue")
+        return response.json()
+
+    async def get_health(self) -> dict[str, Any]:
+        """Get endpoint health information."""
+        response = await self.request("GET", "/health")
+        return response.json()
@@ -0,0 +1,228 @@
+import multiprocessing
+import os
+import tempfile
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import fitz
+import numpy as np
+
+if TYPE_CHECKING:
+    from .document import Page, PDFDocument
+
+
+MAX_RENDER_SIZE = 4500
+
+
+def effective_dpi(page: fitz.Page, dpi: float | None = None) -> float:
+    """Gets the resolution a page is actually rendered at.
+
+    Large pages are rendered at a lower resolution so neither side exceeds
+    MAX_RENDER_SIZE pixels. Pixel coordinates on a render are converted to PDF
+    points with `72 / effective_dpi(page, dpi)`.
+
+    Args:
+        page: The pymupdf Page object.
+        dpi: The requested resolution. If None, uses the native 72 DPI.
+
+    Returns:
+        float: The resolution of the render.
+    """
+    dpi = dpi or 72
+    max_side = max(page.rect.width, page.rect.height)
+    if max_side * dpi / 72 > MAX_RENDER_SIZE:
+        return MAX_RENDER_SIZE * 72 / max_side
+    return dpi
+
+
+def render_page(page: fitz.Page, dpi: float | None = None) -> np.ndarray:
+    """Renders a PDF page to an RGB image array.
+
+    Args:
+        page: The pymupdf Page object to render.
+        dpi: The resolution to render at. If None, renders at the native 72 DPI.
+            Large pages are rendered at the lower `effective_dpi` instead.
+
+    Returns:
+        np.ndarray: A read-only (height, width, 3) uint8 array.
+    """
+    dpi = effective_dpi(page, dpi)
+    if dpi != 72:
+        mat = fitz.Matrix(dpi / 72, dpi / 72)
+        pm = page.get_pixmap(matrix=mat, alpha=False)
+    else:
+        pm = page.get_pixmap(alpha=False)
+    return np.frombuffer(pm.samples, dtype=np.uint8).reshape(pm.height, pm.width, 3)
+
+
+def render_pages(
+    source: str | bytes, page_nums: list[int], dpi: int | None
+) -> list[np.ndarray]:
+    """Opens a PDF and renders the given pages.
+
+    This is the unit of work for the rendering pool, so it only takes picklable
+    arguments.
+
+    Args:
+        source: A path to the PDF file or the PDF content as bytes.
+        page_nums: The (0-indexed) pages to render.
+        dpi: The resolution to render at.
+
+    Returns:
+        list[np.ndarray]: The rendered pages, in the order of `page_nums`.
+    """
+    doc = fitz.open(source) if isinstance(source, str) else fitz.open("pdf", source)
+    try:
+        return [render_page(doc[i], dpi) for i in page_nums]
+    finally:
+        doc.close()
+
+
+class PageRenderer:
+    """Renders batches of pages ahead of the consumer.
+
+    With `workers=0` pages are rendered inline. Otherwise upcoming batches are
+    rendered in a process pool while the caller runs the model on the current
+    batch, with at most `prefetch` batches rendered ahead. A process pool is used
+    because PyMuPDF is not thread-safe.
+
+    The pool is started once and reused across `imap` calls, so a long-lived
+    renderer can be passed to `process_pages` to avoid starting new processes
+    for every call. Documents without a file on disk are written to a temporary
+    file once, so workers open them by path instead of receiving the whole PDF
+    with every task.
+
+    Attributes:
+        workers: The number of rendering processes.
+        prefetch: The maximum number of batches rendered ahead of the consumer.
+    """
+
+    def __init__(self, workers: int = 0, prefetch: int = 2):
+        """Initializes the renderer.
+
+        Args:
+            workers: The number of rendering processes. Defaults to 0 (inline).
+            prefetch: The maximum number of batches to render ahead. Defaults to 2.
+        """
+        self.workers = workers
+        self.prefetch = max(prefetch, 1)
+        self._executor = None
+        self._temp_files = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Gets the rendering process pool, starting it if needed."""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+        return self._executor
+
+    def close(self) -> None:
+        """Shuts down the rendering process pool and removes temporary files."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        for _, remove in list(self._temp_files.values()):
+            remove()
+        self._temp_files.clear()
+
+    def __enter__(self) -> "PageRenderer":
+        """Context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager cleanup."""
+        self.close()
+
+    def source(self, doc: "PDFDocument") -> str:
+        """Gets a path the workers can open a document from.
+
+        Documents without a file on disk are written to a temporary file, which
+        is removed when the document is garbage collected or the renderer is
+        closed.
+        """
+        if doc.pdf_path is not None and Path(doc.pdf_path).exists():
+            return str(doc.pdf_path)
+        if doc not in self._temp_files:
+            fd, path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                f.write(doc.pdf_bytes)
+            self._temp_files[doc] = (path, weakref.finalize(doc, os.remove, path))
+        return self._temp_files[doc][0]
+
+    def imap(
+        self, batches: Iterable[list["Page"]], dpi: int | None = None
+    ) -> Iterator[tuple[list["Page"], list[np.ndarray]]]:
+        """Renders batches of pages, yielding each batch with its images.
+
+        An empty batch is passed through as a barrier: batches after it are not
+        read from `batches` until the consumer has moved past it.
+
+        Args:
+            batches: An iterable of page batches.
+            dpi: The resolution to render at. If None, uses each page's
+                doc.layout_dpi.
+
+        Yields:
+            tuple[list[Page], list[np.ndarray]]: Each batch with its rendered images.
+        """
+        if not self.workers:
+            for batch in batches:
+                yield (
+                    batch,
+                    [
+                        render_page(page.fitz, dpi or page.doc.layout_dpi)
+                        for page in batch
+                    ],
+                )
+            return
+
+        executor = self.executor
+        pending = deque()
+        batches = iter(batches)
+        done = False
+
+        def fill() -> None:
+            nonlocal done
+            while not done and len(pending) < self.prefetch:
+                if pending and not pending[-1][0]:
+                    return
+                batch = next(batches, None)
+                if batch is None:
+                    done = True
+                    return
+                # Group consecutive pages by document and resolution so each task
+                # opens its PDF once, then split the groups across the workers.
+                groups = []
+                for page in batch:
+                    key = (page.doc, dpi or page.doc.layout_dpi)
+                    if groups and groups[-1][0] == key:
+                        groups[-1][1].append(page.i)
+                    else:
+                        groups.append((key, [page.i]))
+                chunk_size = -(-len(batch) // self.workers)
+                futures = [
+                    executor.submit(
+                        render_pages,
+                        self.source(doc),
+                        page_nums[i : i + chunk_size],
+                        page_dpi,
+                    )
+                    for (doc, page_dpi), page_nums in groups
+                    for i in range(0, len(page_nums), chunk_size)
+                ]
+                pending.append((batch, futures))
+
+        fill()
+        while pending:
+            batch, futures = pending.popleft()
+            if batch:
+                fill()
+            imgs = [img for future in futures for img in future.result()]
+            yield batch, imgs
+            if not batch:
+                fill()
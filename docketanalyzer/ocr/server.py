@@ -0,0 +1,408 @@
+import base64
+import json
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable, Generator, Iterable
+from typing import Any
+
+from .document import Page, pdf_document, process_pages
+from .render import PageRenderer
+from .utils import load_pdf
+
+TERMINAL_STATUSES = ["COMPLETED", "FAILED", "CANCELLED"]
+
+
+class OCRJob:
+    """A document submitted to the OCR server.
+
+    Attributes:
+        id: The job ID.
+        input: The job input, as sent to `/run`.
+        status: One of IN_QUEUE, IN_PROGRESS, COMPLETED, FAILED or CANCELLED.
+        outputs: The stream items produced so far, one per processed page.
+        error: The error message if the job failed.
+        doc: The PDFDocument being processed.
+        remaining: The number of pages still being processed.
+        cursor: The number of outputs already sent to `/stream`.
+        finished_at: When the job reached a terminal status.
+    """
+
+    def __init__(self, job_input: dict):
+        """Initializes a new job."""
+        self.id = str(uuid.uuid4())
+        self.input = job_input
+        self.status = "IN_QUEUE"
+        self.outputs = []
+        self.error = None
+        self.doc = None
+        self.remaining = 0
+        self.cursor = 0
+        self.finished_at = None
+
+    def finish(self, status: str, error: str | None = None) -> None:
+        """Moves the job to a terminal status."""
+        if self.status not in TERMINAL_STATUSES:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+
+
+class OCRServer:
+    """Long-running OCR service that keeps the layout and OCR models loaded.
+
+    Implements the job protocol that `RemoteClient` speaks (`/run`,
+    `/stream/{id}`, `/status/{id}`, `/cancel/{id}`, `/purge-queue` and `/health`).
+    A single worker thread feeds the pages of all queued jobs through
+    `process_pages`, so model batches are filled across concurrent requests.
+
+    ```python
+    import uvicorn
+    from docketanalyzer.ocr.server import OCRServer, create_app
+
+    uvicorn.run(create_app(OCRServer(batch_size=8)), port=8000)
+    ```
+
+    Attributes:
+        batch_size: Number of pages per model batch.
+        max_wait: Maximum number of seconds a page waits for a batch to fill up.
+        render_workers: Number of processes used to render pages ahead of the
+            layout model. The processes are started once and kept running.
+        api_key: If set, requests must send it as a bearer token.
+        preload: Whether to load the models when the worker starts.
+        stream_wait: Maximum number of seconds a `/stream` call waits for output.
+        job_ttl: Number of seconds finished jobs are kept for `/status`.
+        jobs: Jobs by ID.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 8,
+        max_wait: float | None = 0.5,
+        render_workers: int = 0,
+        api_key: str | None = None,
+        preload: bool = True,
+        stream_wait: float = 10.0,
+        job_ttl: float = 600.0,
+        processor: Callable[..., Iterable[Page]] | None = None,
+    ):
+        """Initializes the server.
+
+        Args:
+            batch_size: Number of pages per model batch. Defaults to 8.
+            max_wait: Maximum number of seconds a page waits for a batch to fill
+                up. Defaults to 0.5.
+            render_workers: Number of processes used to render pages ahead of
+                the layout model. Defaults to 0 (render inline).
+            api_key: If set, requests must send it as a bearer token.
+            preload: Whether to load the models when the worker starts.
+                Defaults to True.
+            stream_wait: Maximum number of seconds a `/stream` call waits for new
+                output. Defaults to 10.
+            job_ttl: Number of seconds finished jobs are kept. Defaults to 600.
+            processor: Replaces `process_pages` for processing pages.
+        """
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.render_workers = render_workers
+        self.api_key = api_key
+        self.preload = preload
+        self.stream_wait = stream_wait
+        self.job_ttl = job_ttl
+        self.processor = processor or process_pages
+        self.jobs = {}
+        self.doc_jobs = {}
+        self.queue = queue.Queue()
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.worker = None
+
+    def start(self) -> "OCRServer":
+        """Starts the worker thread if it is not running."""
+        with self.condition:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.work, daemon=True)
+                self.worker.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the worker thread after the current batch."""
+        self.queue.put(None)
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+
+    def work(self) -> None:
+        """Processes queued jobs until stopped."""
+        if self.preload:
+            from .layout import load_model as load_layout_model
+            from .ocr import load_model as load_ocr_model
+
+            load_layout_model()
+            load_ocr_model()
+
+        self.stopped = False
+        with PageRenderer(workers=self.render_workers) as renderer:
+            while not self.stopped:
+                try:
+                    for page in self.processor(
+                        self.stream_pages(),
+                        batch_size=self.batch_size,
+                        verbose=False,
+                        max_wait=self.max_wait,
+                        renderer=renderer,
+                    ):
+                        self.add_output(page)
+                except Exception as e:
+                    # Fail the jobs with pages in flight and keep serving the others
+                    with self.condition:
+                        for job in self.doc_jobs.values():
+                            job.finish("FAILED", repr(e))
+                            job.doc.close()
+                        self.doc_jobs.clear()
+                        self.condition.notify_all()
+
+    def stream_pages(self) -> Generator[Page | None, None, None]:
+        """Yields the pages of queued jobs, flushing when the queue is empty."""
+        while True:
+            try:
+                job = self.queue.get_nowait()
+            except queue.Empty:
+                yield None
+                job = self.queue.get()
+            if job is None:
+                self.stopped = True
+                return
+            if job.status != "IN_QUEUE":
+                continue
+            try:
+                file = job.input.get("file")
+                pdf, filename = load_pdf(
+                    file=base64.b64decode(file) if file else None,
+                    s3_key=job.input.get("s3_key"),
+                    filename=job.input.get("filename"),
+                )
+                job.doc = pdf_document(
+                    pdf,
+                    filename=filename,
+                    dpi=job.input.get("dpi", 200),
+                    layout_dpi=job.input.get("layout_dpi"),
+                    ocr_dpi=job.input.get("ocr_dpi"),
+                )
+            except Exception as e:
+                with self.condition:
+                    job.finish("FAILED", repr(e))
+                    self.condition.notify_all()
+                continue
+            with self.condition:
+                self.doc_jobs[job.doc] = job
+                job.remaining = len(job.doc)
+                job.status = "IN_PROGRESS"
+            self.release(job, 0)
+            for i, page in enumerate(job.doc):
+                if job.status != "IN_PROGRESS":
+                    self.release(job, len(job.doc) - i)
+                    break
+                yield page
+
+    def add_output(self, page: Page) -> None:
+        """Records a processed page on its job."""
+        job = self.doc_jobs[page.doc]
+        with self.condition:
+            if job.status == "IN_PROGRESS":
+                job.outputs.append({"output": {"page": page.data}})
+        self.release(job, 1)
+
+    def release(self, job: OCRJob, num_pages: int) -> None:
+        """Marks pages of a job as done, closing its document after the last."""
+        with self.condition:
+            job.remaining -= num_pages
+            if not job.remaining:
+                job.finish("COMPLETED")
+                self.doc_jobs.pop(job.doc, None)
+                job.doc.close()
+            self.condition.notify_all()
+
+    def cleanup(self) -> None:
+        """Drops finished jobs older than `job_ttl`."""
+        cutoff = time.time() - self.job_ttl
+        with self.condition:
+            for job_id, job in list(self.jobs.items()):
+                if job.finished_at is not None and job.finished_at < cutoff:
+                    del self.jobs[job_id]
+
+    def run(self, job_input: dict) -> dict:
+        """Queues a job."""
+        if not job_input.get("file") and not job_input.get("s3_key"):
+            raise ValueError("Either s3_key or file must be provided")
+        self.cleanup()
+        self.start()
+        job = OCRJob(job_input)
+        with self.condition:
+            self.jobs[job.id] = job
+        self.queue.put(job)
+        return {"id": job.id, "status": job.status}
+
+    def stream(self, job_id: str, wait: float | None = None) -> dict:
+        """Gets the outputs produced since the last call, waiting for new ones."""
+        job = self.jobs[job_id]
+        wait = self.stream_wait if wait is None else wait
+        with self.condition:
+            self.condition.wait_for(
+                lambda: (
+                    job.cursor < len(job.outputs) or job.status in TERMINAL_STATUSES
+                ),
+                timeout=wait,
+            )
+            outputs = job.outputs[job.cursor :]
+            job.cursor += len(outputs)
+            # Only report completion once every output has been sent
+            status = job.status
+            if status == "COMPLETED" and job.cursor < len(job.outputs):
+                status = "IN_PROGRESS"
+            result = {"id": job.id, "status": status, "stream": outputs}
+            if job.error:
+                result["error"] = job.error
+            return result
+
+    def status(self, job_id: str) -> dict:
+        """Gets the status of a job."""
+        job = self.jobs[job_id]
+        result = {"id": job.id, "status": job.status}
+        if job.error:
+            result["error"] = job.error
+        return result
+
+    def cancel(self, job_id: str) -> dict:
+        """Cancels a job."""
+        job = self.jobs[job_id]
+        with self.condition:
+            job.finish("CANCELLED")
+            self.condition.notify_all()
+        return {"id": job.id, "status": job.status}
+
+    def purge_queue(self) -> dict:
+        """Cancels all jobs that have not started."""
+        removed = 0
+        with self.condition:
+            for job in self.jobs.values():
+                if job.status == "IN_QUEUE":
+                    job.finish("CANCELLED")
+                    removed += 1
+            self.condition.notify_all()
+        return {"removed": removed, "status": "completed"}
+
+    def health(self) -> dict:
+        """Gets job counts and worker status."""
+        counts = {
+            status: 0 for status in ["IN_QUEUE", "IN_PROGRESS", *TERMINAL_STATUSES]
+        }
+        with self.condition:
+            for job in self.jobs.values():
+                counts[job.status] += 1
+        running = self.worker is not None and self.worker.is_alive()
+        return {
+            "jobs": {
+                "inQueue": counts["IN_QUEUE"],
+                "inProgress": counts["IN_PROGRESS"],
+                "completed": counts["COMPLETED"],
+                "failed": counts["FAILED"],
+                "cancelled": counts["CANCELLED"],
+            },
+            "workers": {
+                "running": int(running and counts["IN_PROGRESS"] > 0),
+                "idle": int(running and counts["IN_PROGRESS"] == 0),
+            },
+        }
+
+    def handle(
+        self, method: str, path: str, body: bytes, headers: dict[str, str]
+    ) -> tuple[int, dict[str, Any]]:
+        """Handles an HTTP request.
+
+        This is independent of the web framework; `create_app` wraps it in an
+        ASGI app.
+
+        Args:
+            method: The HTTP method.
+            path: The request path.
+            body: The request body.
+            headers: The request headers, with lowercase names.
+
+        Returns:
+            tuple[int, dict]: The status code and the JSON response.
+        """
+        if self.api_key and headers.get("authorization") != f"Bearer {self.api_key}":
+            return 401, {"error": "Unauthorized"}
+
+        route, _, job_id = path.strip("/").partition("/")
+        try:
+            if route == "run" and method == "POST":
+                payload = json.loads(body or b"{}")
+                return 200, self.run(payload.get("input") or {})
+            elif route == "stream" and job_id:
+                return 200, self.stream(job_id)
+            elif route == "status" and job_id:
+                return 200, self.status(job_id)
+            elif route == "cancel" and job_id and method == "POST":
+                return 200, self.cancel(job_id)
+            elif route == "purge-queue" and method == "POST":
+                return 200, self.purge_queue()
+            elif route == "health" and not job_id:
+                return 200, self.health()
+        except KeyError:
+            return 404, {"error": f"Job not found: {job_id}"}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 404, {"error": f"Not found: {path}"}
+
+
+def create_app(server: OCRServer) -> Callable:
+    """Creates an ASGI app for an OCRServer, to be run with uvicorn.
+
+    Args:
+        server: The OCRServer to serve.
+
+    Returns:
+        Callable: The ASGI application.
+    """
+    import asyncio
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    server.start()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+
+        # /stream long-polls, so requests are handled off the event loop
+        status, result = await asyncio.get_running_loop().run_in_executor(
+            None, server.handle, scope["method"], scope["path"], body, headers
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": json.dumps(result).encode() + b"\n"}
+        )
+
+    return app
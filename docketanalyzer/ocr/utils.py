@@ -1,8 +1,38 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
+
 from docketanalyzer import load_clients
 
+S3_CLIENT = None
+S3_AVAILABLE = None
+
+
+def load_s3():
+    """Loads the S3 client, reusing it across documents."""
+    global S3_CLIENT
+    if S3_CLIENT is None:
+        S3_CLIENT = load_clients("s3")
+    return S3_CLIENT
+
+
+def s3_available(refresh: bool = False) -> bool:
+    """Checks whether S3 is reachable.
+
+    The check is a live request, so the result is cached for the process.
+
+    Args:
+        refresh: Whether to check again instead of using the cached result.
+
+    Returns:
+        bool: Whether S3 is available.
+    """
+    global S3_AVAILABLE
+    if S3_AVAILABLE is None or refresh:
+        S3_AVAILABLE = load_s3().status()
+    return S3_AVAILABLE
+
 
 def load_pdf(
     file: bytes | None = None,
@@ -41,7 +71,7 @@ def load_pdf(
     # Otherwise, we need to download from S3
     with tempfile.NamedTemporaryFile() as temp_file:
         temp_path = Path(temp_file.name)
-        load_clients("s3").download(s3_key, str(temp_path))
+        load_s3().download(s3_key, str(temp_path))
         return temp_path.read_bytes(), filename
 
 
@@ -115,3 +145,143 @@ def merge_boxes(
     )
 
     return merged_box
+
+
+def box_overlap_matrix(
+    boxes1: np.ndarray | list,
+    boxes2: np.ndarray | list,
+    use_first_as_denominator: bool = False,
+) -> np.ndarray:
+    """Calculates the overlap percentage between every pair of boxes.
+
+    This is the vectorized counterpart of `box_overlap_pct`.
+
+    Args:
+        boxes1: Array-like of shape (N, 4) with (xmin, ymin, xmax, ymax) boxes.
+        boxes2: Array-like of shape (M, 4) with (xmin, ymin, xmax, ymax) boxes.
+        use_first_as_denominator: If True, use the area of the box from `boxes1`
+            as denominator. If False (default), use the smaller of the two areas.
+
+    Returns:
+        np.ndarray: An (N, M) array where entry (i, j) equals
+            `box_overlap_pct(boxes1[i], boxes2[j], use_first_as_denominator)`.
+    """
+    boxes1 = np.asarray(boxes1, dtype=np.float64).reshape(-1, 4)
+    boxes2 = np.asarray(boxes2, dtype=np.float64).reshape(-1, 4)
+
+    area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+
+    x_overlap_min = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+    x_overlap_max = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+    y_overlap_min = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+    y_overlap_max = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
+    overlaps = (x_overlap_max > x_overlap_min) & (y_overlap_max > y_overlap_min)
+
+    intersection_area = (x_overlap_max - x_overlap_min) * (
+        y_overlap_max - y_overlap_min
+    )
+    if use_first_as_denominator:
+        denominator = np.broadcast_to(area1[:, None], intersection_area.shape)
+    else:
+        denominator = np.minimum(area1[:, None], area2[None, :])
+
+    result = np.zeros(intersection_area.shape)
+    np.divide(intersection_area, denominator, out=result, where=overlaps)
+    return result
+
+
+def merge_box_segments(
+    boxes: np.ndarray | list, offsets: np.ndarray | list
+) -> np.ndarray:
+    """Merges consecutive runs of boxes into boxes that encompass each run.
+
+    This is the vectorized counterpart of folding `merge_boxes` over each run.
+
+    Args:
+        boxes: Array-like of shape (N, 4) with (xmin, ymin, xmax, ymax) boxes.
+        offsets: Increasing start index of each run in `boxes`. Each run ends
+            where the next one starts, so runs must be non-empty.
+
+    Returns:
+        np.ndarray: An (S, 4) array with the merged box of each of the S runs.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if not len(offsets):
+        return np.empty((0, 4))
+    return np.concatenate(
+        [
+            np.minimum.reduceat(boxes[:, :2], offsets, axis=0),
+            np.maximum.reduceat(boxes[:, 2:], offsets, axis=0),
+        ],
+        axis=1,
+    )
+
+
+def boxes_extend(boxes: np.ndarray, box: tuple[float, float, float, float]):
+    """Checks which boxes extend past a reference box on any side.
+
+    Args:
+        boxes: Array of shape (N, 4) with (xmin, ymin, xmax, ymax) boxes.
+        box: Tuple of (xmin, ymin, xmax, ymax) for the reference box.
+
+    Returns:
+        np.ndarray: A boolean array that is True where merging the box into
+            `box` would change it.
+    """
+    xmin, ymin, xmax, ymax = box
+    return (
+        (boxes[:, 0] < xmin)
+        | (boxes[:, 1] < ymin)
+        | (boxes[:, 2] > xmax)
+        | (boxes[:, 3] > ymax)
+    )
+
+
+class BoxIndex:
+    """Spatial index for finding boxes that may overlap a query box.
+
+    Boxes are sorted by their top edge, so the boxes whose vertical extent can
+    intersect a query are a contiguous slice found with a binary search (a
+    sorted-interval sweep). This keeps block/line assignment close to linear on
+    dense pages, where comparing every block with every line is quadratic.
+
+    Attributes:
+        boxes: The indexed (N, 4) array of boxes.
+    """
+
+    def __init__(self, boxes: np.ndarray | list):
+        """Initializes the index.
+
+        Args:
+            boxes: Array-like of shape (N, 4) with (xmin, ymin, xmax, ymax) boxes.
+        """
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.order = np.argsort(self.boxes[:, 1], kind="stable")
+        self.ymins = self.boxes[self.order, 1]
+        heights = self.boxes[:, 3] - self.boxes[:, 1]
+        self.max_height = max(float(heights.max()), 0.0) if len(heights) else 0.0
+
+    def __len__(self) -> int:
+        """Gets the number of indexed boxes."""
+        return len(self.boxes)
+
+    def query(self, box: tuple[float, float, float, float]) -> np.ndarray:
+        """Finds the boxes that intersect a query box.
+
+        Args:
+            box: Tuple of (xmin, ymin, xmax, ymax) for the query box.
+
+        Returns:
+            np.ndarray: Indices of the intersecting boxes, in ascending order.
+        """
+        xmin, ymin, xmax, ymax = box
+        start = np.searchsorted(self.ymins, ymin - self.max_height, side="left")
+        end = np.searchsorted(self.ymins, ymax, side="left")
+        idxs = np.sort(self.order[start:end])
+        candidates = self.boxes[idxs]
+        hits = (
+            np.minimum(candidates[:, 2], xmax) > np.maximum(candidates[:, 0], xmin)
+        ) & (np.minimum(candidates[:, 3], ymax) > np.maximum(candidates[:, 1], ymin))
+        return idxs[hits]
@@ -1,13 +1,27 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import suppress
 from datetime import date
+from pathlib import Path
 from typing import Any
 
+import peewee
 import regex as re
+import simplejson as json
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.firefox.service import Service
 
-from docketanalyzer import construct_docket_id, env, parse_docket_id
+from docketanalyzer import CACHE_DIR, construct_docket_id, env, parse_docket_id
+
+
+class PacerCase(peewee.Model):
+    """A Peewee model for storing resolved PACER case candidates."""
+
+    docket_id = peewee.CharField(primary_key=True)
+    pacer_case_id = peewee.CharField(null=True)
+    candidates = peewee.TextField()
 
 
 class Pacer:
@@ -22,20 +36,30 @@ class Pacer:
             If not provided, will use saved config or PACER_USERNAME from environment.
         pacer_password (str, optional): PACER account password.
             If not provided, will use saved config or PACER_PASSWORD from environment.
+        db_path (str | Path, optional): Path to the SQLite database used to store
+            resolved PACER case IDs. Defaults to `pacer.db` in the cache directory.
 
     Attributes:
         pacer_username (str): The PACER account username
         pacer_password (str): The PACER account password
         cache (dict): Internal cache for storing session and driver instances
+        lookup_errors (dict): Errors of the failed lookups in the last call to
+            `find_candidate_cases_bulk`, keyed by docket ID.
     """
 
     def __init__(
-        self, pacer_username: str | None = None, pacer_password: str | None = None
+        self,
+        pacer_username: str | None = None,
+        pacer_password: str | None = None,
+        db_path: str | Path | None = None,
     ):
         """Initializes the Pacer class with the provided PACER credentials."""
         self.pacer_username = pacer_username or env.PACER_USERNAME
         self.pacer_password = pacer_password or env.PACER_PASSWORD
+        self.db_path = Path(db_path or CACHE_DIR / "pacer.db")
         self.cache = {}
+        self.lookup_errors = {}
+        self._lock = threading.Lock()
 
     @property
     def driver(self) -> webdriver:
@@ -52,11 +76,12 @@ class Pacer:
         """Returns a PacerSession instance."""
         from juriscraper.pacer import PacerSession
 
-        if "session" not in self.cache:
-            self.cache["session"] = PacerSession(
-                username=self.pacer_username, password=self.pacer_password
-            )
-            self.cache["session"].selenium = self.driver
+        with self._lock:
+            if "session" not in self.cache:
+                self.cache["session"] = PacerSession(
+                    username=self.pacer_username, password=self.pacer_password
+                )
+                self.cache["session"].selenium = self.driver
         return self.cache["session"]
 
     def __del__(self):
@@ -65,9 +90,155 @@ class Pacer:
             with suppress(Exception):
                 self.driver.quit()
 
-    def find_candidate_cases(self, docket_id: str) -> list[dict[str, str]]:
+    @property
+    def case_table(self) -> type[PacerCase]:
+        """Returns the local table of resolved PACER case candidates."""
+        if "case_table" not in self.cache:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = peewee.SqliteDatabase(self.db_path, pragmas={"journal_mode": "wal"})
+
+            # Bound per instance so instances with different paths stay separate
+            class Case(PacerCase):
+                class Meta:
+                    database = db
+                    table_name = PacerCase._meta.table_name
+
+            db.create_tables([Case], safe=True)
+            self.cache["case_table"] = Case
+        return self.cache["case_table"]
+
+    def get_cached_candidate_cases(
+        self, docket_ids: list[str]
+    ) -> dict[str, list[dict[str, str]]]:
+        """Gets previously resolved candidate cases from the local table.
+
+        Args:
+            docket_ids (list[str]): The docket IDs to look up.
+
+        Returns:
+            dict: Candidate cases keyed by docket ID, for docket IDs that were found.
+                Docket IDs known to have no candidates map to an empty list.
+        """
+        table = self.case_table
+        results = {}
+        for i in range(0, len(docket_ids), 500):
+            query = table.select().where(table.docket_id.in_(docket_ids[i : i + 500]))
+            for row in query:
+                results[row.docket_id] = json.loads(row.candidates)
+        return results
+
+    def save_candidate_cases(
+        self, docket_id: str, candidates: list[dict[str, str]]
+    ) -> None:
+        """Stores resolved candidate cases in the local table.
+
+        Empty results are stored too, with a null `pacer_case_id`, so docket IDs
+        without candidates are not queried again.
+
+        Args:
+            docket_id (str): The docket ID the candidates were found for.
+            candidates (list): The candidate cases.
+        """
+        table = self.case_table
+        pacer_case_id = candidates[0]["pacer_case_id"] if candidates else None
+        table.insert(
+            docket_id=docket_id,
+            pacer_case_id=pacer_case_id,
+            candidates=json.dumps(candidates),
+        ).on_conflict_replace().execute()
+
+    def find_candidate_cases(
+        self, docket_id: str, update: bool = False
+    ) -> list[dict[str, str]]:
         """Finds candidate PACER cases for a given docket ID.
 
+        Resolved candidates are stored in a local table, so repeat lookups for the
+        same docket ID do not query PACER again, even if no candidates were found.
+
+        Args:
+            docket_id (str): The docket ID to search for.
+            update (bool, optional): Whether to query PACER even if the docket ID
+                was resolved before.
+
+        Returns:
+            list: A list of candidate cases.
+        """
+        if not update:
+            cached = self.get_cached_candidate_cases([docket_id])
+            if docket_id in cached:
+                return cached[docket_id]
+        candidates = self.query_candidate_cases(docket_id)
+        self.save_candidate_cases(docket_id, candidates)
+        return candidates
+
+    def find_candidate_cases_bulk(
+        self,
+        docket_ids: list[str],
+        max_per_court: int = 2,
+        max_workers: int = 8,
+        update: bool = False,
+    ) -> dict[str, list[dict[str, str]]]:
+        """Finds candidate PACER cases for many docket IDs at once.
+
+        Docket IDs already in the local table are served from it. The rest are
+        grouped by court and queried concurrently, with at most `max_per_court`
+        requests in flight for any one court. A failed lookup does not stop the
+        others: it maps to None, is not stored, and its error is recorded in
+        `lookup_errors`.
+
+        Args:
+            docket_ids (list[str]): The docket IDs to search for.
+            max_per_court (int, optional): Maximum concurrent queries per court.
+            max_workers (int, optional): Maximum concurrent queries overall.
+            update (bool, optional): Whether to query PACER even for docket IDs
+                that were resolved before.
+
+        Returns:
+            dict: Candidate cases keyed by docket ID, or None for failed lookups.
+        """
+        self.lookup_errors = {}
+        docket_ids = list(dict.fromkeys(docket_ids))
+        results = {} if update else self.get_cached_candidate_cases(docket_ids)
+
+        by_court = defaultdict(list)
+        for docket_id in docket_ids:
+            if docket_id not in results:
+                court, _ = parse_docket_id(docket_id)
+                by_court[court].append(docket_id)
+
+        court_locks = {court: threading.Semaphore(max_per_court) for court in by_court}
+
+        def query(docket_id: str) -> list[dict[str, str]]:
+            court, _ = parse_docket_id(docket_id)
+            with court_locks[court]:
+                return self.query_candidate_cases(docket_id)
+
+        # Interleave courts so the pool is not saturated by a single court
+        queue = []
+        court_queues = list(by_court.values())
+        while any(court_queues):
+            for court_queue in court_queues:
+                if court_queue:
+                    queue.append(court_queue.pop(0))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(query, x): x for x in queue}
+            for future in as_completed(futures):
+                docket_id = futures[future]
+                try:
+                    candidates = future.result()
+                except Exception as e:
+                    self.lookup_errors[docket_id] = repr(e)
+                    results[docket_id] = None
+                    continue
+                self.save_candidate_cases(docket_id, candidates)
+                results[docket_id] = candidates
+
+        return {docket_id: results[docket_id] for docket_id in docket_ids}
+
+    def query_candidate_cases(self, docket_id: str) -> list[dict[str, str]]:
+        """Queries PACER for candidate cases for a given docket ID.
+
         Args:
             docket_id (str): The docket ID to search for.
 
@@ -180,13 +351,31 @@ class Pacer:
             docket_json["pacer_case_id"] = match.group(1)
         return docket_json
 
-    def get_attachments(self, pacer_doc_id: str, court: str) -> dict:
-        """Retrieves the attachments for a given PACER document ID."""
+    def get_attachments(
+        self, pacer_doc_id: str, court: str, update: bool = False
+    ) -> dict:
+        """Retrieves the attachments for a given PACER document ID.
+
+        Results are cached for the lifetime of this instance so repeated lookups
+        for the same document only query the attachment page once.
+
+        Args:
+            pacer_doc_id (str): The PACER document ID of the docket entry.
+            court (str): The court the document belongs to.
+            update (bool, optional): Whether to ignore the cached result.
+
+        Returns:
+            dict: The parsed attachment page data.
+        """
         from juriscraper.pacer import AttachmentPage
 
-        attachment_report = AttachmentPage(court, self.session)
-        attachment_report.query(pacer_doc_id)
-        return attachment_report.data
+        attachments_cache = self.cache.setdefault("attachments", {})
+        key = (court, pacer_doc_id)
+        if update or key not in attachments_cache:
+            attachment_report = AttachmentPage(court, self.session)
+            attachment_report.query(pacer_doc_id)
+            attachments_cache[key] = attachment_report.data
+        return attachments_cache[key]
 
     def purchase_document(
         self, pacer_case_id: str, pacer_doc_id: str, court: str
@@ -210,7 +399,12 @@ class Pacer:
         return pdf, status
 
     def purchase_attachment(
-        self, pacer_case_id: str, pacer_doc_id: str, attachment_number: str, court: str
+        self,
+        pacer_case_id: str,
+        pacer_doc_id: str,
+        attachment_number: str,
+        court: str,
+        attachments: dict | None = None,
     ) -> tuple[bytes, str]:
         """Purchases an attachment for a given PACER case ID and document ID.
 
@@ -219,15 +413,15 @@ class Pacer:
             pacer_doc_id (str): The PACER document ID to purchase the attachment from.
             attachment_number (str): The attachment number to purchase.
             court (str): The court to purchase the attachment from.
+            attachments (dict, optional): Previously retrieved attachment page data.
+                If not provided, uses `get_attachments`.
 
         Returns:
             tuple: A tuple containing the PDF content and the status of the purchase.
         """
-        from juriscraper.pacer import AttachmentPage
-
-        attachments = AttachmentPage(court, self.session)
-        attachments.query(pacer_doc_id)
-        attachments = attachments.data.get("attachments")
+        if attachments is None:
+            attachments = self.get_attachments(pacer_doc_id, court)
+        attachments = (attachments or {}).get("attachments")
         if attachments is None:
             return None, "no attachments"
         for attachment in attachments:
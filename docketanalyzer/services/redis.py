@@ -17,6 +17,13 @@ class RedisKey(peewee.Model):
     expiry = peewee.FloatField(null=True)
 
 
+class RedisListItem(peewee.Model):
+    """A Peewee model for storing the items of Redis-like lists."""
+
+    key = peewee.CharField(index=True)
+    value = peewee.TextField()
+
+
 class DevRedisClient:
     """A dev-only Redis replacement that uses SQLite for persistence."""
 
@@ -26,9 +33,10 @@ class DevRedisClient:
             db_path = CACHE_DIR / "redis.db"
         self.db = peewee.SqliteDatabase(db_path)
         RedisKey._meta.database = self.db
+        RedisListItem._meta.database = self.db
 
         self.db.connect()
-        self.db.create_tables([RedisKey], safe=True)
+        self.db.create_tables([RedisKey, RedisListItem], safe=True)
 
         if clear_on_init:
             self.clean_up()
@@ -87,8 +95,15 @@ class DevRedisClient:
             return 0
 
         count = RedisKey.select().where(RedisKey.key.in_(keys)).count()
+        count += (
+            RedisListItem.select(RedisListItem.key)
+            .where(RedisListItem.key.in_(keys))
+            .distinct()
+            .count()
+        )
 
         RedisKey.delete().where(RedisKey.key.in_(keys)).execute()
+        RedisListItem.delete().where(RedisListItem.key.in_(keys)).execute()
 
         return count
 
@@ -108,6 +123,42 @@ class DevRedisClient:
 
         return count
 
+    def rpush(self, key: str, *values: str | int | float) -> int:
+        """Append one or more values to a list."""
+        with self.db.atomic():
+            for value in values:
+                RedisListItem.create(key=key, value=str(value))
+        return self.llen(key)
+
+    def lpop(self, key: str) -> str | None:
+        """Remove and return the first value of a list."""
+        # Take the write lock up front so concurrent pops wait instead of failing
+        with self.db.atomic("IMMEDIATE"):
+            item = (
+                RedisListItem.select()
+                .where(RedisListItem.key == key)
+                .order_by(RedisListItem.id)
+                .first()
+            )
+            if item is None:
+                return None
+            RedisListItem.delete_by_id(item.id)
+        return item.value
+
+    def llen(self, key: str) -> int:
+        """Get the length of a list."""
+        return RedisListItem.select().where(RedisListItem.key == key).count()
+
+    def lrange(self, key: str, start: int, end: int) -> list[str]:
+        """Get the values of a list from `start` to `end`, inclusive."""
+        values = [
+            item.value
+            for item in RedisListItem.select()
+            .where(RedisListItem.key == key)
+            .order_by(RedisListItem.id)
+        ]
+        return values[start : None if end == -1 else end + 1]
+
     def keys(self, pattern: str = "*") -> list[str]:
         """Get all keys matching a pattern."""
         current_time = time.time()
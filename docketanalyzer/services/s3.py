@@ -1,7 +1,7 @@
 import os
 from contextlib import suppress
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import boto3
 from botocore.client import Config
@@ -252,6 +252,24 @@ class S3:
 
         return s3_key
 
+    def upload_fileobj(self, fileobj: BinaryIO, s3_key: str) -> str:
+        """Upload a file-like object to S3 without writing it to disk.
+
+        Large objects are sent as a multipart upload.
+
+        Args:
+            fileobj (BinaryIO): A readable binary file-like object.
+            s3_key (str): The key to use in the S3 bucket.
+
+        Returns:
+            str: The S3 key of the uploaded file.
+
+        Raises:
+            botocore.exceptions.ClientError: If the upload fails.
+        """
+        self.client.upload_fileobj(Fileobj=fileobj, Bucket=self.bucket, Key=s3_key)
+        return s3_key
+
     def delete(self, s3_key: str) -> None:
         """Delete a single file from S3 using the boto3 client.
 
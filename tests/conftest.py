@@ -1,7 +1,11 @@
+import shutil
 import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
+import simplejson as json
 
 from docketanalyzer import load_docket_index
 
@@ -19,6 +23,13 @@ def index():
     return load_docket_index(TEST_DATA_DIR)
 
 
+@pytest.fixture
+def temp_index(tmp_path):
+    """Load a copy of the docket index that tests can modify."""
+    shutil.copytree(TEST_DATA_DIR, tmp_path / "docketanalyzer")
+    return load_docket_index(tmp_path / "docketanalyzer")
+
+
 @pytest.fixture
 def model_dir():
     """Get a temporary in model run format."""
@@ -38,3 +49,50 @@ def sample_docket_id1():
 def sample_docket_id2():
     """Another example docket_id."""
     return SAMPLE_DOCKET_ID2
+
+
+def native_text_processor(pages, **kwargs):
+    """Process pages from their native text, without the layout or OCR models."""
+    from docketanalyzer.ocr.document import consolidate_blocks
+    from docketanalyzer.ocr.ocr import extract_native_text
+
+    for page in pages:
+        if page is not None:
+            page.extracted_text = extract_native_text(page.fitz)
+            page.set_blocks(consolidate_blocks(page, []))
+            yield page
+
+
+@pytest.fixture
+def ocr_server():
+    """Run an OCR server with a native text processor on a local port."""
+    from docketanalyzer.ocr.server import OCRServer
+
+    server = OCRServer(
+        preload=False, stream_wait=1, processor=native_text_processor
+    ).start()
+
+    class Handler(BaseHTTPRequestHandler):
+        def handle_request(self):
+            body = self.rfile.read(int(self.headers.get("content-length") or 0))
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            status, result = server.handle(self.command, self.path, body, headers)
+            data = json.dumps(result).encode() + b"\n"
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = handle_request  # noqa: N815
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{httpd.server_port}"
+    yield server
+    httpd.shutdown()
+    server.stop()
@@ -1,3 +1,6 @@
+import logging
+import time
+
 import pandas as pd
 
 
@@ -39,6 +42,28 @@ def test_classification(model_dir):
 
     assert preds == [True, True, False, False]
 
+    # Benchmark fixed-size batches against batching by a token budget
+    examples = [
+        " ".join(["apple", "dog", "banana", "cat"][: i % 4 + 1] * (i % 50 + 1))
+        for i in range(400)
+    ]
+    results = {}
+    for name, kwargs in [
+        ("batch_size=1", dict(batch_size=1)),
+        ("batch_size=16", dict(batch_size=16)),
+        ("max_tokens", dict(max_tokens=8192)),
+    ]:
+        start = time.perf_counter()
+        results[name] = pipe(examples, return_scores=True, **kwargs)
+        seconds = time.perf_counter() - start
+        logging.info(f"{name}: {len(examples) / seconds:.1f} examples/s")
+    for name, result in results.items():
+        assert [x["label"] for x in result] == [
+            x["label"] for x in results["batch_size=1"]
+        ], name
+        for x, y in zip(result, results["batch_size=1"], strict=True):
+            assert abs(x["score"] - y["score"]) < 1e-3, name
+
 
 def test_multi_label_classification(model_dir):
     """Test multi-label classification routine on dummy data."""
@@ -1,3 +1,10 @@
+import logging
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
 import simplejson as json
 
 
@@ -56,3 +63,1136 @@ def test_local_stream(index, sample_docket_id1):
 
     assert len(doc1) == len(doc2), "Document lengths do not match"
     assert compare_docs(doc1, doc2), "Processed documents are not equal"
+
+
+def test_render_pool(index, sample_docket_id1, sample_docket_id2):
+    """Benchmark rendering pages inline and in a process pool."""
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.render import PageRenderer
+
+    docs = [
+        pdf_document(index[docket_id].get_pdf_path(entry_number=1))
+        for docket_id in [sample_docket_id1, sample_docket_id2]
+    ]
+    pages = [page for doc in docs for page in doc]
+    batches = [pages[i : i + 4] for i in range(0, len(pages), 4)]
+
+    results = {}
+    for workers in [0, 2]:
+        with PageRenderer(workers=workers) as renderer:
+            # Warm up the pool so process startup is not included in the timing
+            list(renderer.imap(batches[:1], dpi=200))
+            start = time.time()
+            results[workers] = [
+                img for _, imgs in renderer.imap(batches, dpi=200) for img in imgs
+            ]
+            pages_per_second = len(pages) / (time.time() - start)
+        logging.info(f"render workers={workers}: {pages_per_second:.2f} pages/s")
+
+    assert len(results[0]) == len(pages)
+    for img1, img2 in zip(results[0], results[2], strict=True):
+        assert np.array_equal(img1, img2), "Pool renders do not match inline renders"
+
+
+def test_render_pool_reuse(index, sample_docket_id1, fake_models):
+    """Test that documents from bytes are sent to workers once and pools reused."""
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.document import process_pages
+    from docketanalyzer.ocr.render import PageRenderer
+
+    path = index[sample_docket_id1].get_pdf_path(entry_number=1)
+    doc = pdf_document(path.read_bytes())
+    inline = [img for _, imgs in PageRenderer().imap([doc.pages]) for img in imgs]
+
+    with PageRenderer(workers=2) as renderer:
+        # Workers open a temporary copy of the PDF instead of receiving its bytes
+        source = renderer.source(doc)
+        assert isinstance(source, str) and Path(source).read_bytes() == doc.pdf_bytes
+        assert renderer.source(doc) == source
+        imgs = [img for _, imgs in renderer.imap([doc.pages]) for img in imgs]
+        assert all(np.array_equal(a, b) for a, b in zip(inline, imgs, strict=True))
+
+        # The pool is kept across process_pages calls
+        executor = renderer.executor
+        for _ in range(2):
+            pages = list(process_pages(doc.pages, batch_size=4, renderer=renderer))
+            assert len(pages) == len(doc)
+        assert renderer.executor is executor
+    assert not Path(source).exists()
+
+
+def test_page_render_cache(index, sample_docket_id1):
+    """Test that page renders are shared between consumers and released."""
+    from docketanalyzer.ocr import pdf_document
+
+    doc = pdf_document(index[sample_docket_id1].get_pdf_path(entry_number=1))
+    page = doc[0]
+
+    img = page.get_img()
+    assert page.img is img
+    assert img.shape[1] == round(page.fitz.rect.width * doc.dpi / 72)
+
+    # Lower resolutions that divide the cached DPI are strided views
+    half = page.get_img(dpi=doc.dpi // 2)
+    assert np.shares_memory(img, half)
+
+    # Clip boxes are in PDF points
+    width, height = page.fitz.rect.width, page.fitz.rect.height
+    clip = page.clip((0, 0, width / 2, height / 2))
+    assert abs(clip.shape[1] - img.shape[1] / 2) <= 1
+    assert abs(clip.shape[0] - img.shape[0] / 2) <= 1
+
+    page.clear_imgs()
+    assert page.get_img() is not img
+
+
+def make_synthetic_page(num_lines: int, num_blocks: int, seed: int = 0):
+    """Build random line and layout boxes resembling a dense page."""
+    rng = np.random.default_rng(seed)
+    lines = []
+    for i in range(num_lines):
+        x0 = float(rng.uniform(0, 500))
+        y0 = float(i * 2 + rng.uniform(0, 4))
+        bbox = (x0, y0, x0 + float(rng.uniform(5, 100)), y0 + 8.0)
+        lines.append({"bbox": bbox, "content": str(i)})
+    layout = []
+    for _ in range(num_blocks):
+        x0 = float(rng.uniform(0, 400))
+        y0 = float(rng.uniform(0, num_lines * 2))
+        bbox = [
+            x0,
+            y0,
+            x0 + float(rng.uniform(50, 200)),
+            y0 + float(rng.uniform(8, 80)),
+        ]
+        layout.append({"bbox": bbox, "type": "text"})
+    return lines, layout
+
+
+def test_consolidate_blocks_index():
+    """Test the indexed block/line assignment against the pairwise version."""
+    from types import SimpleNamespace
+
+    from docketanalyzer.ocr.document import consolidate_blocks, text_coverage
+    from docketanalyzer.ocr.utils import box_overlap_pct, merge_boxes
+
+    def consolidate_blocks_pairwise(lines, layout):
+        blocks = []
+        for block in layout:
+            block["lines"] = []
+            drop_lines = []
+            new_bbox = block["bbox"]
+            for li, line in enumerate(lines):
+                if box_overlap_pct(block["bbox"], line["bbox"]) > 0.5:
+                    block["lines"].append(line)
+                    drop_lines.append(li)
+                    new_bbox = merge_boxes(new_bbox, lines[li]["bbox"])
+                block["bbox"] = new_bbox
+            lines = [line for li, line in enumerate(lines) if li not in drop_lines]
+            if len(block["lines"]) > 0:
+                blocks.append(block)
+        for line in lines:
+            blocks.append({"bbox": line["bbox"], "type": "text", "lines": [line]})
+        return blocks
+
+    def text_coverage_pairwise(layout, lines):
+        total_area = covered_area = 0
+        for block in layout:
+            x1_min, y1_min, x1_max, y1_max = block["bbox"]
+            block_area = (x1_max - x1_min) * (y1_max - y1_min)
+            block_coverage = sum(
+                box_overlap_pct(block["bbox"], line["bbox"], True) for line in lines
+            )
+            total_area += block_area
+            covered_area += block_area * min(block_coverage, 1.0)
+        return covered_area / total_area
+
+    for num_lines, num_blocks in [(50, 10), (5000, 200)]:
+        lines, layout = make_synthetic_page(num_lines, num_blocks)
+
+        start = time.time()
+        expected = text_coverage_pairwise(layout, lines)
+        expected_blocks = consolidate_blocks_pairwise(lines, [dict(x) for x in layout])
+        pairwise_time = time.time() - start
+
+        start = time.time()
+        coverage = text_coverage(layout, lines)
+        blocks = consolidate_blocks(
+            SimpleNamespace(extracted_text=lines), [dict(x) for x in layout]
+        )
+        indexed_time = time.time() - start
+        logging.info(
+            f"{num_lines} lines, {num_blocks} blocks: "
+            f"pairwise {pairwise_time:.3f}s, indexed {indexed_time:.3f}s"
+        )
+
+        assert abs(coverage - expected) < 1e-9
+        assert len(blocks) == len(expected_blocks)
+        for block, expected_block in zip(blocks, expected_blocks, strict=True):
+            assert tuple(block["bbox"]) == tuple(expected_block["bbox"])
+            assert block["lines"] == expected_block["lines"]
+
+
+def test_merge_overlapping_blocks():
+    """Test that vectorized block merging matches the sequential version."""
+    from docketanalyzer.ocr.layout import LAYOUT_CHOICES, merge_overlapping_blocks
+    from docketanalyzer.ocr.utils import box_overlap_pct, merge_boxes
+
+    def merge_overlapping_blocks_sequential(blocks):
+        type_priority = {t: i for i, t in enumerate(LAYOUT_CHOICES.values())}
+        unprocessed = [block.copy() for block in blocks]
+        result = []
+        while unprocessed:
+            current = unprocessed.pop(0)
+            merged = True
+            while merged:
+                merged = False
+                i = 0
+                while i < len(unprocessed):
+                    other = unprocessed[i]
+                    if box_overlap_pct(current["bbox"], other["bbox"]) > 0.5:
+                        if (
+                            type_priority[other["type"]]
+                            < type_priority[current["type"]]
+                        ):
+                            current["type"] = other["type"]
+                        current["bbox"] = merge_boxes(current["bbox"], other["bbox"])
+                        unprocessed.pop(i)
+                        merged = True
+                    else:
+                        i += 1
+            result.append(current)
+        result.sort(key=lambda x: (x["bbox"][1], x["bbox"][0]))
+        return result
+
+    rng = np.random.default_rng(0)
+    types = list(LAYOUT_CHOICES.values())
+    for num_blocks in [0, 1, 20, 2000]:
+        xy = rng.integers(0, 10 * num_blocks + 1, size=(num_blocks, 2))
+        wh = rng.integers(5, 60, size=(num_blocks, 2))
+        bboxes = (np.concatenate([xy, xy + wh], axis=1) * (72 / 200)).tolist()
+        blocks = [
+            {"type": types[rng.integers(len(types))], "bbox": bbox} for bbox in bboxes
+        ]
+
+        start = time.time()
+        expected = merge_overlapping_blocks_sequential(blocks)
+        sequential_time = time.time() - start
+        start = time.time()
+        result = merge_overlapping_blocks(blocks)
+        vectorized_time = time.time() - start
+        logging.info(
+            f"{num_blocks} blocks: sequential {sequential_time:.4f}s, "
+            f"vectorized {vectorized_time:.4f}s"
+        )
+        assert result == expected
+
+
+def test_box_array_apis():
+    """Benchmark the array box utilities against their scalar counterparts."""
+    from docketanalyzer.ocr import (
+        box_overlap_matrix,
+        box_overlap_pct,
+        merge_box_segments,
+        merge_boxes,
+    )
+
+    lines, layout = make_synthetic_page(2000, 100)
+    line_boxes = [line["bbox"] for line in lines]
+    block_boxes = [block["bbox"] for block in layout]
+
+    for use_first in [False, True]:
+        start = time.time()
+        expected = [
+            [box_overlap_pct(b1, b2, use_first) for b2 in line_boxes]
+            for b1 in block_boxes
+        ]
+        scalar_time = time.time() - start
+        start = time.time()
+        result = box_overlap_matrix(block_boxes, line_boxes, use_first)
+        array_time = time.time() - start
+        logging.info(
+            f"box_overlap use_first={use_first}: "
+            f"scalar {scalar_time:.4f}s, array {array_time:.4f}s"
+        )
+        assert result.tolist() == expected
+
+    offsets = list(range(0, len(line_boxes), 7))
+    segments = [line_boxes[i : i + 7] for i in offsets]
+    start = time.time()
+    expected = []
+    for segment in segments:
+        bbox = segment[0]
+        for box in segment[1:]:
+            bbox = merge_boxes(bbox, box)
+        expected.append(list(bbox))
+    scalar_time = time.time() - start
+    start = time.time()
+    result = merge_box_segments(line_boxes, offsets)
+    array_time = time.time() - start
+    logging.info(f"merge_boxes: scalar {scalar_time:.4f}s, array {array_time:.4f}s")
+    assert result.tolist() == expected
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """Replace the layout and OCR models with fast fakes that record batch sizes."""
+    from docketanalyzer.ocr import document
+
+    calls = {"layout": [], "ocr": []}
+
+    def fake_predict_layout(imgs, batch_size, dpi):
+        calls["layout"].append(len(imgs))
+        return [[{"type": "text", "bbox": [0, 0, 100, 100]}] for _ in imgs]
+
+    def fake_extract_ocr_text(imgs, dpi=72):
+        calls["ocr"].append(len(imgs))
+        return [[] for _ in imgs]
+
+    def fake_page_needs_ocr(page, layout):
+        page.extracted_text = document.extract_native_text(page.fitz)
+        return page.i % 2 == 0
+
+    monkeypatch.setattr(document, "predict_layout", fake_predict_layout)
+    monkeypatch.setattr(document, "extract_ocr_text", fake_extract_ocr_text)
+    monkeypatch.setattr(document, "page_needs_ocr", fake_page_needs_ocr)
+    return calls
+
+
+def test_stream_process_pdfs(
+    index, sample_docket_id1, sample_docket_id2, fake_models, monkeypatch
+):
+    """Test cross-document batching with a bounded number of open documents."""
+    import fitz
+
+    from docketanalyzer.ocr import document
+
+    calls = fake_models
+    paths = [
+        index[docket_id].get_pdf_path(entry_number=1)
+        for docket_id in [sample_docket_id1, sample_docket_id2, sample_docket_id1]
+    ]
+    num_pages = [len(fitz.open(path)) for path in paths]
+
+    open_docs, max_open_docs = set(), 0
+    original_pdf_document = document.pdf_document
+    original_close = document.PDFDocument.close
+
+    def tracked_pdf_document(*args, **kwargs):
+        nonlocal max_open_docs
+        doc = original_pdf_document(*args, **kwargs)
+        open_docs.add(doc)
+        max_open_docs = max(max_open_docs, len(open_docs))
+        return doc
+
+    def tracked_close(doc):
+        open_docs.discard(doc)
+        original_close(doc)
+
+    monkeypatch.setattr(document, "pdf_document", tracked_pdf_document)
+    monkeypatch.setattr(document.PDFDocument, "close", tracked_close)
+
+    finished = []
+    for doc in document.stream_process_pdfs(iter(paths), batch_size=4, max_open_docs=2):
+        assert doc in open_docs
+        finished.append(len(doc))
+
+    assert sorted(finished) == sorted(num_pages)
+    assert max_open_docs == 2
+    assert not open_docs
+    assert sum(calls["layout"]) == sum(num_pages)
+    assert all(n <= 4 for n in calls["layout"] + calls["ocr"])
+    # Layout batches span documents instead of stopping at each document's end
+    assert max(calls["layout"]) == 4
+
+    # Pending pages are flushed by max_wait while the next input is slow
+    arrived = threading.Event()
+
+    def slow_paths():
+        yield paths[0]
+        yield paths[1] if arrived.wait(5) else paths[2]
+
+    finished = []
+    for doc in document.stream_process_pdfs(slow_paths(), batch_size=64, max_wait=0.05):
+        arrived.set()
+        finished.append(doc.pdf_path)
+    assert finished == paths[:2]
+    assert not open_docs
+
+    # A deadline of zero runs every OCR page as soon as its layout batch is done
+    docs = document.bulk_process_pdfs(paths[:1], batch_size=4)
+    assert len(docs) == 1
+    calls["ocr"].clear()
+    for _ in document.process_pages(docs[0].pages, batch_size=4, max_wait=0):
+        pass
+    assert calls["ocr"] and all(n <= 2 for n in calls["ocr"])
+
+
+def test_stream_remote_cancel(index, sample_docket_id1):
+    """Test that a failed range cancels the remote jobs still running."""
+    from docketanalyzer.ocr import pdf_document
+
+    class FakeClient:
+        def __init__(self, num_jobs):
+            self.num_jobs = num_jobs
+            self.submitted, self.cancelled = [], {}
+            self.lock = threading.Lock()
+
+        def submit(self, **kwargs):
+            with self.lock:
+                job_id = f"job-{len(self.submitted)}"
+                self.submitted.append(job_id)
+                self.cancelled[job_id] = threading.Event()
+            return job_id
+
+        def stream_results(self, job_id):
+            if job_id == "job-0":
+                # Fail once every other range is running
+                while len(self.submitted) < self.num_jobs:
+                    time.sleep(0.01)
+                yield {"status": "FAILED"}
+            elif self.cancelled[job_id].wait(5):
+                yield {"status": "CANCELLED"}
+
+        def cancel_job(self, job_id):
+            self.cancelled[job_id].set()
+
+    path = index[sample_docket_id1].get_pdf_path(entry_number=1)
+    doc = pdf_document(path, use_s3=False)
+    doc._remote_client = client = FakeClient(num_jobs=3)
+    with pytest.raises(Exception, match="FAILED"):
+        list(doc.stream_remote(pages_per_job=4))
+    assert len(doc) == 12 and len(client.submitted) == 3
+    cancelled = {job_id for job_id, x in client.cancelled.items() if x.is_set()}
+    assert cancelled == {"job-1", "job-2"}
+
+
+def test_ocr_server(index, sample_docket_id1, sample_docket_id2, ocr_server):
+    """Test the OCR server through RemoteClient and the ASGI app."""
+    import asyncio
+
+    import httpx
+
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.server import create_app
+
+    paths = [
+        index[docket_id].get_pdf_path(entry_number=1)
+        for docket_id in [sample_docket_id1, sample_docket_id2]
+    ]
+    for path in paths:
+        doc = pdf_document(
+            path, remote=True, use_s3=False, endpoint_url=ocr_server.url
+        ).process()
+        local = pdf_document(path)
+        for _ in ocr_server.processor(local.pages):
+            pass
+        assert compare_docs(doc, local)
+
+    client = doc.remote_client
+    health = client.get_health()
+    assert health["jobs"]["completed"] == 2
+    assert client.purge_queue()["removed"] == 0
+
+    async def call_app():
+        transport = httpx.ASGITransport(app=create_app(ocr_server))
+        async with httpx.AsyncClient(transport=transport, base_url="http://x") as c:
+            response = await c.post("/run", json={"input": {}})
+            assert response.status_code == 400
+            response = await c.post("/status/missing")
+            assert response.status_code == 404
+            response = await c.get("/health")
+            return response.json()
+
+    assert asyncio.run(call_app())["jobs"]["completed"] == 2
+
+
+def test_page_cache(index, sample_docket_id1, fake_models, tmp_path):
+    """Test that repeated pages are served from the page cache."""
+    from docketanalyzer.ocr import PageCache, pdf_document
+
+    path = index[sample_docket_id1].get_pdf_path(entry_number=1)
+    cache = PageCache(tmp_path / "pages.db", model_version="test")
+
+    doc1 = pdf_document(path, cache=cache).process(batch_size=2)
+    num_pages = len(doc1)
+    assert sum(fake_models["layout"]) == num_pages
+    assert cache.stats() == {"hits": 0, "misses": num_pages, "hit_rate": 0.0}
+
+    # The same content loaded from bytes hits the cache for every page
+    fake_models["layout"].clear()
+    doc2 = pdf_document(path.read_bytes(), cache=cache).process(batch_size=2)
+    assert not fake_models["layout"]
+    assert cache.hits == num_pages
+    assert cache.hit_rate == 0.5
+    pages1, pages2 = doc1.data["pages"], doc2.data["pages"]
+    assert json.loads(json.dumps(pages1)) == json.loads(json.dumps(pages2))
+
+    # Changing the model version invalidates the cache
+    other = PageCache(tmp_path / "pages.db", model_version="other")
+    pdf_document(path, cache=other).process(batch_size=2)
+    assert other.hits == 0
+    assert other.key(doc1[0]) != cache.key(doc1[0])
+
+    # Each cache stays bound to its own database
+    separate = PageCache(tmp_path / "separate.db", model_version="test")
+    assert separate.table.select().count() == 0
+    assert cache.get(doc1[0]) is not None
+    separate.set(doc1[0])
+    assert separate.table.select().count() == 1
+    assert cache.table.select().count() == 2 * num_pages
+
+
+def test_page_hash_forms():
+    """Test that pages wrapping different Form XObjects hash differently."""
+    import fitz
+
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.cache import page_hash
+
+    def form_page(text):
+        src = fitz.open()
+        src.new_page().insert_text((72, 72), text)
+        doc = fitz.open()
+        page = doc.new_page()
+        page.show_pdf_page(page.rect, src, 0)
+        assert page.read_contents().strip() == b"q /fzFrm0 Do Q"
+        return pdf_document(doc.tobytes())[0]
+
+    a, b = form_page("Plaintiff wins"), form_page("Defendant wins")
+    assert page_hash(a) != page_hash(b)
+    assert page_hash(a) == page_hash(form_page("Plaintiff wins"))
+
+
+def test_page_hash_annotations():
+    """Test that pages differing only in annotations hash differently."""
+    import fitz
+
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.cache import page_hash
+
+    def widget_page(value):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Plaintiff:")
+        widget = fitz.Widget()
+        widget.field_name = "plaintiff"
+        widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+        widget.field_value = value
+        widget.rect = fitz.Rect(150, 60, 400, 80)
+        page.add_widget(widget)
+        return pdf_document(doc.tobytes())[0]
+
+    def freetext_page(text):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Exhibit A")
+        page.add_freetext_annot(fitz.Rect(72, 100, 300, 130), text)
+        return pdf_document(doc.tobytes())[0]
+
+    a, b = widget_page("John Smith"), widget_page("Acme Corp")
+    assert page_hash(a) != page_hash(b)
+    assert page_hash(a) == page_hash(widget_page("John Smith"))
+    assert page_hash(freetext_page("Approved")) != page_hash(freetext_page("Denied"))
+
+
+def test_native_fast_path(index, sample_docket_id1, sample_docket_id2, fake_models):
+    """Measure the native text fast path against the reference OCR output."""
+    from collections import Counter
+
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.document import native_text_blocks, page_has_clean_text
+
+    results = {}
+    for docket_id in [sample_docket_id1, sample_docket_id2]:
+        manager = index[docket_id]
+        doc = pdf_document(manager.get_pdf_path(entry_number=1))
+        reference = pdf_document(
+            manager.get_pdf_path(entry_number=1),
+            load=manager.get_ocr_path(entry_number=1),
+        )
+
+        start = time.time()
+        clean = [page_has_clean_text(page) for page in doc]
+        check_time = (time.time() - start) / len(doc)
+
+        similarities = []
+        for page, ref_page, is_clean in zip(doc, reference, clean, strict=True):
+            if is_clean:
+                page.set_blocks(native_text_blocks(page.extracted_text))
+                # Block order differs between the two, so compare bags of words
+                words = Counter(page.text.split())
+                ref_words = Counter(ref_page.text.split())
+                similarities.append(
+                    sum((words & ref_words).values())
+                    / max(sum(words.values()), sum(ref_words.values()))
+                )
+        results[docket_id] = clean
+        logging.info(
+            f"{docket_id}: {sum(clean)}/{len(doc)} pages on the fast path, "
+            f"{check_time * 1000:.1f}ms per check, "
+            f"similarity to OCR output {np.mean(similarities or [0]):.3f}"
+        )
+        assert all(x > 0.9 for x in similarities)
+
+    # The digital filing takes the fast path and the scanned one does not
+    assert all(results[sample_docket_id1])
+    assert not any(results[sample_docket_id2])
+
+    doc = pdf_document(
+        index[sample_docket_id1].get_pdf_path(entry_number=1), native_fast_path=True
+    ).process()
+    assert not fake_models["layout"]
+    assert all(len(page.blocks) for page in doc)
+
+
+def test_binary_format(index, sample_docket_id1, sample_docket_id2, tmp_path):
+    """Test the binary OCR format against the JSON format."""
+    from docketanalyzer.ocr import load_binary, pdf_document, save_binary
+
+    for docket_id in [sample_docket_id1, sample_docket_id2]:
+        manager = index[docket_id]
+        pdf_path = manager.get_pdf_path(entry_number=1)
+        json_path = manager.get_ocr_path(entry_number=1)
+        doc = pdf_document(pdf_path, load=json_path)
+
+        bin_path = tmp_path / f"{docket_id}.bin"
+        doc.save(bin_path)
+        logging.info(
+            f"{docket_id}: json {json_path.stat().st_size} bytes, "
+            f"binary {bin_path.stat().st_size} bytes"
+        )
+
+        data = load_binary(bin_path)
+        assert len(data) == len(doc)
+        for i, page in enumerate(doc):
+            assert data.page_text(i) == page.text
+
+        loaded = pdf_document(pdf_path, load=bin_path)
+        assert loaded.pages[0]._block_loader is not None
+        for page1, page2 in zip(doc, loaded, strict=True):
+            assert page1.text == page2.text
+            for block1, block2 in zip(page1, page2, strict=True):
+                assert block1.block_type == block2.block_type
+                assert np.allclose(block1.bbox, block2.bbox, atol=1e-3)
+                for line1, line2 in zip(block1, block2, strict=True):
+                    assert np.allclose(line1.bbox, line2.bbox, atol=1e-3)
+
+    # Compare extracting page texts from a large filing in both formats
+    data = json.loads(json_path.read_text())
+    data["pages"] = data["pages"] * 50
+    json_path, bin_path = tmp_path / "large.json", tmp_path / "large.bin"
+    json_path.write_text(json.dumps(data, indent=2))
+    save_binary(data, bin_path)
+
+    start = time.time()
+    pages = json.loads(json_path.read_text())["pages"]
+    json_texts = [
+        "\n\n".join("\n".join(x["content"] for x in b["lines"]) for b in p["blocks"])
+        for p in pages
+    ]
+    json_time = time.time() - start
+    start = time.time()
+    data = load_binary(bin_path)
+    binary_texts = [data.page_text(i) for i in range(len(data))]
+    binary_time = time.time() - start
+    logging.info(
+        f"{len(pages)} page texts: json {json_time:.3f}s, binary {binary_time:.3f}s"
+    )
+    assert binary_texts == json_texts
+
+
+def test_document_tree(index, sample_docket_id1):
+    """Test cached text and direct lookups on the document tree."""
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.document import Page
+
+    manager = index[sample_docket_id1]
+    doc = pdf_document(
+        manager.get_pdf_path(entry_number=1),
+        load=manager.get_ocr_path(entry_number=1),
+    )
+    page = doc[1]
+    block = page[0]
+    line = block[0]
+    assert not hasattr(line, "__dict__")
+    assert (page.id, block.id, line.id) == (1, "1-0", "1-0-0")
+    assert line.page_num == block.page_num == 1
+    assert line.doc is block.doc is page.doc is doc
+
+    # Text is cached and invalidated when lines or blocks change
+    assert page.text is page.text
+    assert block.text.startswith(line.text)
+    line.content = "Replaced"
+    assert block.text.startswith("Replaced")
+    assert "Replaced" in page.text
+    block.lines = block.lines[:1]
+    assert block.text == "Replaced"
+    page.set_blocks(
+        [{"bbox": [0, 0, 1, 1], "lines": [{"bbox": [0, 0, 1, 1], "content": "New"}]}]
+    )
+    assert page.text == "New"
+
+    # Post-processing a large document reads each block's text several times
+    pages = [page.data["blocks"] for page in doc] * 50
+    start = time.time()
+    doc.pages = [Page(doc, i % len(doc), blocks) for i, blocks in enumerate(pages)]
+    doc.postprocess_court_doc()
+    logging.info(
+        f"Loaded and post-processed {len(doc)} pages in {time.time() - start:.3f}s"
+    )
+
+
+def test_lazy_pdf_document(index, sample_docket_id1, monkeypatch):
+    """Test that local documents skip S3 and only read their bytes when needed."""
+    from docketanalyzer.ocr import document, pdf_document, utils
+
+    status_calls = []
+
+    class FakeS3:
+        def status(self):
+            status_calls.append(1)
+            return False
+
+    monkeypatch.setattr(utils, "S3_AVAILABLE", None)
+    monkeypatch.setattr(utils, "S3_CLIENT", FakeS3())
+
+    path = index[sample_docket_id1].get_pdf_path(entry_number=1)
+    start = time.time()
+    docs = [pdf_document(path) for _ in range(20)]
+    logging.info(f"Opened {len(docs)} documents in {time.time() - start:.3f}s")
+    assert not status_calls
+    assert all(doc._pdf_bytes is None for doc in docs)
+
+    # S3 readiness is checked once and shared by all documents
+    assert not any(doc.s3_available for doc in docs)
+    assert docs[0].s3_key is None
+    assert len(status_calls) == 1
+
+    assert docs[0].pdf_bytes == path.read_bytes()
+    monkeypatch.setattr(document, "MMAP_MIN_SIZE", 0)
+    assert docs[1].pdf_bytes[:] == path.read_bytes()
+    for doc in docs:
+        doc.close()
+
+
+def test_remote_page_ranges(index, sample_docket_id1, ocr_server, monkeypatch):
+    """Test splitting a remote document into concurrent page-range jobs."""
+    from docketanalyzer.ocr import pdf_document, utils
+
+    class FakeS3:
+        def __init__(self):
+            self.objects = {}
+
+        def status(self):
+            return True
+
+        def upload_fileobj(self, fileobj, s3_key):
+            self.objects[s3_key] = fileobj.read()
+            return s3_key
+
+        def download(self, s3_key, local_path):
+            Path(local_path).write_bytes(self.objects[s3_key])
+
+        def delete(self, s3_key):
+            del self.objects[s3_key]
+
+    s3 = FakeS3()
+    monkeypatch.setattr(utils, "S3_CLIENT", s3)
+    monkeypatch.setattr(utils, "S3_AVAILABLE", True)
+
+    path = index[sample_docket_id1].get_pdf_path(entry_number=1)
+    local = pdf_document(path)
+    for _ in ocr_server.processor(local.pages):
+        pass
+
+    for use_s3 in [False, True]:
+        doc = pdf_document(
+            path.read_bytes(),
+            remote=True,
+            use_s3=use_s3,
+            endpoint_url=ocr_server.url,
+        )
+        assert doc.page_ranges(5) == [(0, 5), (5, 10), (10, 12)]
+        pages = [page.i for page in doc.stream(pages_per_job=5)]
+        assert sorted(pages) == list(range(len(doc)))
+        assert compare_docs(doc, local)
+    assert not s3.objects
+
+
+def test_async_remote_client(index, sample_docket_id1, sample_docket_id2, ocr_server):
+    """Test running many remote jobs at once with AsyncRemoteClient."""
+    import asyncio
+
+    from docketanalyzer.ocr import pdf_document
+    from docketanalyzer.ocr.remote import AsyncRemoteClient
+
+    paths = [
+        index[docket_id].get_pdf_path(entry_number=1)
+        for docket_id in [sample_docket_id1, sample_docket_id2]
+    ] * 3
+    inputs = [{"file": path.read_bytes(), "filename": path.name} for path in paths]
+
+    async def run_jobs(inputs):
+        async with AsyncRemoteClient(
+            endpoint_url=ocr_server.url, min_poll_interval=0.01
+        ) as client:
+            pages = [page async for page in client.as_completed(inputs)]
+            return pages, await client.get_health()
+
+    start = time.time()
+    pages, health = asyncio.run(run_jobs(inputs))
+    logging.info(f"Processed {len(inputs)} jobs in {time.time() - start:.3f}s")
+    assert health["jobs"]["completed"] == len(inputs)
+    for job_idx, path in enumerate(paths):
+        doc = pdf_document(path)
+        job_pages = sorted(page["i"] for i, page in pages if i == job_idx)
+        assert job_pages == list(range(len(doc)))
+
+    with pytest.raises(Exception, match="FAILED"):
+        asyncio.run(run_jobs([{"file": b"not a pdf"}]))
+
+
+def test_ocr_metrics(fake_models):
+    """Test stage timings and counters from processing and the ocr-bench command."""
+    from click.testing import CliRunner
+
+    from docketanalyzer.cli import cli
+
+    result = CliRunner().invoke(cli, ["ocr-bench", "--batch-size", "4"])
+    assert result.exit_code == 0, result.output
+    logging.info(result.output)
+    for stage in ["render", "layout", "needs_ocr", "ocr", "consolidate"]:
+        assert stage in result.output
+
+    fake_models["layout"].clear()
+    fake_models["ocr"].clear()
+    result = CliRunner().invoke(
+        cli, ["ocr-bench", "--batch-size", "4", "--output", "json"]
+    )
+    data = json.loads(result.stdout)
+    summary = data["summary"]
+    assert summary["pages"] == 20
+    assert summary["ocr_rate"] == 0.5
+    assert data["counters"]["ocr_batch_pages"] == sum(fake_models["ocr"])
+    assert 0 < summary["layout_batch_fill"] <= 1
+    assert data["stages"]["layout"]["count"] == len(fake_models["layout"])
+
+    result = CliRunner().invoke(cli, ["ocr-bench", "--output", "prometheus"])
+    assert 'docketanalyzer_ocr_stage_seconds_total{stage="ocr"}' in result.stdout
+    assert "docketanalyzer_ocr_pages_total 20.0" in result.stdout
+
+
+def test_layout_backends(index, sample_docket_id1, sample_docket_id2):
+    """Test the CPU layout backends against the PyTorch model."""
+    from docketanalyzer.ocr import layout, pdf_document
+    from docketanalyzer.ocr.cache import get_model_version
+    from docketanalyzer.ocr.utils import box_overlap_matrix
+
+    with pytest.raises(ValueError):
+        layout.configure_layout_model("tensorrt")
+    torch_version = get_model_version()
+    layout.configure_layout_model("onnx", num_threads=1)
+    try:
+        assert get_model_version() != torch_version
+    finally:
+        layout.configure_layout_model("torch")
+
+    pytest.importorskip("doclayout_yolo")
+    pytest.importorskip("onnxruntime")
+
+    imgs = []
+    for docket_id in [sample_docket_id1, sample_docket_id2]:
+        doc = pdf_document(index[docket_id].get_pdf_path(entry_number=1))
+        imgs += [page.get_img() for page in doc]
+
+    results = {}
+    for backend in layout.LAYOUT_BACKENDS:
+        layout.load_model(backend)
+        start = time.time()
+        results[backend] = layout.predict_layout(
+            imgs, batch_size=4, dpi=200, backend=backend
+        )
+        pages_per_second = len(imgs) / (time.time() - start)
+        logging.info(f"{backend}: {pages_per_second:.2f} pages/s")
+
+    for backend in ["onnx", "onnx-int8"]:
+        matched = total = 0
+        for expected, blocks in zip(results["torch"], results[backend], strict=True):
+            total += len(expected)
+            if not expected or not blocks:
+                continue
+            overlap = box_overlap_matrix(
+                np.array([x["bbox"] for x in expected]),
+                np.array([x["bbox"] for x in blocks]),
+            )
+            for i, j in enumerate(overlap.argmax(axis=1)):
+                if overlap[i, j] > 0.9 and expected[i]["type"] == blocks[j]["type"]:
+                    matched += 1
+        assert matched / total > (0.95 if backend == "onnx" else 0.85)
+
+
+def test_adaptive_dpi(index, sample_docket_id1, monkeypatch):
+    """Test separate layout and OCR resolutions and rescaling of large pages."""
+    import fitz
+
+    from docketanalyzer.ocr import document, layout, pdf_document
+    from docketanalyzer.ocr.render import MAX_RENDER_SIZE
+
+    # Large pages are rendered at a reduced resolution that boxes are scaled by
+    pdf = fitz.open()
+    pdf.new_page(width=4000, height=3000).insert_text((100, 100), "Exhibit")
+    doc = pdf_document(pdf.tobytes())
+    page = doc[0]
+    img = page.get_img(200)
+    assert abs(img.shape[1] - MAX_RENDER_SIZE) <= 1
+    assert page.render_dpi(200) == MAX_RENDER_SIZE * 72 / 4000
+    assert page.render_dpi(10) == 10
+
+    class FakeTensor:
+        def __init__(self, array):
+            self.array = np.array(array)
+
+        def cpu(self):
+            return self
+
+        def numpy(self):
+            return self.array
+
+    class FakePred:
+        def __init__(self, img):
+            height, width = img.shape[:2]
+            self.boxes = type(
+                "Boxes",
+                (),
+                {"xyxy": FakeTensor([[0, 0, width, height]]), "cls": FakeTensor([1])},
+            )
+
+    def fake_model(imgs, verbose=False):
+        return [FakePred(img) for img in imgs]
+
+    monkeypatch.setattr(layout, "load_model", lambda backend=None: (fake_model, "cpu"))
+    blocks = layout.predict_layout([img], batch_size=1, dpi=page.render_dpi(200))
+    assert np.allclose(blocks[0][0]["bbox"], [0, 0, 4000, 3000], atol=1)
+
+    # Layout and OCR render at their own resolutions
+    calls = {"layout": [], "ocr": []}
+
+    def fake_predict_layout(imgs, batch_size, dpi):
+        calls["layout"] += [(img.shape[1], x) for img, x in zip(imgs, dpi, strict=True)]
+        return [[{"type": "text", "bbox": [0, 0, 100, 100]}] for _ in imgs]
+
+    def fake_extract_ocr_text(imgs, dpi=72):
+        calls["ocr"] += [(img.width, x) for img, x in zip(imgs, dpi, strict=True)]
+        return [[] for _ in imgs]
+
+    monkeypatch.setattr(document, "predict_layout", fake_predict_layout)
+    monkeypatch.setattr(document, "extract_ocr_text", fake_extract_ocr_text)
+    monkeypatch.setattr(document, "page_needs_ocr", lambda page, layout: True)
+
+    path = index[sample_docket_id1].get_pdf_path(entry_number=1)
+    doc = pdf_document(path, layout_dpi=100, ocr_dpi=200).process(batch_size=4)
+    width = doc[0].fitz.rect.width
+    assert calls["layout"][0] == (round(width * 100 / 72), 100)
+    assert calls["ocr"][0] == (round(width * 200 / 72), 200)
+    assert len(calls["ocr"]) == len(doc)
+
+
+def test_page_selection(temp_index, sample_docket_id1, fake_models):
+    """Test processing selected pages and completing a partial OCR file."""
+    from docketanalyzer.ocr import pdf_document
+
+    calls = fake_models
+    manager = temp_index[sample_docket_id1]
+    path = manager.get_pdf_path(entry_number=1)
+    doc = pdf_document(path)
+
+    def selected(pages):
+        return [page.i for page in doc.select_pages(pages)]
+
+    assert selected(None) == list(range(12))
+    assert selected(3) == [0, 1, 2]
+    assert selected(-2) == [10, 11]
+    assert selected(slice(None, None, -5)) == [1, 6, 11]
+    assert selected([-1, 0, 0, 40]) == [0, 11]
+    native_text = [page.fitz.get_text() for page in doc]
+    predicate = lambda text: "Case" in text  # noqa: E731
+    assert selected(predicate) == [i for i, x in enumerate(native_text) if "Case" in x]
+    assert doc.page_ranges(2, [0, 1, 2, 5, 7, 8]) == [(0, 2), (2, 3), (5, 6), (7, 9)]
+
+    doc = pdf_document(path, pages=[0, -1]).process()
+    assert [page["i"] for page in doc.data["pages"]] == [0, 11]
+    assert pdf_document(path, load=doc.data).select_pages(missing=True)[0].i == 1
+
+    # A later run only processes the pages missing from the saved OCR file
+    ocr_path = manager.get_ocr_path(entry_number=1)
+    ocr_path.unlink(missing_ok=True)
+    data, _ = manager.apply_ocr(path, pages=4)
+    assert [page["i"] for page in data["pages"]] == [0, 1, 2, 3]
+    calls["layout"].clear()
+    data, _ = manager.apply_ocr(path)
+    assert [page["i"] for page in data["pages"]] == list(range(12))
+    assert sum(calls["layout"]) == 8
+    assert manager.apply_ocr(path)[0] is False
+    saved = pdf_document(path, load=ocr_path)
+    assert [page.text for page in saved] == [page.text for page in doc.load(data)]
+
+
+def test_checkpoints(temp_index, sample_docket_id1, fake_models, ocr_server, tmp_path):
+    """Test resuming interrupted local and remote runs from a checkpoint."""
+    from docketanalyzer.ocr import PageCheckpoint, checkpoint_path, pdf_document
+
+    calls = fake_models
+    manager = temp_index[sample_docket_id1]
+    path = manager.get_pdf_path(entry_number=1)
+
+    for remote in [False, True]:
+        partial = tmp_path / f"remote-{remote}.json.partial"
+        kwargs = dict(remote=remote, use_s3=False, endpoint_url=ocr_server.url)
+        doc = pdf_document(path, **kwargs)
+        for i, _ in enumerate(doc.stream(checkpoint=partial)):
+            if i == 4:
+                break
+        # Simulate a crash while a page was being written
+        with partial.open("a") as f:
+            f.write('{"i": 11, "blocks": [')
+
+        calls["layout"].clear()
+        resumed = pdf_document(path, **kwargs)
+        pages = [page.i for page in resumed.stream(checkpoint=partial)]
+        assert len(pages) == 7 and not set(pages) & set(doc.select_pages(5))
+        assert sum(calls["layout"]) == (0 if remote else 7)
+        assert len(PageCheckpoint(partial).read()) == 12
+        assert all(page.processed for page in resumed)
+
+    ocr_path = manager.get_ocr_path(entry_number=1)
+    ocr_path.unlink(missing_ok=True)
+    partial.rename(checkpoint_path(ocr_path))
+    calls["layout"].clear()
+    data, _ = manager.apply_ocr(path)
+    assert not calls["layout"] and len(data["pages"]) == 12
+    assert ocr_path.exists() and not checkpoint_path(ocr_path).exists()
+
+
+def test_ocr_queue(temp_index, fake_models, tmp_path, monkeypatch):
+    """Test finding PDFs without OCR and processing them from a persistent queue."""
+    from docketanalyzer.docket import DocketManager
+    from docketanalyzer.services.redis import DevRedisClient
+
+    pdf_paths = sorted(temp_index.dir.glob("*/doc.pdf.*.pdf"))
+    for path in sorted(temp_index.dir.glob("*/doc.ocr.*.json")):
+        path.unlink()
+    assert temp_index.ocr_pending() == pdf_paths
+    assert temp_index.ocr_pending([pdf_paths[0].parent.name, "missing"]) == [
+        x for x in pdf_paths if x.parent == pdf_paths[0].parent
+    ]
+
+    redis = DevRedisClient(tmp_path / "redis.db")
+    queue = temp_index.ocr_queue(name="test", max_retries=1, redis=redis)
+    assert queue.add(temp_index.ocr_pending()) == len(pdf_paths)
+    assert len(queue) == len(pdf_paths)
+
+    # PDFs left in the queue by an interrupted run are not queued twice
+    queue = temp_index.ocr_queue(name="test", max_retries=1, redis=redis)
+    assert queue.add(temp_index.ocr_pending() + pdf_paths[:1]) == 0
+    assert len(queue) == len(pdf_paths)
+
+    # Simulate a PDF that always fails
+    broken = pdf_paths[0]
+    apply_ocr = DocketManager.apply_ocr
+
+    def flaky_apply_ocr(self, pdf_path, **kwargs):
+        if pdf_path == broken:
+            raise ValueError("broken pdf")
+        return apply_ocr(self, pdf_path, **kwargs)
+
+    monkeypatch.setattr(DocketManager, "apply_ocr", flaky_apply_ocr)
+    with pytest.raises(ValueError):
+        queue.run(consumers=2)
+    stats = queue.run()
+    logging.info(stats)
+    assert stats["completed"] == len(pdf_paths) - 1
+    assert stats["retried"] == stats["failed"] == 1
+    assert stats["pages"] == sum(fake_models["layout"]) and stats["pages_per_second"]
+    assert not len(queue)
+    assert [x["path"] for x in queue.dead_letters] == [
+        str(broken.relative_to(temp_index.dir))
+    ]
+    assert temp_index.ocr_pending() == [broken]
+
+    queue.add(pdf_paths[1:])
+    assert queue.run()["skipped"] == len(pdf_paths) - 1
+    queue.clear()
+    assert not queue.dead_letters
+
+
+def test_native_text_extraction(index, sample_docket_id1, sample_docket_id2):
+    """Benchmark lean native text extraction against full dict extraction."""
+    from docketanalyzer.ocr import (
+        extract_native_text,
+        extract_native_text_arrays,
+        pdf_document,
+    )
+
+    def dict_native_text(page):
+        data = []
+        for block in page.get_text("dict")["blocks"]:
+            for line in block.get("lines", []):
+                content = "".join([span["text"] for span in line["spans"]])
+                if content.strip():
+                    data.append(
+                        {
+                            "bbox": line["bbox"],
+                            "content": content,
+                            "block": block["number"],
+                        }
+                    )
+        return data
+
+    def lines_key(lines):
+        # Image blocks are numbered too, so only compare where blocks change
+        return [
+            (
+                line["bbox"],
+                line["content"],
+                i > 0 and line["block"] != lines[i - 1]["block"],
+            )
+            for i, line in enumerate(lines)
+        ]
+
+    docs = [
+        pdf_document(index[docket_id].get_pdf_path(entry_number=1))
+        for docket_id in [sample_docket_id1, sample_docket_id2]
+    ]
+    pages = [page for doc in docs for page in doc]
+
+    timings = {}
+    for name, extract in [
+        ("dict", dict_native_text),
+        ("lean", extract_native_text),
+        ("arrays", extract_native_text_arrays),
+    ]:
+        start = time.perf_counter()
+        results = [extract(page.fitz) for page in pages]
+        timings[name] = time.perf_counter() - start
+        if name == "dict":
+            expected = [lines_key(lines) for lines in results]
+        elif name == "lean":
+            assert [lines_key(lines) for lines in results] == expected
+        else:
+            for (bboxes, contents, blocks), lines in zip(
+                results, expected, strict=True
+            ):
+                assert contents == [line[1] for line in lines]
+                assert bboxes.tolist() == [list(line[0]) for line in lines]
+                assert (np.diff(blocks) != 0).tolist() == [
+                    line[2] for line in lines[1:]
+                ]
+    logging.info(
+        f"Native text for {len(pages)} pages: "
+        + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items())
+    )
+
+    page = pages[0]
+    assert lines_key(page.native_text) == expected[0]
+    assert page.native_text is page.native_text
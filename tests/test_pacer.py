@@ -84,3 +84,168 @@ def test_purchase_document(index, sample_docket_id1):
     assert status == "success", "Failed to purchase attachment"
     assert is_valid_pdf(pdf), "Downloaded document is not a valid PDF"
     assert abs(len(pdf) - len(cached_attachment)) < 10, "PDF doesn't match fixture data"
+
+
+class FakePacer:
+    """Stand-in for Pacer that records calls instead of hitting PACER."""
+
+    def __init__(self, num_attachments=3):
+        """Initialize the fake with a fixed number of attachments per entry."""
+        self.num_attachments = num_attachments
+        self.attachment_queries = []
+        self.purchases = []
+
+    def get_attachments(self, pacer_doc_id, court, update=False):
+        """Return fake attachment metadata."""
+        self.attachment_queries.append(pacer_doc_id)
+        return {
+            "attachments": [
+                {"attachment_number": i, "pacer_doc_id": f"{pacer_doc_id}-{i}"}
+                for i in range(1, self.num_attachments + 1)
+            ]
+        }
+
+    def purchase_document(self, pacer_case_id, pacer_doc_id, court):
+        """Return a fake two page PDF."""
+        self.purchases.append(pacer_doc_id)
+        pdf = b"%PDF-1.4\n/Type /Pages\n/Type /Page\n/Type /Page\n%%EOF"
+        return pdf, "success"
+
+
+def test_purchase_queue(temp_index, sample_docket_id1):
+    """Test grouped purchases and budget enforcement with a fake backend."""
+    pacer = temp_index._pacer = FakePacer()
+    manager = temp_index[sample_docket_id1]
+
+    queue = temp_index.purchase_queue(overwrite=True)
+    for attachment_number in [None, 1, 2, 3, 7]:
+        queue.add(sample_docket_id1, 2, attachment_number)
+    queue.add(sample_docket_id1, 3)
+    queue.add(sample_docket_id1, 9999)
+    results = queue.run()
+
+    statuses = {
+        (r["entry_number"], r["attachment_number"]): r["status"] for r in results
+    }
+    assert statuses[(2, None)] == "success"
+    assert statuses[(2, 3)] == "success"
+    assert statuses[(2, 7)] == "attachment not found"
+    assert statuses[(9999, None)] == "entry not found"
+    assert len(pacer.attachment_queries) == 1, "Attachment page fetched repeatedly"
+    assert len(pacer.purchases) == 5
+    assert manager.get_pdf_path(2, 1).read_bytes().startswith(b"%PDF-")
+    assert abs(queue.spent - 1.0) < 1e-9
+
+    # Existing documents are skipped unless overwrite is set
+    queue = temp_index.purchase_queue()
+    queue.add(sample_docket_id1, 2, 1)
+    assert queue.run()[0]["status"] == "exists"
+
+    # Each purchase reserves the worst case cost until the actual cost is known
+    temp_index._pacer = FakePacer()
+    queue = temp_index.purchase_queue(budget=3.3, max_workers=1)
+    for entry_number in [4, 5, 6]:
+        queue.add(sample_docket_id1, entry_number)
+    results = queue.run()
+    assert sum(r["status"] == "success" for r in results) == 2
+    assert sum(r["status"] == "budget exceeded" for r in results) == 1
+    assert queue.spent <= 3.3
+
+    # An error keeps the results of the documents already purchased
+    class FailingPacer(FakePacer):
+        def purchase_document(self, pacer_case_id, pacer_doc_id, court):
+            if pacer_doc_id.endswith("-2"):
+                raise ConnectionError("PACER unavailable")
+            return super().purchase_document(pacer_case_id, pacer_doc_id, court)
+
+    temp_index._pacer = FailingPacer()
+    queue = temp_index.purchase_queue(overwrite=True)
+    for attachment_number in [None, 1, 2, 3]:
+        queue.add(sample_docket_id1, 2, attachment_number)
+    results = {r["attachment_number"]: r for r in queue.run()}
+    assert results[None]["status"] == results[1]["status"] == "success"
+    assert results[1]["cost"] > 0
+    assert results[2]["status"] == results[3]["status"] == "error: PACER unavailable"
+    assert abs(queue.spent - sum(r["cost"] for r in results.values())) < 1e-9
+    assert abs(queue.spent - 0.4) < 1e-9
+
+
+def test_attachment_cache(temp_index, sample_docket_id1):
+    """Test that attachment pages are cached alongside the docket."""
+    pacer = temp_index._pacer = FakePacer()
+    manager = temp_index[sample_docket_id1]
+
+    for _ in range(3):
+        attachments = manager.get_entry_attachment_json(entry_number=2)
+    assert len(attachments["attachments"]) == 3
+    assert len(pacer.attachment_queries) == 1
+
+    # A new run reads the cache from disk
+    pacer = temp_index._pacer = FakePacer()
+    data = temp_index[sample_docket_id1].download_attachment_data([2, 3])
+    assert sorted(data) == [2, 3]
+    assert len(pacer.attachment_queries) == 1
+    assert manager.attachments_path.exists()
+
+
+def test_find_candidate_cases_bulk(tmp_path):
+    """Test that resolved case IDs are persisted and served locally."""
+    from docketanalyzer.pacer import Pacer
+
+    class FakeLookupPacer(Pacer):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.queries = []
+
+        def query_candidate_cases(self, docket_id):
+            self.queries.append(docket_id)
+            if docket_id.endswith("00000"):
+                raise ConnectionError("PACER unavailable")
+            if "-9999" in docket_id:
+                return []
+            return [{"pacer_case_id": str(len(docket_id)), "docket_number": "x"}]
+
+    docket_ids = [
+        "insd__1_24-cv-00524",
+        "insd__1_24-cv-00525",
+        "nynd__8_20-mj-00487",
+        "nynd__8_20-mj-99999",
+    ]
+    pacer = FakeLookupPacer(db_path=tmp_path / "pacer.db")
+    results = pacer.find_candidate_cases_bulk(docket_ids, max_per_court=1)
+    assert list(results) == docket_ids
+    assert results["nynd__8_20-mj-99999"] == []
+    assert len(pacer.queries) == 4
+
+    # A new instance reads from the local table
+    pacer = FakeLookupPacer(db_path=tmp_path / "pacer.db")
+    results = pacer.find_candidate_cases_bulk(docket_ids)
+    assert pacer.find_candidate_cases(docket_ids[0])[0]["pacer_case_id"] == "19"
+    assert results["nynd__8_20-mj-99999"] == []
+    assert pacer.queries == []
+
+    # Empty lookups are cached as known empty
+    assert pacer.find_candidate_cases("nynd__8_20-mj-99998") == []
+    assert pacer.find_candidate_cases("nynd__8_20-mj-99998") == []
+    assert pacer.queries == ["nynd__8_20-mj-99998"]
+    row = pacer.case_table.get_by_id("nynd__8_20-mj-99998")
+    assert row.pacer_case_id is None
+
+    # update queries PACER again
+    pacer.find_candidate_cases("nynd__8_20-mj-99998", update=True)
+    assert pacer.queries == ["nynd__8_20-mj-99998"] * 2
+
+    # A failed lookup is recorded without losing the other results
+    failing = "insd__1_24-cv-00000"
+    results = pacer.find_candidate_cases_bulk([failing, "insd__1_24-cv-00526"])
+    assert results[failing] is None
+    assert results["insd__1_24-cv-00526"][0]["pacer_case_id"] == "19"
+    assert "PACER unavailable" in pacer.lookup_errors[failing]
+    assert failing not in pacer.get_cached_candidate_cases([failing])
+
+    # Instances with different databases stay separate
+    other = FakeLookupPacer(db_path=tmp_path / "other.db")
+    assert other.get_cached_candidate_cases(docket_ids) == {}
+    pacer.save_candidate_cases("insd__1_24-cv-00527", [])
+    assert other.get_cached_candidate_cases(["insd__1_24-cv-00527"]) == {}
+    assert pacer.get_cached_candidate_cases(["insd__1_24-cv-00527"])